@@ -0,0 +1,111 @@
+"""Startup config validation with and without the cross-run validated config cache.
+
+    python -m benchmarks.config_cache [components]
+
+Validates one config section per component (10k by default) the way components do on
+construction: without the cache, on a cold cache (first run, fills it) and on a warm cache
+(following runs, every section is a hit).  Once for a plain model, which pydantic-core validates
+faster than a hit rebuilds it (and so doesn't opt in), and once for a model with a validator that
+does real work.
+"""
+
+from pathlib import Path
+from pydantic import field_validator
+import re
+import sys
+import tempfile
+import time
+
+from src.base_config import Config
+from src.config_cache import ValidatedConfigCache, install_config_cache
+
+
+class EndpointConfig(Config):
+    host: str = "localhost"
+    port: int = 8080
+    timeout: float = 5.0
+    retries: int = 3
+    tags: list[str] = []
+    headers: dict[str, str] = {}
+
+    @field_validator("host")
+    @classmethod
+    def normalise_host(cls, host: str) -> str:
+        return host.strip().lower()
+
+
+class CachedEndpointConfig(EndpointConfig):
+    CACHE_VALIDATION = True
+
+
+class RouteConfig(EndpointConfig):
+    CACHE_VALIDATION = True
+
+    route: str = ".*"
+
+    @field_validator("route")
+    @classmethod
+    def route_compiles(cls, route: str) -> str:
+        # Every component has its own pattern, so re's compile cache doesn't help
+        re.compile(route)
+        return route
+
+
+def make_config(components: int) -> list[dict]:
+    return [
+        {
+            "host": f" Host-{i}.Example.com ",
+            "port": 8000 + i % 1000,
+            "timeout": 1.5,
+            "tags": ["a", "b", f"shard-{i % 16}"],
+            "headers": {"x-component": str(i)},
+            "route": rf"^/api/v(?P<version>[12])/tenant-{i}/(?P<resource>[a-z_]+)/(?P<id>\d+)$",
+        }
+        for i in range(components)
+    ]
+
+
+def validate_all(model: type[Config], config: list[dict]) -> float:
+    start = time.perf_counter()
+    for section in config:
+        model.validated(section)
+    return time.perf_counter() - start
+
+
+def benchmark(model: type[Config], config: list[dict], directory: Path) -> None:
+    path = directory / f"{model.__name__}.cache"
+
+    install_config_cache(None)
+    uncached = validate_all(model, config)
+
+    cache = ValidatedConfigCache(path)
+    install_config_cache(cache)
+    cold = validate_all(model, config)
+    cache.save()
+
+    cache = ValidatedConfigCache(path)
+    load_start = time.perf_counter()
+    cache.load()
+    load = time.perf_counter() - load_start
+    install_config_cache(cache)
+    warm = validate_all(model, config) + load
+    assert cache.stats()["hits"] == len(config)
+    install_config_cache(None)
+
+    print(model.__name__)
+    print(f"  no cache    {uncached * 1000:8.1f} ms")
+    print(f"  cold cache  {cold * 1000:8.1f} ms")
+    print(f"  warm cache  {warm * 1000:8.1f} ms (including {load * 1000:.1f} ms loading)")
+    print(f"  saving      {(1 - warm / uncached) * 100:8.1f} %")
+
+
+def main(components: int = 10_000) -> None:
+    config = make_config(components)
+    print(f"{components} components")
+    with tempfile.TemporaryDirectory() as directory:
+        for model in (CachedEndpointConfig, RouteConfig):
+            benchmark(model, config, Path(directory))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,94 @@
+"""Memory held by a loaded config, as plain dicts and as a compact config tree.
+
+    python -m benchmarks.config_tree [components]
+
+Loads a config with one section per component (10k by default), sections that mostly repeat the
+same keys, enum-like strings and nested blocks, the way generated configs do.  Reports what the
+`yaml.safe_load` result keeps alive, what the `freeze`d tree keeps alive once the dicts are
+dropped, and how long validating every section with `Config.from_config` takes from each.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import yaml
+
+from src.base_config import Config
+from src.config_tree import freeze, thaw
+
+
+class RetryConfig(Config):
+    attempts: int = 3
+    backoff: float = 0.5
+
+
+class WorkerConfig(Config):
+    module: str
+    mode: str = "thread"
+    queue: str
+    batch_size: int = 64
+    tags: list[str] = []
+    retry: RetryConfig = RetryConfig()
+
+
+def make_config(components: int) -> str:
+    config = {
+        "Managers": {
+            f"worker_{i}": "src.components.batcher:Batcher" for i in range(components)
+        },
+        "Workers": {
+            f"worker_{i}": {
+                "module": "src.components.batcher:Batcher",
+                "mode": ("thread", "loop", "inline")[i % 3],
+                "queue": f"queue-{i % 32}",
+                "batch_size": 64,
+                "tags": ["ingest", "default", f"shard-{i % 16}"],
+                "retry": {"attempts": 3, "backoff": 0.5},
+            }
+            for i in range(components)
+        },
+    }
+    return yaml.safe_dump(config, sort_keys=False)
+
+
+def retained(build) -> tuple[object, int]:
+    """Build an object, returns it and the bytes allocated for it that are still alive."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def validate_all(config, components: int) -> float:
+    start = time.perf_counter()
+    for i in range(components):
+        WorkerConfig.from_config(config, prefix=f"Workers.worker_{i}")
+    return time.perf_counter() - start
+
+
+def main(components: int = 10_000) -> None:
+    text = make_config(components)
+    print(f"{components} components, {len(text) / 1e6:.1f} MB of yaml")
+
+    plain, plain_size = retained(lambda: yaml.safe_load(text))
+    compact, compact_size = retained(lambda: freeze(yaml.safe_load(text)))
+    assert thaw(compact) == plain
+
+    start = time.perf_counter()
+    freeze(plain)
+    freeze_time = time.perf_counter() - start
+
+    print(f"  dicts         {plain_size / 1e6:8.2f} MB")
+    print(f"  config tree   {compact_size / 1e6:8.2f} MB ({freeze_time * 1000:.0f} ms to freeze)")
+    print(f"  saving        {(1 - compact_size / plain_size) * 100:8.1f} %")
+    print(f"  validate all  {validate_all(plain, components) * 1000:8.1f} ms from dicts")
+    print(f"                {validate_all(compact, components) * 1000:8.1f} ms from the tree")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -1,11 +1,25 @@
+from __future__ import annotations
+
 from abc import ABC
 from pathlib import Path
+from typing import Any, TYPE_CHECKING
 from src.dependency_resolver import DependencyResolver, ResolveByNameAndType
 import src.factory as factory
-import typer
-import pydantic
-import yaml
+from src.cli import LazyTyper
 from src.custom_exceptions import DependencyInjectionError
+import logging
+
+if TYPE_CHECKING:
+    # typer, pydantic and yaml are only imported when they're used, keeps CLI startup fast
+    import typer
+    import pydantic
+    from src.memory_accounting import MemoryAccountant
+    from src.checkpoint import CheckpointReader
+    from src.config_cache import ValidatedConfigCache
+    from src.profiler import ProfilerTrigger
+    from src.supervisor import Supervisor
+
+logger = logging.getLogger(__name__)
 
 
 class CustomApplication(ABC):
@@ -15,16 +29,38 @@ class CustomApplication(ABC):
 
     _application_arguments: typer.Typer
     _application_config: pydantic.BaseModel
-    app = typer.Typer()
+    app = LazyTyper()
+    # Commands src.daemon leaves to the client: they start managers or configure differently, which
+    # the daemon's shared container mustn't do on behalf of one invocation
+    IN_PROCESS_COMMANDS = ("pre-run", "run", "memory-report", "daemon")
 
-    def __init__(self, **kwargs):
+    def __init__(self, memory_accounting: bool = False, **kwargs):
         self._resolver = DependencyResolver()
         self._global_config = None
         self._local_config = None
+        self.config_path: Path | None = None
         self.managers = []
+        self.manager_names: list[str] = []
+        self.supervisor: Supervisor | None = None
+        self.memory: MemoryAccountant | None = None
+        self._checkpoint: CheckpointReader | None = None
+        self.config_cache: ValidatedConfigCache | None = None
+        self.profiler: ProfilerTrigger | None = None
+        if memory_accounting:
+            self.enable_memory_accounting()
 
         self.configured = False
 
+    def enable_memory_accounting(self) -> MemoryAccountant:
+        """Attribute memory allocated while constructing each manager/component (built through
+        the resolver) to it.  Uses tracemalloc, so expect slower allocations while enabled."""
+        from src.memory_accounting import MemoryAccountant
+
+        if self.memory is None:
+            self.memory = MemoryAccountant()
+            self._resolver.memory_accountant = self.memory
+        return self.memory
+
     def parse_arguments(self):
         pass
 
@@ -34,25 +70,57 @@ class CustomApplication(ABC):
 
         for manager_name, manager_class in self._global_config["Managers"].items():
             manager_class = factory.load_classes([{"module": manager_class}])[0]
-            required_args = self._resolver.resolve_object_kwargs(
-                manager_class, policy=ResolveByNameAndType
+            manager = self._resolver.construct(
+                manager_class,
+                manager_name,
+                policy=ResolveByNameAndType,
+                _global_config=self._global_config,
             )
-            manager = manager_class(**required_args, _global_config=self._global_config)
-            self._resolver.add_object(manager, manager_name)
             self.managers.append(manager)
+            self.manager_names.append(manager_name)
 
     @app.command()
-    def configure(self, config_path: Path | str | None = None, **kwargs):
-        """Read in the command line, then read in the denoted config and validate with pydantic model"""
+    def configure(
+        self,
+        config_path: Path | None = None,
+        strict_config: bool = False,
+        compact_config: bool = False,
+        **kwargs,
+    ):
+        """Read in the command line, then read in the denoted config and validate with pydantic model
+
+        With `compact_config` the loaded config is kept as an immutable tree with interned strings
+        and shared subtrees (see src.config_tree), for configs with many similar component sections.
+        """
+        if self.configured:
+            if config_path is not None and Path(config_path).resolve() == self.config_path:
+                return  # already configured with it, e.g. the warm container of src.daemon
+            raise RuntimeError(f"Already configured with {self.config_path}")
         if config_path is None:
             self._global_config = {}
         else:
-            self._global_config = yaml.safe_load(Path(config_path).read_text())
+            import yaml
+
+            self.config_path = Path(config_path).resolve()
+            self._global_config = yaml.safe_load(self.config_path.read_text())
+            if compact_config:
+                from src.config_tree import freeze
+
+                self._global_config = freeze(self._global_config)
 
         # Apply config to the application - logging, etc.
+        self.load_config_cache(strict=strict_config)
 
         # Read Manager section of config, build all the managers via dependency resolver
-        self.load_managers()
+        try:
+            self.load_managers()
+        finally:
+            self.save_config_cache()
+
+        # Warm restart, components pick their state back up from the last checkpoint
+        self.restore_checkpoint()
+
+        self.install_profiler()
 
         # Get all the component classes denoted in the config
 
@@ -64,6 +132,46 @@ class CustomApplication(ABC):
 
         self.configured = True
 
+    @app.command()
+    def dry_run(self, config_path: Path):
+        """Validate the config against manager/component signatures and CONFIG models without importing or constructing anything"""
+        from src.dry_run import dry_run as validate_statically
+
+        issues = validate_statically(config_path)
+        for issue in issues:
+            print(issue)
+        if issues:
+            raise SystemExit(1)
+        print(f"{config_path}: OK")
+
+    @app.command()
+    def profile(self, pid: int, signal_name: str = "SIGUSR2"):
+        """Ask the running application with this pid to profile itself (needs a Profiler config section)"""
+        import os
+        import signal
+
+        os.kill(pid, getattr(signal, signal_name))
+        print(f"Sent {signal_name} to {pid}, the profile is written to its Profiler.output_dir")
+
+    @app.command()
+    def memory_report(self, config_path: Path, top: int = 10):
+        """Configure the application with memory accounting on and list the top memory owners"""
+        memory = self.enable_memory_accounting()
+        self.configure(config_path)
+        print(memory.format_report(top))
+
+    @app.command()
+    def daemon(self, config_path: Path, socket_path: Path | None = None, stop: bool = False):
+        """Keep a container configured with this config resident and serve CLI commands from it over a Unix socket"""
+        from src.daemon import ContainerDaemon, stop_daemon
+
+        if stop:
+            if not stop_daemon(socket_path):
+                print("No daemon is listening")
+                raise SystemExit(1)
+            return
+        ContainerDaemon(type(self), config_path, socket_path).serve_forever()
+
     def get_object(self, requested_class: type, missing_ok: bool = True):
         if self.injector is None:
             raise AttributeError("Injector not initialized")
@@ -79,19 +187,138 @@ class CustomApplication(ABC):
         pass
 
     @app.command()
-    # @abstractmethod
     def pre_run(self):
-        pass
+        for manager in self.managers:
+            manager.pre_run()
 
     @app.command()
-    # @abstractmethod
     def run(self):
-        pass
+        # Each manager starts inline, on its own thread or on its own event loop, see the
+        # Supervisor config section
+        from src.supervisor import Supervisor, SupervisorConfig
+
+        managers = {
+            self.manager_names[i] if i < len(self.manager_names) else f"manager_{i}": manager
+            for i, manager in enumerate(self.managers)
+        }
+        self.supervisor = Supervisor(SupervisorConfig.from_config(self._global_config), managers)
+        # Lets managers like the watchdog find the loops and threads it runs
+        self._resolver.add_object(self.supervisor, "_supervisor")
+        self.supervisor.start()
+
+    def manager_status(self) -> dict[str, dict]:
+        """Liveness (state, alive, uptime) and restart counts per manager, once running."""
+        return {} if self.supervisor is None else self.supervisor.status()
+
+    def metrics(self) -> dict[str, Any]:
+        """Every manager's stats()/metrics() keyed by manager name, plus the managers' status."""
+        metrics: dict[str, Any] = {}
+        for name, manager in zip(self.manager_names, self.managers):
+            collect = getattr(manager, "stats", None) or getattr(manager, "metrics", None)
+            if callable(collect):
+                metrics[name] = collect()
+        metrics["managers"] = self.manager_status()
+        return metrics
 
-    # @abstractmethod
     def pre_stop(self):
-        pass
+        # Snapshot while every component is still intact
+        self.write_checkpoint()
+        if self.supervisor is not None:
+            self.supervisor.pre_stop()
+            return
+        for manager in reversed(self.managers):
+            manager.pre_stop()
 
-    # @abstractmethod
     def stop(self):
-        pass
+        # Stop in reverse order so managers outlive the managers that depend on them
+        if self.supervisor is not None:
+            self.supervisor.stop()
+        else:
+            for manager in reversed(self.managers):
+                manager.stop()
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            self._checkpoint = None
+        # Also keeps configs first validated after configure
+        self.save_config_cache()
+
+    def load_config_cache(self, strict: bool = False) -> ValidatedConfigCache | None:
+        """Install the cross-run validated config cache from the ConfigCache config section, so
+        config sections that haven't changed since the last run skip validation."""
+        from src.config_cache import install_config_cache
+
+        if not self._global_config or "ConfigCache" not in self._global_config:
+            install_config_cache(None)
+            return None
+        from src.config_cache import ConfigCacheConfig, ValidatedConfigCache
+
+        config = ConfigCacheConfig.model_validate(self._global_config["ConfigCache"])
+        self.config_cache = ValidatedConfigCache(config.path, strict=strict or config.strict)
+        self.config_cache.load()
+        install_config_cache(self.config_cache)
+        return self.config_cache
+
+    def save_config_cache(self) -> None:
+        if self.config_cache is not None:
+            self.config_cache.save()
+
+    def install_profiler(self) -> ProfilerTrigger | None:
+        """Install the sampling profiler's signal handler when there's a Profiler config section.
+        Costs nothing until the signal arrives, see src/profiler.py."""
+        if not self._global_config or "Profiler" not in self._global_config:
+            return None
+        from src.profiler import ProfilerConfig, ProfilerTrigger
+
+        self.profiler = ProfilerTrigger(
+            ProfilerConfig.from_config(self._global_config), self._components
+        )
+        self.profiler.install()
+        return self.profiler
+
+    def _checkpoint_path(self) -> Path | None:
+        if not self._global_config or "Checkpoint" not in self._global_config:
+            return None
+        from src.checkpoint import CheckpointConfig
+
+        path = CheckpointConfig.from_config(self._global_config).path
+        return None if path is None else Path(path)
+
+    def _components(self) -> dict:
+        from src.components.application_component import ApplicationComponent
+
+        return {
+            name: obj
+            for name, obj in self._resolver._live_objects().items()
+            if isinstance(obj, ApplicationComponent)
+        }
+
+    def restore_checkpoint(self) -> list[str]:
+        """Restore components from the checkpoint in the Checkpoint.path config, if there is one.
+        Returns the names of the restored components."""
+        path = self._checkpoint_path()
+        if path is None or not path.exists():
+            return []
+        from src.checkpoint import CheckpointReader
+
+        try:
+            self._checkpoint = CheckpointReader(path)
+        except ValueError as e:
+            logger.warning(f"Ignoring checkpoint: {e}")
+            return []
+        return self._checkpoint.restore(self._components())
+
+    def write_checkpoint(self) -> int:
+        """Write a checkpoint of every component that implements snapshot(), returns how many."""
+        path = self._checkpoint_path()
+        if path is None:
+            return 0
+        from src.checkpoint import write_checkpoint
+
+        return write_checkpoint(path, self._components())
+
+
+if __name__ == "__main__":
+    # Forwarded to a running daemon if there is one, see src/daemon.py
+    from src.daemon import main
+
+    main(CustomApplication)
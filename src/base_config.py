@@ -1,8 +1,24 @@
 from pydantic import BaseModel
-from typing import Any, Generator
-from typing_extensions import ClassVar
+from typing import Any, Generator, TYPE_CHECKING, TypeVar
+from typing_extensions import ClassVar, Self
 import warnings
 
+if TYPE_CHECKING:
+    from src.config_cache import ValidatedConfigCache
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Set with src.config_cache.install_config_cache, used by validate
+validation_cache: "ValidatedConfigCache | None" = None
+
+
+def validate(model: type[ModelT], data: Any) -> ModelT:
+    """`model.model_validate(data)`, through the cross-run validated config cache when one is
+    installed and the model opts in with CACHE_VALIDATION."""
+    if validation_cache is None or not getattr(model, "CACHE_VALIDATION", False):
+        return model.model_validate(data)
+    return validation_cache.validate(model, data)
+
 
 class Config(BaseModel):
     """Base class for configuration models.
@@ -13,6 +29,16 @@ class Config(BaseModel):
     """
 
     PREFIX: ClassVar[str | None] = None
+    # Cache validated configs across runs, see src/config_cache.py.  Only worth it for models with
+    # expensive validators, plain models validate faster than a cache hit rebuilds them
+    CACHE_VALIDATION: ClassVar[bool] = False
+    # Bump when validators change, so validated configs cached by earlier runs are dropped
+    CONFIG_VERSION: ClassVar[int] = 1
+
+    @classmethod
+    def validated(cls, data: Any) -> Self:
+        """`model_validate`, through the validated config cache, see `validate`."""
+        return validate(cls, data)
 
     @classmethod
     def scan_config_for_prefix(
@@ -47,3 +73,23 @@ class Config(BaseModel):
 
         key_chain = prefix.split(".")
         return dict(scan_config_for_prefix_recursive(config, key_chain))
+
+    @classmethod
+    def from_config(
+        cls, config: dict | None, prefix: str | None = None, surpress_warnings: bool = True
+    ) -> Self:
+        """Builds the model from the section of a (global) configuration under the prefix.
+
+        Args:
+            config (dict | None): The configuration to scan, None is treated as an empty config.
+            prefix (str | None): The prefix to scan for. If None, the class prefix is used.
+            surpress_warnings (bool): Whether to surpress warnings for a missing section.
+
+        Returns:
+            Config: The validated model, missing sections fall back to the model defaults.
+        """
+        return cls.validated(
+            cls.scan_config_for_prefix(
+                config or {}, prefix=prefix, surpress_warnings=surpress_warnings
+            )
+        )
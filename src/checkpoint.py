@@ -0,0 +1,191 @@
+"""Checkpoint files for component state, written on stop and restored on the next configure.
+
+Components with LAZY_RESTORE get a DeferredSnapshot instead of their state, read on first use.
+
+Layout, designed to be memory-mapped so restoring only touches the pages a component reads:
+
+    8 bytes   magic
+    payloads  one per component, 8 byte aligned
+    index     JSON {name: {class, version, config_hash, encoding, offset, length}}
+    footer    index offset and length (little endian u64s) and the magic again
+
+Offsets are from the start of the file.  The index goes last so payloads can be streamed out
+without knowing the index size up front.
+"""
+
+from pathlib import Path
+from typing import Any
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IRCKPT01"
+_FOOTER = struct.Struct("<QQ8s")
+_ALIGNMENT = 8
+
+
+class CheckpointConfig(Config):
+    PREFIX = "Checkpoint"
+
+    path: str | None = None  # no path, no checkpointing
+
+
+def component_class_name(component: Any) -> str:
+    cls = type(component)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def write_checkpoint(path: Path | str, components: dict[str, ApplicationComponent]) -> int:
+    """Snapshot every component that opts in and write them to `path`, returns how many.
+
+    The file is written next to `path` and renamed over it, a crash mid-write leaves the old
+    checkpoint in place.
+    """
+    index: dict[str, dict[str, Any]] = {}
+    payloads: list[bytes | memoryview] = []
+    for name, component in components.items():
+        state = component.snapshot()
+        if state is None:
+            continue
+        if isinstance(state, (bytes, bytearray, memoryview)):
+            encoding, payload = "raw", memoryview(state).cast("B")
+        else:
+            encoding, payload = "pickle", pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        index[name] = {
+            "class": component_class_name(component),
+            "version": component.CHECKPOINT_VERSION,
+            "config_hash": component.config_hash(),
+            "encoding": encoding,
+            "length": len(payload),
+        }
+        payloads.append(payload)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for entry, payload in zip(index.values(), payloads):
+            entry["offset"] = _align(f.tell())
+            f.seek(entry["offset"])
+            f.write(payload)
+        encoded_index = json.dumps(index).encode()
+        index_offset = f.tell()
+        f.write(encoded_index)
+        f.write(_FOOTER.pack(index_offset, len(encoded_index), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(payloads)
+
+
+def _align(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+class DeferredSnapshot:
+    """A component's snapshot that isn't read until `get()`, handed to restore() of components with
+    LAZY_RESTORE so their payload is only paged in (and unpickled) on first use.  Valid until the
+    reader is closed, i.e. until the application stops."""
+
+    def __init__(self, reader: "CheckpointReader", name: str) -> None:
+        self._reader: CheckpointReader | None = reader
+        self._name = name
+        self._state: Any = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._reader is None
+
+    def get(self) -> Any:
+        if self._reader is not None:
+            self._state = self._reader.load(self._name)
+            self._reader = None
+        return self._state
+
+
+class CheckpointReader:
+    """Memory-maps a checkpoint and restores components from it.
+
+    Only the index is parsed up front, a component's payload is read when it's restored, or on
+    first use for components with LAZY_RESTORE.  Raw (bytes) payloads are handed over as
+    memoryviews into the mapping, so they stay valid until `close()`.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.restored: list[str] = []
+        self.stale: list[str] = []
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < len(MAGIC) + _FOOTER.size or self._map[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a checkpoint file")
+            index_offset, index_length, magic = _FOOTER.unpack_from(
+                self._map, len(self._map) - _FOOTER.size
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is truncated")
+            self.entries = json.loads(
+                bytes(self._map[index_offset : index_offset + index_length])
+            )
+        except Exception:
+            self.close()
+            raise
+
+    def is_current(self, name: str, component: ApplicationComponent) -> bool:
+        """Whether there's a snapshot for `name` taken by the same class, version and config."""
+        entry = self.entries.get(name)
+        return (
+            entry is not None
+            and entry["class"] == component_class_name(component)
+            and entry["version"] == component.CHECKPOINT_VERSION
+            and entry["config_hash"] == component.config_hash()
+        )
+
+    def load(self, name: str) -> Any:
+        entry = self.entries[name]
+        view = memoryview(self._map)[entry["offset"] : entry["offset"] + entry["length"]]
+        if entry["encoding"] == "raw":
+            return view
+        try:
+            return pickle.loads(view)
+        finally:
+            view.release()
+
+    def restore(self, components: dict[str, ApplicationComponent]) -> list[str]:
+        """Restore every component with a current snapshot, returns the restored names.
+        Stale snapshots (other class, version or config) are skipped."""
+        for name, component in components.items():
+            if name not in self.entries:
+                continue
+            if not self.is_current(name, component):
+                self.stale.append(name)
+                continue
+            try:
+                component.restore(
+                    DeferredSnapshot(self, name) if component.LAZY_RESTORE else self.load(name)
+                )
+            except Exception:
+                logger.exception(f"Failed restoring {name} from {self.path}")
+                continue
+            self.restored.append(name)
+        return self.restored
+
+    def close(self) -> None:
+        map_ = getattr(self, "_map", None)
+        if map_ is not None:
+            try:
+                map_.close()
+            except BufferError:
+                # A component still holds a view into the mapping, it's freed with the view
+                pass
+        self._file.close()
@@ -0,0 +1,137 @@
+from typing import Any, Callable, TYPE_CHECKING
+import functools
+
+if TYPE_CHECKING:
+    import typer
+
+
+def bind_command_to_owner(
+    func: Callable, owner: type | None, instance: Any = None
+) -> Callable:
+    """Wrap an unbound method so typer can call it, `instance` (or else a fresh `owner()`) is used
+    as `self`.
+
+    Plain functions (no leading `self` parameter) are returned unchanged.
+    """
+    import inspect
+
+    if owner is not None:
+        # Pick up overrides of the command in subclasses
+        func = getattr(owner, func.__name__, func)
+    signature = inspect.signature(func)
+    params = list(signature.parameters.values())
+    if owner is None or not params or params[0].name != "self":
+        return func
+
+    @functools.wraps(func)
+    def command(*args: Any, **kwargs: Any) -> Any:
+        return func(owner() if instance is None else instance, *args, **kwargs)
+
+    # typer can't handle **kwargs/*args, only expose the named parameters
+    command.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[
+            param
+            for param in params[1:]
+            if param.kind
+            not in (inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
+        ]
+    )
+    return command
+
+
+class LazyTyper:
+    """A stand-in for typer.Typer that defers importing typer until the CLI is actually used.
+
+    Commands registered with `command()` before the app is built are recorded and replayed onto the
+    real typer.Typer the first time it is needed (calling the app, or touching any other attribute).
+    This keeps `import src.application_container` free of typer/click/rich.
+
+    Used as a class attribute, each subclass gets its own copy of the recorded commands, and commands
+    defined as methods are run against a new instance of that subclass.
+    """
+
+    def __init__(
+        self,
+        owner: type | None = None,
+        pending_commands: list[tuple[tuple, dict, Callable]] | None = None,
+        **typer_kwargs: Any,
+    ) -> None:
+        self._owner = owner
+        self._typer_kwargs = typer_kwargs
+        self._pending_commands: list[tuple[tuple, dict, Callable]] = list(
+            pending_commands or []
+        )
+        self._subclass_apps: dict[type, LazyTyper] = {}
+        self._app: "typer.Typer | None" = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._owner = owner
+
+    def __get__(self, instance: Any, owner: type | None = None) -> "LazyTyper":
+        if owner is None or owner is self._owner:
+            return self
+        if owner not in self._subclass_apps:
+            self._subclass_apps[owner] = LazyTyper(
+                owner=owner, pending_commands=self._pending_commands, **self._typer_kwargs
+            )
+        return self._subclass_apps[owner]
+
+    @property
+    def built(self) -> bool:
+        return self._app is not None
+
+    @property
+    def command_names(self) -> list[str]:
+        """Names of the registered commands, available without building the app."""
+        names = []
+        for args, kwargs, func in self._pending_commands:
+            name = kwargs.get("name", args[0] if args else None)
+            names.append(name or func.__name__.lower().replace("_", "-"))
+        return names
+
+    def command(self, *args: Any, **kwargs: Any) -> Callable[[Callable], Callable]:
+        """Mirror of typer.Typer.command, records the command instead of building the app."""
+
+        def decorator(func: Callable) -> Callable:
+            self._pending_commands.append((args, kwargs, func))
+            if self._app is not None:
+                self._app.command(*args, **kwargs)(
+                    bind_command_to_owner(func, self._owner)
+                )
+            return func
+
+        return decorator
+
+    def build(self) -> "typer.Typer":
+        if self._app is None:
+            import typer
+
+            app = typer.Typer(**self._typer_kwargs)
+            for args, kwargs, func in self._pending_commands:
+                app.command(*args, **kwargs)(bind_command_to_owner(func, self._owner))
+            self._app = app
+        return self._app
+
+    def build_for(
+        self, instance: Any, wrap: Callable[[str, Callable], Callable] | None = None
+    ) -> "typer.Typer":
+        """A typer.Typer whose commands all run against `instance` rather than a new instance.
+
+        `wrap(name, command)` can wrap each command, it's called with the parsed arguments.
+        """
+        import typer
+
+        app = typer.Typer(**self._typer_kwargs)
+        for (args, kwargs, func), name in zip(self._pending_commands, self.command_names):
+            command = bind_command_to_owner(func, type(instance), instance)
+            app.command(*args, **kwargs)(command if wrap is None else wrap(name, command))
+        return app
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.build()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined on LazyTyper itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.build(), name)
@@ -1,14 +1,95 @@
 from abc import ABC
+from collections.abc import Mapping
 from pydantic import BaseModel
-from src.base_config import Config
-from typing import Any
+from src.base_config import Config, validate
+from typing import Any, ClassVar
+import hashlib
+import json
+
+
+def _is_config_value(value: Any) -> bool:
+    """Plain config data (as loaded from yaml), rather than an injected object."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_config_value(item) for item in value)
+    if isinstance(value, Mapping):
+        return all(_is_config_value(item) for item in value.values())
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    # Compact config trees (src.config_tree) hold FrozenMappings rather than dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    return repr(value)
 
 
 class ApplicationComponent(ABC):
+    # Bump when the snapshot() format changes, older checkpoints are then ignored
+    CHECKPOINT_VERSION: ClassVar[int] = 1
+    # Hand restore() a DeferredSnapshot (src.checkpoint) read on first use, instead of the state
+    LAZY_RESTORE: ClassVar[bool] = False
 
     def __init__(self, **kwargs: dict[str, Any]) -> None:
         for key, value in kwargs.items():
             setattr(self, key, value)
+        # The config values this component was built with, see config_hash
+        self._config_values = {
+            key: value
+            for key, value in kwargs.items()
+            if not key.startswith("_") and _is_config_value(value)
+        }
+
+    # Lifecycle hooks, called by the application on every manager.  No-ops by default.
+    def pre_run(self) -> None:
+        pass
+
+    def start(self) -> None:
+        pass
+
+    def pre_stop(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    # Checkpointing, override snapshot/restore to keep in-memory state across restarts
+    def snapshot(self) -> Any:
+        """State to checkpoint when the application stops, None (the default) opts out.
+
+        bytes-like snapshots are stored as is and handed back to restore() as a memoryview over
+        the memory-mapped checkpoint, anything else is pickled.
+        """
+        return None
+
+    def restore(self, state: Any) -> None:
+        """Called during configure with the state from the last matching snapshot().  With
+        LAZY_RESTORE, `state` is a DeferredSnapshot whose `get()` reads the state."""
+        pass
+
+    def config_hash(self) -> str:
+        """Identifies the config a snapshot was taken with, snapshots from other configs are stale.
+
+        Hashes the validated `params` if there are any, otherwise the component's section of the
+        global config (by its CONFIG's or its own PREFIX), otherwise the config values it was
+        constructed with.
+        """
+        params = getattr(self, "params", None)
+        if isinstance(params, BaseModel):
+            return hashlib.sha256(params.model_dump_json().encode()).hexdigest()
+        global_config = getattr(self, "_global_config", None)
+        prefix = getattr(getattr(self, "CONFIG", None), "PREFIX", None) or getattr(
+            self, "PREFIX", None
+        )
+        if global_config and isinstance(prefix, str):
+            section: Any = Config.scan_config_for_prefix(
+                global_config, prefix, surpress_warnings=True
+            )
+        else:
+            section = getattr(self, "_config_values", {})
+        encoded = json.dumps(section, sort_keys=True, default=_json_default)
+        return hashlib.sha256(encoded.encode()).hexdigest()
 
 
 class ConfigurableApplicationComponent(ApplicationComponent):
@@ -16,7 +97,7 @@ class ConfigurableApplicationComponent(ApplicationComponent):
 
     def __init__(self, **kwargs: dict[str, Any]) -> None:  # TODO global or local?
         super().__init__(**kwargs)  # TODO fix args
-        self.CONFIG.model_validate(kwargs)  # TODO validate config
+        self.params = validate(self.CONFIG, kwargs)  # TODO validate config
 
     # @classmethod
     # def register_config(cls, config: dict) -> None:
@@ -27,5 +108,5 @@ class ConfigurableApplicationComponent(ApplicationComponent):
         cls.CONFIG.model_validate(config, strict=not surpress_warnings)
 
     def apply_config(self, config: dict) -> BaseModel:
-        self.params = self.CONFIG.model_validate(config)
+        self.params = validate(self.CONFIG, config)
         return self.params
@@ -0,0 +1,246 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Mapping, Sequence
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ConfigurableApplicationComponent
+from src.metrics import Histogram
+import src.factory as factory
+
+logger = logging.getLogger(__name__)
+
+
+class BatcherConfig(Config):
+    # Where to import the batch function from, "module:callable", called with a list of keys
+    loader: str | None = None
+
+    max_batch_size: int = 100
+    max_delay: float = 0.005  # seconds the first call in a batch waits for others to join
+    max_in_flight: int = 4  # batches being loaded at once
+    dedupe: bool = True  # calls for a key already waiting share its result
+
+
+class _Pending:
+    """A key waiting for a batch, with a future per caller so one caller cancelling doesn't
+    cancel the others."""
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self.futures: list[Future] = []
+        self.enqueued = time.monotonic()
+
+    def add_caller(self) -> Future:
+        future: Future = Future()
+        self.futures.append(future)
+        return future
+
+    def set_result(self, result: Any) -> None:
+        for future in self.futures:
+            if future.set_running_or_notify_cancel():
+                future.set_result(result)
+
+    def set_exception(self, error: BaseException) -> None:
+        for future in self.futures:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+
+class Batcher(ConfigurableApplicationComponent):
+    """Collects single-key calls into batches for a downstream store that supports bulk calls.
+
+    Calls made within `max_delay` of each other (up to `max_batch_size` keys) are loaded with one
+    call to the configured `loader` (or an overridden `load_batch`), with at most `max_in_flight`
+    batches running at once.  Duplicate keys waiting in the same batch are loaded once.  `load`
+    blocks the calling thread, `load_async` awaits without blocking the event loop.
+
+        user = users.load(user_id)
+        user = await users.load_async(user_id)
+    """
+
+    CONFIG = BatcherConfig
+
+    BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+    WAIT_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.5, 1.0)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if self.params.max_batch_size < 1 or self.params.max_in_flight < 1:
+            raise ValueError("max_batch_size and max_in_flight must be at least 1")
+
+        self._loader: Callable[[list[Hashable]], Any] | None = None
+        self._waiting: dict[Hashable, _Pending] = {}  # insertion ordered, oldest first
+        self._queue: list[_Pending] = []  # used when dedupe is off
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._dispatcher: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._closed = False
+
+        # Metrics
+        self.calls = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.batch_sizes = Histogram(self.BATCH_SIZE_BUCKETS)
+        self.wait_times = Histogram(self.WAIT_BUCKETS)  # call -> batch dispatched
+
+    # Hook, override when the loader doesn't fit the config
+    def load_batch(self, keys: list[Hashable]) -> Sequence[Any] | Mapping[Hashable, Any]:
+        """Load every key at once, returns results in key order or a {key: result} mapping
+        (keys missing from the mapping raise KeyError for their callers)."""
+        if self._loader is None:
+            if self.params.loader is None:
+                raise ValueError(f"{type(self).__name__} needs a loader or a load_batch override")
+            self._loader = factory.load_classes([{"module": self.params.loader}])[0]
+        return self._loader(keys)
+
+    # Front ends
+    def submit(self, key: Hashable) -> Future:
+        """Queue `key` for the next batch, returns a Future for its result."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{type(self).__name__} is stopped")
+            self.calls += 1
+            if self.params.dedupe:
+                pending = self._waiting.get(key)
+                if pending is not None:
+                    self.deduplicated += 1
+                    return pending.add_caller()
+                pending = self._waiting[key] = _Pending(key)
+            else:
+                pending = _Pending(key)
+                self._queue.append(pending)
+            self._ensure_dispatcher()
+            self._condition.notify()
+            return pending.add_caller()
+
+    def load(self, key: Hashable, timeout: float | None = None) -> Any:
+        return self.submit(key).result(timeout)
+
+    def load_many(self, keys: Iterable[Hashable], timeout: float | None = None) -> list[Any]:
+        """Load several keys, they all join the current batch rather than one batch each."""
+        futures = [self.submit(key) for key in keys]
+        return [future.result(timeout) for future in futures]
+
+    async def load_async(self, key: Hashable) -> Any:
+        return await asyncio.wrap_future(self.submit(key))
+
+    # Dispatching
+    def _ensure_dispatcher(self) -> None:
+        # Caller holds self._condition
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.params.max_in_flight, thread_name_prefix="batcher"
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name=f"{type(self).__name__}-dispatch", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _pending_count(self) -> int:
+        return len(self._waiting) + len(self._queue)
+
+    def _oldest(self) -> _Pending:
+        if self._waiting:
+            return next(iter(self._waiting.values()))
+        return self._queue[0]
+
+    def _take_batch(self) -> list[_Pending]:
+        # Caller holds self._condition
+        size = self.params.max_batch_size
+        if self._waiting:
+            keys = list(itertools.islice(self._waiting, size))
+            return [self._waiting.pop(key) for key in keys]
+        batch, self._queue = self._queue[:size], self._queue[size:]
+        return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    pending = self._pending_count()
+                    if pending and self._in_flight < self.params.max_in_flight:
+                        # Dispatch once the batch is full, the oldest call has waited long
+                        # enough, or we're draining on stop
+                        due = self._oldest().enqueued + self.params.max_delay
+                        remaining = due - time.monotonic()
+                        if (
+                            pending >= self.params.max_batch_size
+                            or remaining <= 0
+                            or self._closed
+                        ):
+                            break
+                        self._condition.wait(remaining)
+                    elif self._closed and not pending and not self._in_flight:
+                        return
+                    else:
+                        self._condition.wait()
+                batch = self._take_batch()
+                self._in_flight += 1
+                now = time.monotonic()
+                self.batches += 1
+                self.batch_sizes.observe(len(batch))
+                for pending in batch:
+                    self.wait_times.observe(now - pending.enqueued)
+                executor = self._executor
+            assert executor is not None
+            executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list[_Pending]) -> None:
+        try:
+            keys = [pending.key for pending in batch]
+            try:
+                results = self.load_batch(keys)
+                if isinstance(results, Mapping):
+                    for pending in batch:
+                        if pending.key in results:
+                            pending.set_result(results[pending.key])
+                        else:
+                            pending.set_exception(KeyError(pending.key))
+                else:
+                    results = list(results)
+                    if len(results) != len(batch):
+                        raise ValueError(
+                            f"load_batch returned {len(results)} results for {len(batch)} keys"
+                        )
+                    for pending, result in zip(batch, results):
+                        pending.set_result(result)
+            except Exception as e:
+                with self._condition:
+                    self.failed_batches += 1
+                for pending in batch:
+                    pending.set_exception(e)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    # Lifecycle
+    def stop(self) -> None:
+        """Load everything still waiting, then stop taking calls."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            dispatcher, executor = self._dispatcher, self._executor
+        if dispatcher is not None:
+            dispatcher.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # Metrics
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "calls": self.calls,
+                "deduplicated": self.deduplicated,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "waiting": self._pending_count(),
+                "in_flight": self._in_flight,
+                "batch_size": self.batch_sizes.as_dict(),
+                "wait_time": self.wait_times.as_dict(),
+            }
@@ -0,0 +1,247 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+import logging
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ConfigurableApplicationComponent
+from src.custom_exceptions import ResourcePoolExhaustedError
+import src.factory as factory
+
+logger = logging.getLogger(__name__)
+
+
+class ResourcePoolConfig(Config):
+    # Where to import the resource factory from, "module:callable", e.g. "sqlite3:connect"
+    factory: str | None = None
+    factory_kwargs: dict[str, Any] = {}
+
+    min_size: int = 0
+    max_size: int = 10
+    idle_timeout: float = 300.0  # idle resources above min_size are closed after this long
+    acquire_timeout: float = 10.0
+    health_check: bool = True  # check idle resources before handing them out
+    drain_timeout: float = 5.0  # how long stop() waits for in-use resources to come back
+
+
+class ResourcePool(ConfigurableApplicationComponent):
+    """Generic pool of connections, clients or handles.
+
+    Resources are created by the configured `factory` (or by overriding `create_resource`), checked
+    with `check_resource` before reuse and closed with `close_resource`.  The pool is pre-warmed to
+    `min_size` in `pre_run` and drained in `stop`.
+
+        with pool.lease() as connection:
+            connection.execute(...)
+    """
+
+    CONFIG = ResourcePoolConfig
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if self.params.min_size > self.params.max_size:
+            raise ValueError("min_size can't be larger than max_size")
+
+        self._factory: Callable[..., Any] | None = None
+        self._idle: deque[tuple[Any, float]] = deque()  # (resource, returned at)
+        self._in_use: set[int] = set()
+        self._size = 0  # idle + in use + being created
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # Metrics
+        self.created = 0
+        self.destroyed = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.failed_checks = 0
+        self.peak_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    # Hooks, override for resources that don't fit factory/close()
+    def create_resource(self) -> Any:
+        if self._factory is None:
+            if self.params.factory is None:
+                raise ValueError(
+                    f"{type(self).__name__} needs a factory or a create_resource override"
+                )
+            self._factory = factory.load_classes([{"module": self.params.factory}])[0]
+        return self._factory(**self.params.factory_kwargs)
+
+    def check_resource(self, resource: Any) -> bool:
+        return True
+
+    def close_resource(self, resource: Any) -> None:
+        close = getattr(resource, "close", None)
+        if close is not None:
+            close()
+
+    # Acquire/release
+    def acquire(self, timeout: float | None = None) -> Any:
+        """Take a resource out of the pool, creating one if there's room.
+
+        Raises ResourcePoolExhaustedError if none frees up within `timeout` (defaults to the
+        configured acquire_timeout).
+        """
+        timeout = self.params.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            resource, create = None, False
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise ResourcePoolExhaustedError("Pool is closed")
+                    if self._idle:
+                        resource, _ = self._idle.pop()  # most recently used, likely still warm
+                        break
+                    if self._size < self.params.max_size:
+                        self._size += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise ResourcePoolExhaustedError(
+                            f"No resource available in {type(self).__name__} after {timeout}s"
+                        )
+                    self._condition.wait(remaining)
+
+            if create:
+                try:
+                    resource = self.create_resource()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif self.params.health_check and not self._check(resource):
+                self._destroy(resource)
+                continue
+
+            with self._condition:
+                self._in_use.add(id(resource))
+                self.created += create
+                self.acquired += 1
+                self.peak_in_use = max(self.peak_in_use, len(self._in_use))
+                waited = time.monotonic() - start
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+            return resource
+
+    def release(self, resource: Any, discard: bool = False) -> None:
+        """Return a resource to the pool, `discard` closes it instead (e.g. after an error)."""
+        with self._condition:
+            self._in_use.discard(id(resource))
+            keep = not discard and not self._closed
+            if keep:
+                self._idle.append((resource, time.monotonic()))
+                self._condition.notify()
+        if not keep:
+            self._destroy(resource)
+        self._reap_idle()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[Any]:
+        resource = self.acquire(timeout)
+        try:
+            yield resource
+        except Exception:
+            self.release(resource, discard=True)
+            raise
+        else:
+            self.release(resource)
+
+    def _check(self, resource: Any) -> bool:
+        try:
+            healthy = self.check_resource(resource)
+        except Exception:
+            healthy = False
+        if not healthy:
+            with self._condition:
+                self.failed_checks += 1
+        return healthy
+
+    def _destroy(self, resource: Any) -> None:
+        try:
+            self.close_resource(resource)
+        except Exception:
+            logger.exception(f"Failed closing resource in {type(self).__name__}")
+        with self._condition:
+            self._size -= 1
+            self.destroyed += 1
+            self._condition.notify()
+
+    def _reap_idle(self) -> None:
+        """Close resources idle for longer than idle_timeout, keeping at least min_size."""
+        expired = []
+        cutoff = time.monotonic() - self.params.idle_timeout
+        with self._condition:
+            # The left of the deque has been idle the longest
+            while (
+                self._idle
+                and self._idle[0][1] < cutoff
+                and self._size - len(expired) > self.params.min_size
+            ):
+                expired.append(self._idle.popleft()[0])
+        for resource in expired:
+            self._destroy(resource)
+
+    # Lifecycle
+    def pre_run(self) -> None:
+        """Pre-warm the pool up to min_size."""
+        with self._condition:
+            to_create = max(self.params.min_size - self._size, 0)
+            self._size += to_create
+        for created in range(to_create):
+            try:
+                resource = self.create_resource()
+            except Exception:
+                # Give back this slot and the ones reserved for the resources not created yet
+                with self._condition:
+                    self._size -= to_create - created
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self.created += 1
+                self._idle.append((resource, time.monotonic()))
+                self._condition.notify()
+
+    def stop(self) -> None:
+        """Stop handing out resources, wait for in-use ones to come back and close everything."""
+        deadline = time.monotonic() + self.params.drain_timeout
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            while self._in_use and time.monotonic() < deadline:
+                self._condition.wait(deadline - time.monotonic())
+            if self._in_use:
+                logger.warning(
+                    f"{type(self).__name__} stopped with {len(self._in_use)} resources still in use"
+                )
+            idle = [resource for resource, _ in self._idle]
+            self._idle.clear()
+        for resource in idle:
+            self._destroy(resource)
+
+    # Metrics
+    def stats(self) -> dict[str, float | int]:
+        with self._condition:
+            in_use = len(self._in_use)
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": in_use,
+                "peak_in_use": self.peak_in_use,
+                "utilisation": in_use / self.params.max_size,
+                "created": self.created,
+                "destroyed": self.destroyed,
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "failed_checks": self.failed_checks,
+                "mean_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait": self.max_wait,
+            }
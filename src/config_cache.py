@@ -0,0 +1,190 @@
+"""Cache of validated config models that persists across runs.
+
+Validation (including custom validators) only depends on the model and the raw config it's given,
+so when neither changed since the last run the validated fields are rebuilt with `model_construct`
+instead of validating again.  Entries are keyed by the model's identity and `CONFIG_VERSION`, its
+fields and their defaults (through its JSON schema) and the raw config subtree.  Bump
+`CONFIG_VERSION` when a model's validators change in a way the fields don't show.
+
+pydantic-core validates plain models in a few microseconds, less than a hit costs, so models opt
+in with `CACHE_VALIDATION = True` when their validators do real work (compiling patterns, reading
+files, ...).  `python -m benchmarks.config_cache` compares both.
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, TypeVar
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+from pydantic import BaseModel
+
+from src.base_config import Config
+import src.base_config as base_config
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ConfigCacheConfig(Config):
+    PREFIX = "ConfigCache"
+
+    path: str | None = None  # no path, no caching
+    strict: bool = False  # always re-validate, e.g. while changing validators
+
+
+def _mapping_as_dict(value: Any) -> dict:
+    # Compact config trees (src.config_tree) hold FrozenMappings rather than dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ValidatedConfigCache:
+    """Validated model fields from earlier runs, loaded from and saved to `path`.
+
+    Raw configs that aren't JSON serializable (e.g. kwargs with injected objects) aren't cached,
+    neither are models with extra fields allowed, since their fields depend on the whole config.
+    """
+
+    def __init__(self, path: Path | str | None = None, strict: bool = False) -> None:
+        self.path = None if path is None else Path(path)
+        self.strict = strict
+        self._entries: dict[tuple[str, str], bytes] = {}
+        self._used: set[tuple[str, str]] = set()
+        self._saved: set[tuple[str, str]] = set()  # keys in the file
+        self._model_keys: dict[type, tuple[str, frozenset[str]] | None] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            self._entries = pickle.loads(self.path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable config cache {self.path}: {e}")
+            self._entries = {}
+        self._saved = set(self._entries)
+
+    def save(self) -> None:
+        """Write the entries used in this run so far, entries nothing asked for are left out of
+        the file (but kept in memory, in case they're asked for later in the run)."""
+        if self.path is None or self._used == self._saved:
+            return
+        entries = {key: self._entries[key] for key in self._used}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(pickle.dumps(entries, pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, self.path)
+        self._saved = set(self._used)
+
+    def _model_key(self, model: type[BaseModel]) -> tuple[str, frozenset[str]] | None:
+        """The model's part of the key and the config keys validation looks at, None for models
+        that can't be cached."""
+        if model not in self._model_keys:
+            schema = self._schema(model)
+            if model.model_config.get("extra") not in (None, "ignore") or schema is None:
+                self._model_keys[model] = None
+            else:
+                fields = sorted(
+                    (name, repr(field.annotation), field.alias)
+                    for name, field in model.model_fields.items()
+                )
+                key = repr(
+                    (
+                        model.__module__,
+                        model.__qualname__,
+                        getattr(model, "CONFIG_VERSION", None),
+                        fields,
+                        schema,
+                    )
+                )
+                names = {name for name, _, _ in fields} | {
+                    alias for _, _, alias in fields if alias
+                }
+                self._model_keys[model] = (key, frozenset(names))
+        return self._model_keys[model]
+
+    @staticmethod
+    def _schema(model: type[BaseModel]) -> str | None:
+        """Digest of what a hit would silently reuse: the JSON schema (field defaults, including
+        those of nested models) and the values default factories produce.  None when the model
+        has no JSON schema."""
+        try:
+            schema = json.dumps(model.model_json_schema(), sort_keys=True)
+        except Exception:
+            return None
+        factories = sorted(
+            (name, repr(field.get_default(call_default_factory=True)))
+            for name, field in model.model_fields.items()
+            if field.default_factory is not None
+        )
+        return hashlib.sha256(repr((schema, factories)).encode()).hexdigest()
+
+    def _key(self, model: type[BaseModel], data: Any) -> tuple[str, str] | None:
+        model_key = self._model_key(model)
+        if model_key is None or not isinstance(data, Mapping):
+            return None
+        key, names = model_key
+        # Extra keys are ignored by validation, leaving them out lets e.g. component kwargs with
+        # injected objects still hit
+        try:
+            raw = json.dumps(
+                {name: value for name, value in data.items() if name in names},
+                sort_keys=True,
+                default=_mapping_as_dict,
+            )
+        except (TypeError, ValueError):
+            return None
+        return key, raw
+
+    def validate(self, model: type[ModelT], data: Any) -> ModelT:
+        """`model.model_validate(data)`, skipped when an earlier run validated the same config."""
+        if self.strict:
+            return model.model_validate(data)
+        key = self._key(model, data)
+        if key is None:
+            self.uncacheable += 1
+            return model.model_validate(data)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            try:
+                fields, fields_set = pickle.loads(entry)
+            except Exception:
+                pass
+            else:
+                self.hits += 1
+                self._used.add(key)
+                return model.model_construct(_fields_set=fields_set, **fields)
+
+        self.misses += 1
+        instance = model.model_validate(data)
+        try:
+            self._entries[key] = pickle.dumps(
+                (dict(instance.__dict__), set(instance.model_fields_set)),
+                pickle.HIGHEST_PROTOCOL,
+            )
+        except Exception:
+            return instance  # unpicklable field values, validate these every run
+        self._used.add(key)
+        return instance
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "entries": len(self._entries),
+        }
+
+
+def install_config_cache(cache: ValidatedConfigCache | None) -> None:
+    """Make `Config.validated` go through `cache`, None validates every time again."""
+    base_config.validation_cache = cache
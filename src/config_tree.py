@@ -0,0 +1,123 @@
+"""Compact, immutable representation of a loaded config.
+
+`freeze` turns the nested dicts/lists `yaml.safe_load` returns into `FrozenMapping`s and tuples:
+
+- keys and string values are interned, so the module paths and enum strings repeated across
+  thousands of entries are stored once
+- identical subtrees (and equal scalars) are shared, built bottom-up with a memo
+- mappings of up to `FrozenMapping.SMALL` keys are backed by a keys tuple and a values tuple,
+  larger ones add a key -> position index
+
+The result reads like a mapping, so `Config.scan_config_for_prefix` and pydantic validation take it
+as is (lists come back as tuples, which pydantic accepts for list fields outside strict mode).
+`copy()` gives back plain dicts and lists, for code that edits a config entry before using it.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Iterator
+import sys
+
+
+class FrozenMapping(Mapping):
+    """Immutable, hashable mapping backed by tuples, see the module docstring."""
+
+    __slots__ = ("_keys", "_values", "_index", "_hash")
+
+    SMALL = 8  # up to this many keys are found by scanning the keys tuple
+
+    def __init__(self, keys: tuple = (), values: tuple = ()) -> None:
+        self._keys = keys
+        self._values = values
+        self._index = (
+            {key: position for position, key in enumerate(keys)}
+            if len(keys) > self.SMALL
+            else None
+        )
+        self._hash: int | None = None
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._index is not None:
+            return self._values[self._index[key]]
+        try:
+            # tuple.index compares by identity first, interned keys rarely need __eq__
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        if self._index is not None:
+            return key in self._index
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(zip(self._keys, self._values)))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenMapping) and self._keys == other._keys:
+            return self._values == other._values
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in zip(self._keys, self._values))
+        return f"FrozenMapping({{{items}}})"
+
+    def __reduce__(self) -> tuple:
+        return FrozenMapping, (self._keys, self._values)
+
+    def copy(self) -> dict:
+        """A mutable copy as plain dicts and lists, so managers' `entry.copy()` then `.pop(...)`
+        works on config trees too, and the resolver sees the list/dict values it type-checks for."""
+        return self.thaw()
+
+    def thaw(self) -> dict:
+        """Back to plain nested dicts and lists."""
+        return {key: thaw(value) for key, value in zip(self._keys, self._values)}
+
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, FrozenMapping):
+        return value.thaw()
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def freeze(value: Any) -> Any:
+    """Compact, immutable copy of a loaded config, see the module docstring."""
+    # The memo maps a node's structure to its canonical instance.  Scalars are keyed by type too,
+    # so 1, 1.0 and True stay distinct, containers by the ids of their (already canonical) items
+    memo: dict[Any, Any] = {}
+
+    def canonical(key: Any, node: Any) -> Any:
+        return memo.setdefault(key, node)
+
+    def walk(node: Any) -> Any:
+        if isinstance(node, Mapping):
+            keys = tuple(sys.intern(k) if type(k) is str else walk(k) for k in node.keys())
+            values = tuple(walk(v) for v in node.values())
+            memo_key = ("map", keys, tuple(map(id, values)))
+            frozen = memo.get(memo_key)
+            if frozen is None:
+                # Share the keys tuple between mappings with the same keys
+                keys = canonical(("keys", keys), keys)
+                frozen = canonical(memo_key, FrozenMapping(keys, values))
+            return frozen
+        if isinstance(node, (list, tuple)):
+            items = tuple(walk(item) for item in node)
+            return canonical(("seq", tuple(map(id, items))), items)
+        if type(node) is str:
+            return sys.intern(node)
+        try:
+            return canonical((type(node), node), node)
+        except TypeError:
+            return node  # unhashable scalar, leave it be
+
+    return walk(value)
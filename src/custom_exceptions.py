@@ -4,3 +4,7 @@ class DependencyInjectionError(Exception):
 
 class ConfigValidationError(Exception):
     pass
+
+
+class ResourcePoolExhaustedError(Exception):
+    pass
@@ -0,0 +1,357 @@
+"""Keeps one configured container resident and serves CLI commands from it over a Unix socket.
+
+    python -m src.application_container daemon config.yaml &
+    python -m src.application_container <command> ...   # forwarded to the daemon
+    python -m src.application_container daemon config.yaml --stop
+
+Every CLI invocation otherwise pays for importing typer/pydantic, parsing and validating the
+config and constructing the managers.  `main` forwards argv and the working directory to the daemon
+and streams the command's stdout/stderr back, or runs the command in-process when no daemon is
+listening.  Relative path arguments are taken relative to the client's working directory, the
+daemon's own doesn't change.  The daemon runs commands one at a time against its container, which
+is already configured, so `configure` with the daemon's config returns straight away.  When the
+config file changes the container is stopped and built again before the next command.
+
+Commands the shared container can't answer for the client are handed back and run in-process:
+the `IN_PROCESS_COMMANDS` of the application (`run`, `pre-run`, ... start managers or configure
+a container of their own), commands given another config (or none) than the daemon's, and any
+command while the daemon's config doesn't build.
+
+The socket is `$INFRAREUSE_DAEMON_SOCKET`, or else `daemon.sock` in `$XDG_RUNTIME_DIR/infrareuse`
+(`$TMPDIR/infrareuse-<uid>` without one), a directory only the user can enter.  Setting
+`INFRAREUSE_DAEMON_SOCKET` to an empty string turns forwarding off.  Commands run with the daemon
+owner's rights, so the socket is created 0600 and both ends check the other is the same user
+(SO_PEERCRED, or the socket file's owner where that's not available).
+
+Protocol: one JSON object per line.  The client sends {"argv": [...], "cwd": ...} (or
+{"control": "stop"}), the daemon answers with {"stdout": text} / {"stderr": text} lines as the
+command writes and a final {"exit": code}, or just {"fallback": true} to run it in-process.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, TextIO, TYPE_CHECKING
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import sys
+import traceback
+
+if TYPE_CHECKING:
+    import typer
+    from src.application_container import CustomApplication
+
+logger = logging.getLogger(__name__)
+
+
+class _RunInProcess(Exception):
+    """The command is handed back to the client, see the module docstring."""
+
+SOCKET_ENV = "INFRAREUSE_DAEMON_SOCKET"
+
+
+def runtime_dir() -> Path:
+    """The per-user directory the default socket is in."""
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / "infrareuse"
+    return Path(os.environ.get("TMPDIR", "/tmp")) / f"infrareuse-{os.getuid()}"
+
+
+def default_socket_path() -> Path | None:
+    """The socket from the environment, None when forwarding is turned off."""
+    configured = os.environ.get(SOCKET_ENV)
+    if configured is not None:
+        return Path(configured) if configured else None
+    return runtime_dir() / "daemon.sock"
+
+
+def _check_private_dir(directory: Path) -> None:
+    """Raises PermissionError unless `directory` is owned by this user and closed to others."""
+    info = directory.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(
+            f"{directory} has to be a directory owned by uid {os.getuid()} with mode 0700"
+        )
+
+
+def _peer_uid(connection: socket.socket, path: Path) -> int:
+    """The uid of the process at the other end, the socket file's owner without SO_PEERCRED."""
+    if hasattr(socket, "SO_PEERCRED"):
+        size = struct.calcsize("3i")
+        _, uid, _ = struct.unpack(
+            "3i", connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, size)
+        )
+        return uid
+    return path.stat().st_uid
+
+
+def _send(stream: TextIO, message: dict[str, Any]) -> None:
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that sends each write to the client as a {name: text} message."""
+
+    def __init__(self, connection: TextIO, name: str) -> None:
+        self._connection = connection
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self._connection, {self._name: text})
+        return len(text)
+
+
+class ContainerDaemon:
+    """Serves CLI commands from a resident container, see the module docstring."""
+
+    def __init__(
+        self,
+        application: type[CustomApplication],
+        config_path: Path | str,
+        socket_path: Path | str | None = None,
+    ) -> None:
+        self.application = application
+        self.config_path = Path(config_path).resolve()
+        path = default_socket_path() if socket_path is None else Path(socket_path)
+        if path is None:
+            raise ValueError(f"No daemon socket, {SOCKET_ENV} is empty")
+        self.socket_path = path
+        self.container: CustomApplication | None = None
+        self.builds = 0
+        self.served = 0
+        self._cli: typer.Typer | None = None
+        self._fingerprint: tuple[int, int, int] | None = None
+        self._server: socket.socket | None = None
+        self._stopping = False
+        self._cwd: Path | None = None
+
+    # Container
+    def _config_fingerprint(self) -> tuple[int, int, int]:
+        stat = self.config_path.stat()
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _shutdown_container(self) -> None:
+        container, self.container, self._cli = self.container, None, None
+        if container is not None:
+            container.pre_stop()
+            container.stop()
+
+    def warm(self) -> CustomApplication:
+        """The resident container, (re)built first when the config changed since it was built."""
+        fingerprint = self._config_fingerprint()
+        if self.container is None or fingerprint != self._fingerprint:
+            if self.container is not None:
+                logger.info(f"{self.config_path} changed, rebuilding the container")
+            self._shutdown_container()
+            container = self.application()
+            container.configure(self.config_path)
+            self.container, self._fingerprint = container, fingerprint
+            self._cli = self.application.app.build_for(container, self._guard)
+            self.builds += 1
+        return self.container
+
+    # Commands
+    def _guard(self, name: str, command: Callable) -> Callable:
+        """Resolves relative paths against the client's working directory and hands commands
+        given another config than the daemon's back to the client."""
+
+        @functools.wraps(command)
+        def guarded(**kwargs: Any) -> Any:
+            if self._cwd is not None:
+                kwargs = {
+                    key: self._cwd / value
+                    if isinstance(value, Path) and not value.is_absolute()
+                    else value
+                    for key, value in kwargs.items()
+                }
+            if "config_path" in kwargs:
+                config_path = kwargs["config_path"]
+                if config_path is None or Path(config_path).resolve() != self.config_path:
+                    raise _RunInProcess(name)
+            return command(**kwargs)
+
+        return guarded
+
+    def run_command(
+        self, argv: list[str], stdout: TextIO, stderr: TextIO, cwd: Path | str | None = None
+    ) -> int | None:
+        """Run one CLI command against the resident container, returns its exit code, or None
+        when the client has to run it in-process (see the module docstring).  Relative path
+        arguments are resolved against `cwd`."""
+        if argv and argv[0] in self.application.IN_PROCESS_COMMANDS:
+            return None
+        try:
+            self.warm()
+        except Exception as e:
+            logger.warning(f"Can't build the container for {self.config_path}: {e}")
+            return None
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self._cwd = None if cwd is None else Path(cwd)
+            try:
+                assert self._cli is not None
+                self._cli(args=argv, standalone_mode=True)
+            except _RunInProcess:
+                return None
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    return e.code or 0
+                print(e.code, file=sys.stderr)
+                return 1
+            except Exception:
+                traceback.print_exc()
+                return 1
+            finally:
+                self._cwd = None
+        return 0
+
+    def _handle(self, connection: socket.socket) -> None:
+        with connection:
+            uid = _peer_uid(connection, self.socket_path)
+            if uid != os.getuid():
+                logger.warning(f"Refused a daemon request from uid {uid}")
+                return
+            self._serve_request(connection)
+
+    def _serve_request(self, connection: socket.socket) -> None:
+        with connection.makefile("rw", encoding="utf-8") as stream:
+            line = stream.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            if request.get("control") == "stop":
+                self._stopping = True
+                _send(stream, {"exit": 0})
+                return
+            code = self.run_command(
+                list(request.get("argv", [])),
+                _FrameWriter(stream, "stdout"),
+                _FrameWriter(stream, "stderr"),
+                request.get("cwd"),
+            )
+            if code is None:
+                _send(stream, {"fallback": True})
+                return
+            self.served += 1
+            _send(stream, {"exit": code})
+
+    # Serving
+    def bind(self) -> None:
+        """Listen on the socket, replacing a stale one left by a daemon that died."""
+        if self.socket_path.parent == runtime_dir():
+            self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            _check_private_dir(self.socket_path.parent)
+        if self.socket_path.exists():
+            client = _connect(self.socket_path)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Created 0600 rather than chmod-ed after, so there's no moment others could connect
+        umask = os.umask(0o177)
+        try:
+            self._server.bind(str(self.socket_path))
+        finally:
+            os.umask(umask)
+        self._server.listen()
+
+    def serve_forever(self) -> None:
+        """Build the container, then serve commands until asked to stop (or interrupted)."""
+        self.warm()
+        if self._server is None:
+            self.bind()
+        assert self._server is not None
+        logger.info(f"Serving {self.config_path} on {self.socket_path}")
+        try:
+            while not self._stopping:
+                connection, _ = self._server.accept()
+                try:
+                    self._handle(connection)
+                except (OSError, ValueError) as e:
+                    # Client went away or sent garbage, the next one is served as usual
+                    logger.warning(f"Dropped a daemon request: {e}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.close()
+            self._server = None
+            self.socket_path.unlink(missing_ok=True)
+            self._shutdown_container()
+
+
+# Client
+def _connect(path: Path) -> socket.socket | None:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+    return client
+
+
+def _request(message: dict[str, Any], socket_path: Path | str | None) -> int | None:
+    path = default_socket_path() if socket_path is None else Path(socket_path)
+    if path is None:
+        return None
+    try:
+        if path.parent == runtime_dir() and path.parent.exists():
+            _check_private_dir(path.parent)
+    except PermissionError as e:
+        print(f"Not using the daemon: {e}", file=sys.stderr)
+        return None
+    client = _connect(path)
+    if client is None:
+        return None
+    uid = _peer_uid(client, path)
+    if uid != os.getuid():
+        client.close()
+        print(f"Not using the daemon on {path}, it runs as uid {uid}", file=sys.stderr)
+        return None
+    with client, client.makefile("rw", encoding="utf-8") as stream:
+        _send(stream, message)
+        for line in stream:
+            reply = json.loads(line)
+            if "exit" in reply:
+                return reply["exit"]
+            if reply.get("fallback"):
+                return None
+            for name, output in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+                if name in reply:
+                    output.write(reply[name])
+                    output.flush()
+    print("The daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+def forward(argv: list[str], socket_path: Path | str | None = None) -> int | None:
+    """Run a command on the daemon, streaming its output.  None when no daemon is listening or
+    the command has to run in-process."""
+    return _request({"argv": argv, "cwd": os.getcwd()}, socket_path)
+
+
+def stop_daemon(socket_path: Path | str | None = None) -> bool:
+    """Ask the daemon to stop, False when none is listening."""
+    return _request({"control": "stop"}, socket_path) is not None
+
+
+def main(application: type[CustomApplication], argv: list[str] | None = None) -> None:
+    """CLI entry point: on the daemon when one is listening, in-process otherwise."""
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] != "daemon":
+        code = forward(args)
+        if code is not None:
+            raise SystemExit(code)
+    application.app(args=args)
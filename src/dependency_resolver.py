@@ -1,8 +1,15 @@
-from typing import Any, GenericAlias
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, GenericAlias, TYPE_CHECKING
 from types import UnionType
 import inspect
+import weakref
 from src.custom_exceptions import DependencyInjectionError
 
+if TYPE_CHECKING:
+    from src.memory_accounting import MemoryAccountant
+
 
 class ConfigArg:
     """An argument that is passed in from the config, to match the python signature method."""
@@ -116,9 +123,118 @@ class ResolveByNameAndType(Policy):
         return None
 
 
+class _WeakEntry:
+    """A weakly registered object in the bag, dropped once nothing else references it."""
+
+    def __init__(self, ref: weakref.ref) -> None:
+        self.ref = ref
+
+
+class _ScopeView(Mapping):
+    """Read-only view of a resolver's objects, its parents' and any additional objects, without
+    copying any of them.  Earlier layers shadow later ones, weak entries are dereferenced on access."""
+
+    def __init__(self, *layers: dict[str, Any]) -> None:
+        self._layers = layers
+
+    def __getitem__(self, name: str) -> Any:
+        for layer in self._layers:
+            if name in layer:
+                value = layer[name]
+                if isinstance(value, _WeakEntry):
+                    value = value.ref()
+                    if value is None:
+                        continue  # collected, fall back to the parents
+                return value
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for layer in self._layers:
+            for name, value in list(layer.items()):
+                if isinstance(value, _WeakEntry) and value.ref() is None:
+                    continue
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+
+# The resolver scope active in the current thread/task, see DependencyResolver.scope
+_active_scope: ContextVar["DependencyResolver | None"] = ContextVar(
+    "active_resolver_scope", default=None
+)
+
+
 class DependencyResolver:  # Todo make a singleton?
-    def __init__(self):
+    def __init__(self, parent: "DependencyResolver | None" = None):
         self._object_bag: dict[str, Any] = {"_resolver": self}
+        self.parent = parent
+        # Set to attribute construction memory to each object, see CustomApplication
+        self.memory_accountant: "MemoryAccountant | None" = (
+            parent.memory_accountant if parent is not None else None
+        )
+
+    def child(self) -> "DependencyResolver":
+        """A child container that sees everything registered here (and in the parents), while
+        objects added to it stay local to it.  Creating one is O(1), nothing is copied."""
+        return DependencyResolver(parent=self)
+
+    @contextmanager
+    def scope(self, **overrides: Any) -> Iterator["DependencyResolver"]:
+        """Activate a child container with `overrides` for the current context, e.g. per request
+        or per tenant.  Threads and asyncio tasks each see their own active scope."""
+        child = self.child()
+        child._object_bag.update(overrides)
+        token = _active_scope.set(child)
+        try:
+            yield child
+        finally:
+            _active_scope.reset(token)
+
+    @staticmethod
+    def current() -> "DependencyResolver | None":
+        """The innermost scope activated with `scope()` in this context, if any."""
+        return _active_scope.get()
+
+    def active(self) -> "DependencyResolver":
+        """The active scope if it's this container or one of its descendants, otherwise self."""
+        scope = _active_scope.get()
+        node = scope
+        while node is not None:
+            if node is self:
+                return scope
+            node = node.parent
+        return self
+
+    def _view(self, additional_objects: dict[str, Any] | None = None) -> _ScopeView:
+        layers = [additional_objects] if additional_objects else []
+        resolver = self
+        while resolver is not None:
+            layers.append(resolver._object_bag)
+            resolver = resolver.parent
+        return _ScopeView(*layers)
+
+    def _live_objects(self) -> dict[str, Any]:
+        """This container's own objects with weak entries dereferenced, entries whose object is
+        gone are left out.  Doesn't include the parents' objects."""
+        objects = {}
+        for name, value in self._object_bag.items():
+            if isinstance(value, _WeakEntry):
+                value = value.ref()
+                if value is None:
+                    continue
+            objects[name] = value
+        return objects
 
     def resolve(self):
         pass
@@ -142,8 +258,7 @@ class DependencyResolver:  # Todo make a singleton?
         signature = inspect.signature(object)
         to_resolve = []
 
-        available_objects = self._object_bag.copy()
-        available_objects.update(additional_objects)
+        available_objects = self._view(additional_objects)
 
         config = getattr(object, "CONFIG", {})
         config = config.model_fields if config else {}
@@ -203,5 +318,50 @@ class DependencyResolver:  # Todo make a singleton?
 
         return kwargs
 
-    def add_object(self, object_instance: Any, name: str) -> None:
-        self._object_bag[name] = object_instance
+    def add_object(self, object_instance: Any, name: str, weak: bool = False) -> None:
+        """Register an object under `name`.
+
+        weak: only keep a weak reference, so transient or large objects are released once their
+        consumers are gone.  Raises TypeError for objects that can't be weakly referenced
+        (plain dicts, lists, ints, ...).
+        """
+        if not weak:
+            self._object_bag[name] = object_instance
+            return
+
+        def remove(ref: weakref.ref) -> None:
+            if self._object_bag.get(name) is entry:
+                del self._object_bag[name]
+
+        entry = _WeakEntry(weakref.ref(object_instance, remove))
+        self._object_bag[name] = entry
+
+    def get_object(self, name: str, default: Any = None) -> Any:
+        """Look `name` up here, then in the parents."""
+        return self._view().get(name, default)
+
+    def construct(
+        self,
+        object_class: type,
+        name: str,
+        policy: Policy = ResolveByNameAndType,
+        additional_objects: dict[str, Any] = {},
+        weak: bool = False,
+        **extra_kwargs: Any,
+    ) -> Any:
+        """Resolve the kwargs of `object_class`, build it and register it under `name`.
+
+        Construction is measured by the memory accountant when one is set.
+        """
+        measure = (
+            self.memory_accountant.measure(name)
+            if self.memory_accountant is not None
+            else nullcontext()
+        )
+        with measure:
+            kwargs = self.resolve_object_kwargs(
+                object_class, policy=policy, additional_objects=additional_objects
+            )
+            instance = object_class(**kwargs, **extra_kwargs)
+        self.add_object(instance, name, weak=weak)
+        return instance
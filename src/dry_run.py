@@ -0,0 +1,588 @@
+"""Static ("dry-run") validation of an application config.
+
+Checks every manager in `Managers` and every component entry (a mapping with a `module` key) against
+its `__init__` signature and `CONFIG` model, the same way `DependencyResolver.resolve_object_kwargs`
+would resolve them, but by reading the source with `ast` instead of importing and constructing
+anything.  The sections the application reads itself (`APPLICATION_SECTIONS`) are checked against
+their Config models.  All problems are collected in one pass.
+"""
+
+from pathlib import Path
+from typing import Any
+import ast
+import sys
+
+MANAGERS_SECTION = "Managers"
+COMPONENT_RESERVED_KEYS = ("module", "enabled")
+# Parameters supplied by the application/resolver themselves
+IMPLICIT_PARAMS = ("self", "_global_config")
+RESOLVER_CLASS = "DependencyResolver"
+# Sections the application reads itself, with their Config models
+APPLICATION_SECTIONS = {
+    "Checkpoint": "src.checkpoint:CheckpointConfig",
+    "ConfigCache": "src.config_cache:ConfigCacheConfig",
+    "Profiler": "src.profiler:ProfilerConfig",
+    "Supervisor": "src.supervisor:SupervisorConfig",
+}
+# Where the application's own modules are, wherever the config's components are looked up
+_APPLICATION_ROOT = str(Path(__file__).resolve().parents[1])
+
+_SCALARS: dict[str, tuple[type, ...]] = {
+    "int": (int,),
+    "float": (int, float),
+    "str": (str,),
+    "bool": (bool,),
+    "list": (list, tuple),
+    "tuple": (list, tuple),
+    "set": (list, tuple, set),
+    "dict": (dict,),
+    "bytes": (bytes, str),
+}
+_BOOL_STRINGS = {"true", "false", "yes", "no", "on", "off", "1", "0", "t", "f", "y", "n"}
+
+
+class ValidationIssue:
+    """A single problem found in the config.
+
+    kind is one of:
+        unresolvable - a module/class/source that couldn't be found
+        missing - a required argument or config field with nothing to resolve it from
+        type - a value or injected object that doesn't match the annotation
+        unknown - a config key nothing reads
+    """
+
+    def __init__(self, location: str, kind: str, message: str) -> None:
+        self.location = location
+        self.kind = kind
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue(location={self.location}, kind={self.kind}, message={self.message})"
+
+    def __str__(self) -> str:
+        return f"[{self.kind}] {self.location}: {self.message}"
+
+
+class ParamInfo:
+    """An `__init__` parameter or a `CONFIG` model field, as read from the source."""
+
+    def __init__(
+        self,
+        name: str,
+        annotation: ast.expr | None,
+        has_default: bool,
+        variadic: bool = False,
+    ) -> None:
+        self.name = name
+        self.annotation = annotation
+        self.has_default = has_default
+        self.variadic = variadic
+
+    @property
+    def optional(self) -> bool:
+        return self.has_default or _allows_none(self.annotation)
+
+
+class ClassInfo:
+    """What the validator knows about a class from its source, bases are resolved lazily."""
+
+    def __init__(self, loader: "SourceLoader", module: str, node: ast.ClassDef) -> None:
+        self.loader = loader
+        self.module = module
+        self.node = node
+        self.name = node.name
+
+    def __repr__(self) -> str:
+        return f"ClassInfo({self.module}:{self.name})"
+
+    def bases(self) -> list["ClassInfo | str"]:
+        """Resolved base classes, bases that can't be found statically are kept as their name."""
+        bases: list[ClassInfo | str] = []
+        for base in self.node.bases:
+            name = _dotted_name(base)
+            if name is None:
+                continue
+            resolved = self.loader.resolve_name(self.module, name)
+            bases.append(resolved if resolved is not None else name.rsplit(".", 1)[-1])
+        return bases
+
+    def mro(self) -> list["ClassInfo | str"]:
+        seen: list[ClassInfo | str] = []
+        pending: list[ClassInfo | str] = [self]
+        while pending:
+            cls = pending.pop(0)
+            if any(_same(cls, other) for other in seen):
+                continue
+            seen.append(cls)
+            if isinstance(cls, ClassInfo):
+                pending.extend(cls.bases())
+        return seen
+
+    def type_names(self) -> set[str] | None:
+        """Names this class is an instance of, None if part of the hierarchy couldn't be read."""
+        names = set()
+        complete = True
+        for cls in self.mro():
+            if isinstance(cls, ClassInfo):
+                names.add(cls.name)
+            elif cls not in ("ABC", "object", "Generic"):
+                complete = False
+        return names if complete else None
+
+    def _class_body(self, name: str) -> ast.stmt | None:
+        for statement in self.node.body:
+            if isinstance(statement, ast.FunctionDef) and statement.name == name:
+                return statement
+            if isinstance(statement, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == name
+                for target in statement.targets
+            ):
+                return statement
+            if (
+                isinstance(statement, ast.AnnAssign)
+                and isinstance(statement.target, ast.Name)
+                and statement.target.id == name
+                and statement.value is not None
+            ):
+                return statement
+        return None
+
+    def _lookup(self, name: str) -> tuple["ClassInfo", ast.stmt] | None:
+        for cls in self.mro():
+            if isinstance(cls, ClassInfo):
+                statement = cls._class_body(name)
+                if statement is not None:
+                    return cls, statement
+        return None
+
+    def init_params(self) -> list[ParamInfo]:
+        found = self._lookup("__init__")
+        if found is None or not isinstance(found[1], ast.FunctionDef):
+            return []
+        args = found[1].args
+        params = []
+        positional = args.posonlyargs + args.args
+        defaults = [False] * (len(positional) - len(args.defaults)) + [True] * len(
+            args.defaults
+        )
+        for arg, has_default in zip(positional, defaults):
+            params.append(ParamInfo(arg.arg, arg.annotation, has_default))
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            params.append(ParamInfo(arg.arg, arg.annotation, default is not None))
+        for arg in (args.vararg, args.kwarg):
+            if arg is not None:
+                params.append(ParamInfo(arg.arg, arg.annotation, True, variadic=True))
+        return [param for param in params if param.name not in IMPLICIT_PARAMS]
+
+    def _attribute(self, name: str) -> ast.expr | None:
+        found = self._lookup(name)
+        if found is None or isinstance(found[1], ast.FunctionDef):
+            return None
+        return found[1].value  # type: ignore[attr-defined]
+
+    def prefix(self) -> str | None:
+        value = self._attribute("PREFIX")
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value
+        return None
+
+    def config_model(self) -> "ClassInfo | None":
+        found = self._lookup("CONFIG")
+        if found is None or isinstance(found[1], ast.FunctionDef):
+            return None
+        owner, statement = found
+        name = _dotted_name(statement.value)  # type: ignore[attr-defined]
+        return None if name is None else self.loader.resolve_name(owner.module, name)
+
+    def fields(self) -> list[ParamInfo]:
+        """Annotated class attributes, i.e. pydantic model fields, base class fields first."""
+        fields: dict[str, ParamInfo] = {}
+        for cls in reversed(self.mro()):
+            if not isinstance(cls, ClassInfo):
+                continue
+            for statement in cls.node.body:
+                if not (
+                    isinstance(statement, ast.AnnAssign)
+                    and isinstance(statement.target, ast.Name)
+                ):
+                    continue
+                name = statement.target.id
+                if name.startswith("_") or _is_classvar(statement.annotation):
+                    continue
+                fields[name] = ParamInfo(
+                    name, statement.annotation, _field_has_default(statement.value)
+                )
+        return list(fields.values())
+
+
+class SourceLoader:
+    """Finds and parses module source without importing it."""
+
+    def __init__(self, search_path: list[str] | None = None) -> None:
+        self.search_path = [Path(p or ".") for p in (search_path or sys.path)]
+        self._modules: dict[str, ast.Module | None] = {}
+
+    def find_source(self, module: str) -> Path | None:
+        parts = module.split(".")
+        for root in self.search_path:
+            base = root.joinpath(*parts)
+            for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+                if candidate.is_file():
+                    return candidate
+        return None
+
+    def parse(self, module: str) -> ast.Module | None:
+        if module not in self._modules:
+            source = self.find_source(module)
+            self._modules[module] = (
+                None if source is None else ast.parse(source.read_text(), str(source))
+            )
+        return self._modules[module]
+
+    def load(self, module: str, name: str) -> ClassInfo | None:
+        tree = self.parse(module)
+        if tree is None:
+            return None
+        for statement in tree.body:
+            if isinstance(statement, ast.ClassDef) and statement.name == name:
+                return ClassInfo(self, module, statement)
+        # Re-exported from another module
+        for statement in tree.body:
+            if isinstance(statement, ast.ImportFrom) and statement.level == 0:
+                for alias in statement.names:
+                    if (alias.asname or alias.name) == name and statement.module:
+                        return self.load(statement.module, alias.name)
+        return None
+
+    def load_path(self, path: str) -> ClassInfo | None:
+        """Load a "module.path:ClassName" string, the format used in the config."""
+        if ":" not in path:
+            return None
+        module, name = path.rsplit(":", 1)
+        return self.load(module, name)
+
+    def resolve_name(self, module: str, name: str) -> ClassInfo | None:
+        """Resolve a (possibly dotted) name used in `module` to the class it refers to."""
+        tree = self.parse(module)
+        if tree is None:
+            return None
+        head, _, rest = name.partition(".")
+        for statement in tree.body:
+            if isinstance(statement, ast.ClassDef) and statement.name == name:
+                return ClassInfo(self, module, statement)
+            if isinstance(statement, ast.ImportFrom) and statement.level == 0:
+                for alias in statement.names:
+                    if (alias.asname or alias.name) == head and statement.module:
+                        if rest:
+                            # `from package import module` then module.Class
+                            return self.resolve_name(f"{statement.module}.{alias.name}", rest)
+                        return self.load(statement.module, alias.name)
+            if isinstance(statement, ast.Import) and rest:
+                for alias in statement.names:
+                    if (alias.asname or alias.name) == head:
+                        target, _, class_name = f"{alias.name}.{rest}".rpartition(".")
+                        return self.load(target, class_name)
+                    if alias.asname is None and name.startswith(alias.name + "."):
+                        target, _, class_name = name.rpartition(".")
+                        return self.load(target, class_name)
+        return None
+
+
+def _dotted_name(node: ast.expr | None) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return None if parent is None else f"{parent}.{node.attr}"
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # String annotations, "Foo"
+        return node.value
+    return None
+
+
+def _same(a: "ClassInfo | str", b: "ClassInfo | str") -> bool:
+    if isinstance(a, ClassInfo) and isinstance(b, ClassInfo):
+        return (a.module, a.name) == (b.module, b.name)
+    return a == b
+
+
+def _is_classvar(annotation: ast.expr) -> bool:
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    name = _dotted_name(annotation)
+    return name is not None and name.rsplit(".", 1)[-1] == "ClassVar"
+
+
+def _field_has_default(value: ast.expr | None) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, ast.Constant) and value.value is Ellipsis:
+        return False
+    if isinstance(value, ast.Call) and _dotted_name(value.func) in ("Field", "pydantic.Field"):
+        has_default = any(kw.arg in ("default", "default_factory") for kw in value.keywords)
+        positional = value.args and not (
+            isinstance(value.args[0], ast.Constant) and value.args[0].value is Ellipsis
+        )
+        return bool(has_default or positional)
+    return True
+
+
+def _union_members(annotation: ast.expr) -> list[ast.expr]:
+    if isinstance(annotation, ast.BinOp) and isinstance(annotation.op, ast.BitOr):
+        return _union_members(annotation.left) + _union_members(annotation.right)
+    if isinstance(annotation, ast.Subscript):
+        origin = _dotted_name(annotation.value)
+        if origin is not None and origin.rsplit(".", 1)[-1] in ("Union", "Optional"):
+            members = annotation.slice
+            members_list = members.elts if isinstance(members, ast.Tuple) else [members]
+            if origin.endswith("Optional"):
+                members_list = [*members_list, ast.Constant(value=None)]
+            return [m for member in members_list for m in _union_members(member)]
+    return [annotation]
+
+
+def _allows_none(annotation: ast.expr | None) -> bool:
+    if annotation is None:
+        return False
+    return any(
+        isinstance(member, ast.Constant) and member.value is None
+        for member in _union_members(annotation)
+    )
+
+
+def _value_matches(annotation: ast.expr | None, value: Any) -> bool | None:
+    """Whether a config value fits the annotation the way pydantic's lax mode would accept it.
+
+    None means the annotation isn't something we can check statically.
+    """
+    if annotation is None:
+        return None
+    results = []
+    for member in _union_members(annotation):
+        if isinstance(member, ast.Constant) and member.value is None:
+            results.append(value is None)
+            continue
+        if isinstance(member, ast.Subscript):
+            member = member.value  # list[int] -> list, only the container is checked
+        name = _dotted_name(member)
+        if name is None:
+            return None
+        name = name.rsplit(".", 1)[-1]
+        if name == "Any":
+            return True
+        if name not in _SCALARS:
+            return None  # models, enums, custom types
+        results.append(_scalar_matches(name, value))
+    return any(results)
+
+
+def _scalar_matches(name: str, value: Any) -> bool:
+    if name == "bool":
+        if isinstance(value, str):
+            return value.lower() in _BOOL_STRINGS
+        return isinstance(value, bool) or value in (0, 1)
+    if name in ("int", "float") and isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return False
+        return name == "float" or number.is_integer()
+    if name == "int" and isinstance(value, float):
+        return value.is_integer()
+    if name == "str":
+        return isinstance(value, str)
+    return isinstance(value, _SCALARS[name])
+
+
+def _object_matches(annotation: ast.expr | None, type_names: set[str] | None) -> bool | None:
+    """Whether an injected object fits the annotation, mirrors ResolveByNameAndType."""
+    if annotation is None or type_names is None:
+        return None
+    for member in _union_members(annotation):
+        if isinstance(member, ast.Subscript):
+            member = member.value
+        name = _dotted_name(member)
+        if name is None:
+            return None
+        if name.rsplit(".", 1)[-1] in type_names | {"Any", "object"}:
+            return True
+    return False
+
+
+class _Provided:
+    """Something in the simulated object bag, a constructed object (known by its class names)
+    or a plain config value."""
+
+    def __init__(self, type_names: set[str] | None = None, value: Any = None, is_value=False):
+        self.type_names = type_names
+        self.value = value
+        self.is_value = is_value
+
+
+class DryRunValidator:
+    """Validates a loaded config without importing or constructing anything."""
+
+    def __init__(self, config: dict, search_path: list[str] | None = None) -> None:
+        self.config = config if config is not None else {}
+        self.loader = SourceLoader(search_path)
+        self.issues: list[ValidationIssue] = []
+
+    def _issue(self, location: str, kind: str, message: str) -> None:
+        self.issues.append(ValidationIssue(location, kind, message))
+
+    def _load(self, location: str, path: Any) -> ClassInfo | None:
+        if not isinstance(path, str) or ":" not in path:
+            self._issue(location, "unresolvable", f"Expected 'module.path:ClassName', got {path!r}")
+            return None
+        module = path.rsplit(":", 1)[0]
+        if self.loader.find_source(module) is None:
+            self._issue(location, "unresolvable", f"No source found for module {module}")
+            return None
+        info = self.loader.load_path(path)
+        if info is None:
+            self._issue(location, "unresolvable", f"Class not found: {path}")
+        return info
+
+    def _check_arguments(
+        self,
+        location: str,
+        info: ClassInfo,
+        bag: dict[str, _Provided],
+        values: dict[str, Any],
+    ) -> None:
+        """Resolve init params and CONFIG fields like resolve_object_kwargs does, values from
+        the component's own config entry win over objects in the bag."""
+        params = [param for param in info.init_params() if not param.variadic]
+        model = info.config_model()
+        if model is not None:
+            params += model.fields()
+
+        for param in params:
+            annotation_name = _dotted_name(param.annotation)
+            if annotation_name and annotation_name.rsplit(".", 1)[-1] == RESOLVER_CLASS:
+                continue  # the resolver always injects itself
+            if param.name in values:
+                provided = _Provided(value=values[param.name], is_value=True)
+            elif param.name in bag:
+                provided = bag[param.name]
+            else:
+                if not param.optional:
+                    self._issue(
+                        f"{location}.{param.name}",
+                        "missing",
+                        f"No value for required argument {param.name} of {info.name}",
+                    )
+                continue
+
+            if provided.is_value:
+                matches = _value_matches(param.annotation, provided.value)
+            else:
+                matches = _object_matches(param.annotation, provided.type_names)
+            if matches is False:
+                found = (
+                    repr(provided.value)
+                    if provided.is_value
+                    else "/".join(sorted(provided.type_names or ()))
+                )
+                self._issue(
+                    f"{location}.{param.name}",
+                    "type",
+                    f"Expected {ast.unparse(param.annotation)} for {info.name}, got {found}",
+                )
+
+        known = {param.name for param in params}
+        for key in values:
+            if key not in known:
+                self._issue(f"{location}.{key}", "unknown", f"{info.name} has no argument or config field {key}")
+
+    def _check_component(
+        self, location: str, name: str, entry: dict, bag: dict[str, _Provided]
+    ) -> None:
+        if not entry.get("enabled", True):
+            return
+        info = self._load(f"{location}.module", entry.get("module"))
+        if info is None:
+            return
+        values = {k: v for k, v in entry.items() if k not in COMPONENT_RESERVED_KEYS}
+        self._check_arguments(location, info, bag, values)
+        bag[name] = _Provided(type_names=info.type_names())
+
+    def _check_section(
+        self, section: str, content: Any, bag: dict[str, _Provided]
+    ) -> bool:
+        """Validate component entries found under a section, returns whether there were any."""
+        if not isinstance(content, dict):
+            return False
+        found = False
+        for key, value in content.items():
+            location = f"{section}.{key}"
+            if isinstance(value, dict) and "module" in value:
+                self._check_component(location, key, value, bag)
+                found = True
+            elif isinstance(value, dict):
+                found = self._check_section(location, value, bag) or found
+        return found
+
+    def validate(self) -> list[ValidationIssue]:
+        self.issues = []
+        bag: dict[str, _Provided] = {"_resolver": _Provided(type_names={RESOLVER_CLASS})}
+        # section name -> CONFIG model of the manager reading it (None, it holds components)
+        sections: dict[str, ClassInfo | None] = {}
+        application_loader = SourceLoader([_APPLICATION_ROOT])
+        for section, path in APPLICATION_SECTIONS.items():
+            sections[section] = application_loader.load_path(path)
+
+        managers = self.config.get(MANAGERS_SECTION) or {}
+        if not isinstance(managers, dict):
+            self._issue(MANAGERS_SECTION, "type", "Managers must be a mapping of name: module:Class")
+            managers = {}
+
+        for name, path in managers.items():
+            location = f"{MANAGERS_SECTION}.{name}"
+            info = self._load(location, path)
+            if info is None:
+                continue
+            self._check_arguments(location, info, bag, {})
+            bag[name] = _Provided(type_names=info.type_names())
+
+            model = info.config_model()
+            section = (model.prefix() if model is not None else None) or info.prefix()
+            if section is not None:
+                sections[section] = model
+
+        # Managers build their components after every manager exists
+        for section, content in self.config.items():
+            if section == MANAGERS_SECTION:
+                continue
+            if sections.get(section) is not None:
+                if isinstance(content, dict):
+                    self._check_model_values(section, sections[section], content)
+                else:
+                    self._issue(section, "type", "Expected a mapping")
+            elif not self._check_section(section, content, bag) and section not in sections:
+                self._issue(section, "unknown", "No manager reads this section")
+        return self.issues
+
+    def _check_model_values(self, location: str, model: ClassInfo, values: dict) -> None:
+        fields = {field.name: field for field in model.fields()}
+        for name, field in fields.items():
+            if name not in values:
+                if not field.optional:
+                    self._issue(f"{location}.{name}", "missing", f"Required field of {model.name}")
+            elif _value_matches(field.annotation, values[name]) is False:
+                self._issue(
+                    f"{location}.{name}",
+                    "type",
+                    f"Expected {ast.unparse(field.annotation)} for {model.name}, got {values[name]!r}",
+                )
+        for key in values:
+            if key not in fields:
+                self._issue(f"{location}.{key}", "unknown", f"{model.name} has no field {key}")
+
+
+def dry_run(config_path: Path | str, search_path: list[str] | None = None) -> list[ValidationIssue]:
+    """Validate the config file at `config_path`, returns every issue found."""
+    import yaml
+
+    config = yaml.safe_load(Path(config_path).read_text())
+    return DryRunValidator(config, search_path).validate()
@@ -0,0 +1,378 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from pydantic import BaseModel
+from typing import Any, Callable, Hashable
+import hashlib
+import multiprocessing
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+
+_MISSING: Any = object()
+
+
+class CacheConfig(BaseModel):
+    max_entries: int | None = 10_000
+    max_bytes: int | None = None  # approximate, see estimate_size
+    ttl: float | None = None  # seconds, None never expires
+    # Shared memory backend, for caches shared between pre-forked worker processes
+    shared: bool = False
+    slots: int = 1024
+    slot_size: int = 4096  # bytes per entry, larger (pickled) entries aren't cached
+
+
+class CacheManagerConfig(Config):
+    PREFIX = "Cache"
+
+    default: CacheConfig = CacheConfig()
+    caches: dict[str, CacheConfig] = {}
+
+
+def estimate_size(value: Any) -> int:
+    """Cheap size estimate used for max_bytes, exact for buffers, shallow for everything else."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return memoryview(value).nbytes
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """A load in progress, concurrent misses on the same key wait on it instead of loading again."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class BaseCache(ABC):
+    """Stats and single-flight loading shared by the cache backends."""
+
+    def __init__(self, name: str, config: CacheConfig) -> None:
+        self.name = name
+        self.config = config
+        self._lock = threading.RLock()
+        self._inflight: dict[Hashable, _Flight] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced_loads = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @abstractmethod
+    def _lookup(self, key: Hashable) -> Any:
+        ...
+
+    @abstractmethod
+    def _store(self, key: Hashable, value: Any, expires: float | None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def _expiry(self, ttl: float | None) -> float | None:
+        ttl = self.config.ttl if ttl is None else ttl
+        return None if ttl is None else time.time() + ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        self._store(key, value, self._expiry(ttl))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def get_or_load(
+        self, key: Hashable, loader: Callable[[], Any], ttl: float | None = None
+    ) -> Any:
+        """Return the cached value, or call `loader()` and cache the result.
+
+        Concurrent misses on the same key share one `loader()` call, the others wait for it.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced_loads += 1
+        assert flight is not None
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            with self._lock:
+                self.loads += 1
+            self.set(key, flight.value, ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "loads": self.loads,
+                "coalesced_loads": self.coalesced_loads,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class Cache(BaseCache):
+    """In-process LRU cache with TTL, bounded by entry count and/or approximate bytes."""
+
+    def __init__(
+        self,
+        name: str,
+        config: CacheConfig,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        super().__init__(name, config)
+        self._sizeof = sizeof
+        # key -> (value, size, expires), ordered least -> most recently used
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float | None]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, _, expires = entry
+            if expires is not None and expires <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: Hashable, value: Any, expires: float | None) -> None:
+        size = self._sizeof(value) if self.config.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.config.max_bytes is not None and size > self.config.max_bytes:
+                return  # would evict everything and still not fit
+            self._entries[key] = (value, size, expires)
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, key: Hashable) -> None:
+        # Caller holds self._lock
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        # Caller holds self._lock
+        max_entries, max_bytes = self.config.max_entries, self.config.max_bytes
+        while self._entries and (
+            (max_entries is not None and len(self._entries) > max_entries)
+            or (max_bytes is not None and self._bytes > max_bytes)
+        ):
+            key, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(entries=len(self._entries), bytes=self._bytes)
+        return stats
+
+
+class SharedMemoryCache(BaseCache):
+    """Cache backed by a shared memory segment, shared by processes forked after it's created.
+
+    The segment is a fixed table of `slots` entries of `slot_size` bytes.  A key maps to one slot by
+    a stable hash, a new key landing on an occupied slot evicts the old entry (direct mapped, so
+    there's no cross-process LRU bookkeeping).  Keys and values are pickled, entries that don't fit
+    in a slot aren't cached.  Hit/miss stats are per process.
+    """
+
+    _HEADER = struct.Struct("<dI")  # expires (0 = never), payload length (0 = empty slot)
+
+    def __init__(self, name: str, config: CacheConfig) -> None:
+        super().__init__(name, config)
+        self._slot_size = config.slot_size
+        self._capacity = config.slot_size - self._HEADER.size
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=config.slots * config.slot_size
+        )
+        # Inherited by forked workers, guards every slot access across processes
+        self._process_lock = multiprocessing.Lock()
+        self._owner_pid = os.getpid()
+        self.rejected = 0
+
+    def _slot(self, key: Hashable) -> int:
+        digest = hashlib.blake2b(pickle.dumps(key), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.config.slots * self._slot_size
+
+    def _read(self, offset: int) -> tuple[float, Hashable, Any] | None:
+        # Caller holds self._process_lock
+        expires, length = self._HEADER.unpack_from(self._memory.buf, offset)
+        if length == 0:
+            return None
+        start = offset + self._HEADER.size
+        stored_key, value = pickle.loads(self._memory.buf[start : start + length])
+        return expires, stored_key, value
+
+    def _clear_slot(self, offset: int) -> None:
+        self._HEADER.pack_into(self._memory.buf, offset, 0.0, 0)
+
+    def _lookup(self, key: Hashable) -> Any:
+        offset = self._slot(key)
+        with self._process_lock:
+            entry = self._read(offset)
+            if entry is None or entry[1] != key:
+                return _MISSING
+            expires, _, value = entry
+            if expires and expires <= time.time():
+                self._clear_slot(offset)
+                with self._lock:
+                    self.expirations += 1
+                return _MISSING
+        return value
+
+    def _store(self, key: Hashable, value: Any, expires: float | None) -> None:
+        payload = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        offset = self._slot(key)
+        if len(payload) > self._capacity:
+            with self._lock:
+                self.rejected += 1
+            return
+        with self._process_lock:
+            existing = self._read(offset)
+            if existing is not None and existing[1] != key:
+                with self._lock:
+                    self.evictions += 1
+            self._HEADER.pack_into(self._memory.buf, offset, expires or 0.0, len(payload))
+            start = offset + self._HEADER.size
+            self._memory.buf[start : start + len(payload)] = payload
+
+    def delete(self, key: Hashable) -> None:
+        offset = self._slot(key)
+        with self._process_lock:
+            entry = self._read(offset)
+            if entry is not None and entry[1] == key:
+                self._clear_slot(offset)
+
+    def clear(self) -> None:
+        with self._process_lock:
+            for offset in range(0, self.config.slots * self._slot_size, self._slot_size):
+                self._clear_slot(offset)
+
+    def close(self) -> None:
+        """Detach from the segment, the process that created it also frees it."""
+        self._memory.close()
+        if os.getpid() == self._owner_pid:
+            self._memory.unlink()
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(rejected=self.rejected)
+        return stats
+
+
+class CacheManager(ApplicationComponent):
+    """Named, bounded caches shared by components, instead of each keeping its own dict.
+
+    Components get the manager injected and ask for a cache by name, caches listed in the config
+    use their settings, others use `default`.  Shared memory caches in the config are created
+    when the manager is built, so worker processes forked after `configure` all see the same
+    segment.
+
+    Config (under the `Cache` key):
+        default: settings for caches that aren't listed
+        caches: per cache settings (max_entries, max_bytes, ttl, shared, slots, slot_size)
+    """
+
+    CONFIG = CacheManagerConfig
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = CacheManagerConfig.from_config(getattr(self, "_global_config", None))
+        self._caches: dict[str, BaseCache] = {}
+        self._lock = threading.Lock()
+        for name, config in self.params.caches.items():
+            if config.shared:
+                self.cache(name)
+
+    def cache(self, name: str, **overrides: Any) -> BaseCache:
+        """Get (or create) the named cache, `overrides` only apply when it's created."""
+        with self._lock:
+            if name not in self._caches:
+                config = self.params.caches.get(name, self.params.default)
+                if overrides:
+                    config = config.model_copy(update=overrides)
+                self._caches[name] = (
+                    SharedMemoryCache(name, config) if config.shared else Cache(name, config)
+                )
+            return self._caches[name]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Hit/miss/eviction stats for every cache, keyed by cache name."""
+        with self._lock:
+            caches = list(self._caches.values())
+        return {cache.name: cache.stats() for cache in caches}
+
+    def stop(self) -> None:
+        with self._lock:
+            caches = list(self._caches.values())
+            self._caches.clear()
+        for cache in caches:
+            if isinstance(cache, SharedMemoryCache):
+                cache.close()
+            else:
+                cache.clear()
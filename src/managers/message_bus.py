@@ -0,0 +1,441 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Generic, TypeVar
+import asyncio
+import inspect
+import logging
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Marks an argument that wasn't passed, so None can still mean "wait forever"
+_UNSET: Any = object()
+
+# Batches a sync subscriber handles per pool job before yielding the worker to other subscribers
+_BATCHES_PER_DRAIN = 16
+
+
+class BackpressurePolicy(Enum):
+    """What a publisher does when a subscriber's queue is full."""
+
+    BLOCK = "block"  # wait (up to block_timeout) for the subscriber to make room
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued message
+    DROP_NEWEST = "drop_newest"  # drop the message being published
+
+
+class MessageBusConfig(Config):
+    PREFIX = "MessageBus"
+
+    workers: int = 4
+    max_queue: int = 1000
+    batch_size: int = 1
+    policy: BackpressurePolicy = BackpressurePolicy.DROP_NEWEST
+    block_timeout: float | None = 1.0
+
+
+class Topic(Generic[T]):
+    """A named, typed channel.  Payloads published to it must be instances of `payload_type`."""
+
+    def __init__(self, name: str, payload_type: type[T] | tuple[type, ...] = object):
+        self.name = name
+        self.payload_type = payload_type
+
+    def __repr__(self) -> str:
+        return f"Topic(name={self.name}, payload_type={self.payload_type})"
+
+
+def _zero_copy(payload: Any) -> Any:
+    """Hand out a read-only view for mutable buffers so subscribers share memory but can't
+    modify each other's data.  bytes and other objects are passed through as is."""
+    if isinstance(payload, bytearray):
+        return memoryview(payload).toreadonly()
+    if isinstance(payload, memoryview) and not payload.readonly:
+        return payload.toreadonly()
+    return payload
+
+
+class Subscription(Generic[T]):
+    """A subscriber's bounded queue on a topic.
+
+    Messages are either pulled with `get_batch`, or pushed to a handler by the bus.  Sync handlers
+    run on the bus's shared worker pool (one batch at a time per subscription, so order is kept),
+    coroutine handlers run as a task on their loop.  Handlers always receive a list of up to
+    `batch_size` messages.
+    """
+
+    def __init__(
+        self,
+        topic: Topic[T],
+        max_queue: int,
+        batch_size: int,
+        policy: BackpressurePolicy,
+        block_timeout: float | None = None,
+        handler: Callable[[list[T]], Any] | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+        self.topic = topic
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.handler = handler
+        self.loop = loop
+        self.is_async = handler is not None and inspect.iscoroutinefunction(handler)
+
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.closed = False
+
+        self._queue: deque[T] = deque()
+        self._condition = threading.Condition()
+        self._async_wakeup: asyncio.Event | None = None
+        self._async_task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._draining = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _on_own_loop(self) -> bool:
+        if not self.is_async or self.loop is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _offer(self, message: T, block: bool = True) -> bool | None:
+        """Queue a message according to the backpressure policy.
+
+        Returns False if it was dropped, or None if the queue is full under BLOCK and `block`
+        is False (the caller is expected to wait for room some other way).
+        """
+        with self._condition:
+            if self.closed:
+                return False
+            if len(self._queue) >= self.max_queue:
+                if self.policy is BackpressurePolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy is BackpressurePolicy.DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    if not block:
+                        return None
+                    if self._on_own_loop():
+                        # Waiting here would stop the loop from ever draining the queue
+                        raise RuntimeError(
+                            f"Blocking publish to {self.topic.name} from its subscriber's event loop, "
+                            "use MessageBusManager.publish_async"
+                        )
+                    deadline = (
+                        None
+                        if self.block_timeout is None
+                        else time.monotonic() + self.block_timeout
+                    )
+                    while len(self._queue) >= self.max_queue and not self.closed:
+                        remaining = (
+                            None if deadline is None else deadline - time.monotonic()
+                        )
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._condition.wait(remaining)
+                    if self.closed:
+                        return False
+            self._queue.append(message)
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._condition.notify_all()
+            schedule_drain = self._executor is not None and not self._draining
+            if schedule_drain:
+                self._draining = True
+                self._idle.clear()
+        if schedule_drain:
+            self._submit_drain()
+        if self._async_wakeup is not None and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._async_wakeup.set)
+        return True
+
+    def _take(self) -> list[T]:
+        # Caller holds self._condition
+        batch = [
+            self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))
+        ]
+        self.delivered += len(batch)
+        # Wake up publishers blocked on a full queue
+        self._condition.notify_all()
+        return batch
+
+    def get_batch(self, timeout: float | None = None) -> list[T]:
+        """Pull up to `batch_size` messages, waits up to `timeout` for the first one.
+        Returns an empty list on timeout or once the subscription is closed and drained."""
+        with self._condition:
+            if not self._queue and not self.closed:
+                self._condition.wait_for(
+                    lambda: self._queue or self.closed, timeout=timeout
+                )
+            return self._take()
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        if self._async_wakeup is not None and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._async_wakeup.set)
+
+    # Push delivery
+    def _start(self, executor: ThreadPoolExecutor) -> None:
+        if self.handler is None:
+            return
+        if not self.is_async:
+            with self._condition:
+                if self._executor is not None:
+                    return
+                self._executor = executor
+                schedule_drain = bool(self._queue) and not self._draining
+                if schedule_drain:
+                    self._draining = True
+                    self._idle.clear()
+            if schedule_drain:
+                self._submit_drain()
+            return
+
+        loop = self.loop
+        if loop is None:
+            raise RuntimeError(f"Async subscriber on {self.topic.name} needs an event loop")
+        if self._async_task is not None:
+            return
+
+        def create_task() -> None:
+            self._async_wakeup = asyncio.Event()
+            self._async_task = loop.create_task(self._deliver_async())
+
+        if loop.is_running():
+            loop.call_soon_threadsafe(create_task)
+        else:
+            create_task()
+
+    def _handle(self, batch: list[T]) -> Any:
+        try:
+            return self.handler(batch)  # type: ignore[misc]
+        except Exception:
+            logger.exception(f"Subscriber on topic {self.topic.name} failed")
+
+    def _submit_drain(self) -> None:
+        assert self._executor is not None
+        try:
+            self._executor.submit(self._drain)
+        except RuntimeError:
+            # Pool is shutting down, finish delivery on this thread
+            self._drain()
+
+    def _drain(self) -> None:
+        for _ in range(_BATCHES_PER_DRAIN):
+            with self._condition:
+                batch = self._take()
+                if not batch:
+                    self._draining = False
+                    self._idle.set()
+                    return
+            self._handle(batch)
+        # More work left, requeue so other subscribers get a turn on the pool
+        self._submit_drain()
+
+    async def _deliver_async(self) -> None:
+        assert self._async_wakeup is not None
+        while True:
+            with self._condition:
+                batch = self._take() if self._queue else []
+                done = not batch and self.closed
+                if not batch and not done:
+                    self._async_wakeup.clear()
+            if done:
+                return
+            if batch:
+                try:
+                    await self._handle(batch)
+                except Exception:
+                    logger.exception(f"Subscriber on topic {self.topic.name} failed")
+            else:
+                await self._async_wakeup.wait()
+
+    def _join(self, timeout: float | None = None) -> bool:
+        """Wait for queued messages to be handed to a sync handler."""
+        return self._idle.wait(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "policy": self.policy.value,
+        }
+
+
+class MessageBusManager(ApplicationComponent):
+    """In-process pub/sub between components, replaces holding direct references to each other.
+
+    Every subscriber gets its own bounded queue, so a slow subscriber only backs up its own queue
+    (or drops, depending on the policy) instead of stalling the publisher's other consumers.
+    Payloads are never copied or serialized, mutable buffers are handed out as read-only
+    memoryviews over the same memory.
+
+    Code running on an asyncio loop should use `publish_async`, which waits for room in BLOCK
+    queues without blocking the loop.
+
+    Config (under the `MessageBus` key), defaults for subscriptions that don't override them:
+        workers: size of the pool that runs sync handlers
+        max_queue: queue bound per subscriber
+        batch_size: max messages handed to a subscriber at once
+        policy: block / drop_oldest / drop_newest when a queue is full
+        block_timeout: how long a blocked publisher waits before dropping, None waits forever
+    """
+
+    CONFIG = MessageBusConfig
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = MessageBusConfig.from_config(getattr(self, "_global_config", None))
+        self._topics: dict[str, Topic] = {}
+        self._subscriptions: dict[str, list[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def topic(
+        self, name: str, payload_type: type[T] | tuple[type, ...] = object
+    ) -> Topic[T]:
+        """Get or declare a topic, redeclaring with a different payload type is an error."""
+        with self._lock:
+            if name in self._topics:
+                topic = self._topics[name]
+                if payload_type is not object and topic.payload_type != payload_type:
+                    raise TypeError(
+                        f"Topic {name} already declared with payload type {topic.payload_type}"
+                    )
+                return topic
+            topic = Topic(name, payload_type)
+            self._topics[name] = topic
+            self._subscriptions[name] = []
+            return topic
+
+    def subscribe(
+        self,
+        topic: Topic[T] | str,
+        handler: Callable[[list[T]], Any] | None = None,
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+        policy: BackpressurePolicy | None = None,
+        block_timeout: float | None = _UNSET,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Subscription[T]:
+        """Subscribe to a topic.
+
+        Without a handler the subscriber pulls with `Subscription.get_batch`.  A sync handler is
+        called from the bus's worker pool, a coroutine handler is run on `loop` (defaults to the
+        running loop).  Push delivery begins once the bus is started.  Options left out fall back
+        to the config, `block_timeout=None` waits forever.
+        """
+        if isinstance(topic, str):
+            topic = self.topic(topic)
+        if handler is not None and inspect.iscoroutinefunction(handler) and loop is None:
+            loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            topic,
+            max_queue=self.params.max_queue if max_queue is None else max_queue,
+            batch_size=self.params.batch_size if batch_size is None else batch_size,
+            policy=self.params.policy if policy is None else policy,
+            block_timeout=(
+                self.params.block_timeout if block_timeout is _UNSET else block_timeout
+            ),
+            handler=handler,
+            loop=loop,
+        )
+        with self._lock:
+            self._subscriptions[topic.name].append(subscription)
+            executor = self._executor
+        if executor is not None:
+            subscription._start(executor)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic.name, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+        subscription.close()
+
+    def _prepare(self, topic: Topic[T] | str, message: T) -> tuple[list[Subscription], T]:
+        if isinstance(topic, str):
+            topic = self.topic(topic)
+        if not isinstance(message, topic.payload_type):
+            raise TypeError(
+                f"Topic {topic.name} expects {topic.payload_type}, got {type(message)}"
+            )
+        with self._lock:
+            subscriptions = list(self._subscriptions[topic.name])
+        return subscriptions, _zero_copy(message)
+
+    def publish(self, topic: Topic[T] | str, message: T) -> int:
+        """Publish to every subscriber of the topic, returns how many subscribers accepted it."""
+        subscriptions, message = self._prepare(topic, message)
+        return sum(bool(subscription._offer(message)) for subscription in subscriptions)
+
+    async def publish_async(self, topic: Topic[T] | str, message: T) -> int:
+        """Like `publish`, but waits for room in full BLOCK queues off the event loop, so
+        subscribers on the same loop keep draining."""
+        subscriptions, message = self._prepare(topic, message)
+        accepted = 0
+        for subscription in subscriptions:
+            offered = subscription._offer(message, block=False)
+            if offered is None:
+                offered = await asyncio.to_thread(subscription._offer, message)
+            accepted += bool(offered)
+        return accepted
+
+    # Lifecycle
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.params.workers, thread_name_prefix="bus-worker"
+                )
+            executor = self._executor
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        for subscription in subscriptions:
+            subscription._start(executor)
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        # Closing lets delivery drain what's queued, then the pool is shut down
+        for subscription in subscriptions:
+            subscription.close()
+        for subscription in subscriptions:
+            subscription._join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # Metrics
+    def stats(self) -> dict[str, list[dict[str, Any]]]:
+        """Queue depth and delivered/dropped counters for every subscriber, keyed by topic name."""
+        with self._lock:
+            return {
+                name: [subscription.stats() for subscription in subscriptions]
+                for name, subscriptions in self._subscriptions.items()
+            }
@@ -0,0 +1,286 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessPoolConfig(Config):
+    PREFIX = "ProcessPool"
+
+    workers: int | None = None  # None uses os.cpu_count()
+    # fork/spawn/forkserver, None uses the platform default.  forkserver avoids forking a process
+    # that already runs threads (scheduler, message bus, ...)
+    start_method: str | None = None
+    max_tasks_per_child: int | None = None
+    preload: list[str] = []  # modules imported in every worker before it takes work
+    prewarm: bool = True  # start every worker in pre_run instead of on first use
+    shared_memory_threshold: int = 1 << 20  # buffer args this large (bytes) skip pickling
+
+
+class SharedArg:
+    """A buffer argument copied into a shared memory segment, only its name and layout are pickled.
+
+    The worker gets a memoryview over the segment with the original format and shape (a numpy
+    array for numpy arrays), valid for the duration of the call.
+    """
+
+    def __init__(self, view: memoryview, is_numpy: bool) -> None:
+        self.nbytes = view.nbytes
+        self.format = view.format
+        self.shape = view.shape
+        self.is_numpy = is_numpy
+        self.memory = shared_memory.SharedMemory(create=True, size=max(self.nbytes, 1))
+        self.memory.buf[: self.nbytes] = view.cast("B")
+        self.name = self.memory.name
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["memory"]
+        return state
+
+    def attach(self) -> tuple[shared_memory.SharedMemory, Any]:
+        try:
+            memory = shared_memory.SharedMemory(name=self.name, track=False)
+        except TypeError:
+            # track was added in 3.13, before that the parent's resource tracker is shared anyway
+            memory = shared_memory.SharedMemory(name=self.name)
+        view = memory.buf[: self.nbytes]
+        if self.format != "B" or len(self.shape) != 1:
+            view = view.cast(self.format, self.shape)
+        if self.is_numpy:
+            import numpy
+
+            return memory, numpy.asarray(view)
+        return memory, view
+
+    def release(self) -> None:
+        """Free the segment, called by the parent once the call is done."""
+        self.memory.close()
+        self.memory.unlink()
+
+
+def _shareable(value: Any, threshold: int) -> memoryview | None:
+    if not isinstance(value, (bytes, bytearray, memoryview)) and not _is_numpy(value):
+        return None
+    view = memoryview(value)
+    if view.nbytes < threshold or not view.c_contiguous:
+        return None
+    try:
+        if view.format != "B" or view.ndim != 1:
+            view.cast("B").cast(view.format, view.shape)  # layouts the worker can't rebuild
+    except (TypeError, ValueError):
+        return None
+    return view
+
+
+def _is_numpy(value: Any) -> bool:
+    return type(value).__module__ == "numpy" and hasattr(value, "__array_interface__")
+
+
+def _preload(modules: list[str]) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _call(func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> tuple[Any, float]:
+    """Runs in the worker, attaches shared args and times the call."""
+    memories: list[shared_memory.SharedMemory] = []
+    views: list[Any] = []
+
+    def resolve(value: Any) -> Any:
+        if isinstance(value, SharedArg):
+            memory, view = value.attach()
+            memories.append(memory)
+            views.append(view)
+            return view
+        return value
+
+    try:
+        args = tuple(resolve(arg) for arg in args)
+        kwargs = {key: resolve(value) for key, value in kwargs.items()}
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - start
+    finally:
+        del args, kwargs
+        for view in views:
+            if isinstance(view, memoryview):
+                try:
+                    view.release()
+                except BufferError:
+                    pass
+        views.clear()
+        for memory in memories:
+            try:
+                memory.close()
+            except BufferError:
+                pass  # func kept a reference, the mapping goes when the worker frees it
+
+
+class ProcessPoolManager(ApplicationComponent):
+    """Shared process pool for CPU-bound work that would otherwise hold the GIL.
+
+    Components get the manager injected and offload module-level (picklable) functions with
+    `submit` or `run_async`.  Buffer arguments (bytes, bytearray, memoryview, numpy arrays) of at
+    least `shared_memory_threshold` bytes go through shared memory instead of being pickled, the
+    function receives a memoryview (or numpy array) over it.  The pool starts in `pre_run`, after
+    configure has imported every component, and shuts down in `stop`.
+
+    Config (under the `ProcessPool` key):
+        workers: number of worker processes
+        start_method: fork / spawn / forkserver
+        max_tasks_per_child: recycle workers after this many tasks
+        preload: modules imported in every worker up front
+        prewarm: start every worker in pre_run
+        shared_memory_threshold: size (bytes) from which buffer args go through shared memory
+    """
+
+    CONFIG = ProcessPoolConfig
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = ProcessPoolConfig.from_config(getattr(self, "_global_config", None))
+        self.workers = self.params.workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        # Metrics, latency is submit -> result, queue wait is latency minus run time
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.shared_bytes = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_run_time = 0.0
+        self.max_queue_wait = 0.0
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.params.start_method)
+                if self.params.preload and context.get_start_method() == "forkserver":
+                    context.set_forkserver_preload(self.params.preload)
+                kwargs: dict[str, Any] = {}
+                if self.params.max_tasks_per_child is not None:
+                    kwargs["max_tasks_per_child"] = self.params.max_tasks_per_child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_preload,
+                    initargs=(self.params.preload,),
+                    **kwargs,
+                )
+            return self._executor
+
+    def _share(self, value: Any, shared: list[SharedArg]) -> Any:
+        view = _shareable(value, self.params.shared_memory_threshold)
+        if view is None:
+            return value
+        arg = SharedArg(view, _is_numpy(value))
+        shared.append(arg)
+        return arg
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Run `func(*args, **kwargs)` in a worker process, returns a Future for the result."""
+        executor = self._ensure_executor()
+        shared: list[SharedArg] = []
+        try:
+            args = tuple(self._share(arg, shared) for arg in args)
+            kwargs = {key: self._share(value, shared) for key, value in kwargs.items()}
+            submitted = time.perf_counter()
+            inner = executor.submit(_call, func, args, kwargs)
+        except BaseException:
+            for arg in shared:
+                arg.release()
+            raise
+
+        with self._lock:
+            self.submitted += 1
+            self.shared_bytes += sum(arg.nbytes for arg in shared)
+
+        result: Future = Future()
+        result.add_done_callback(lambda result: result.cancelled() and inner.cancel())
+
+        def done(inner: Future) -> None:
+            for arg in shared:
+                arg.release()
+            latency = time.perf_counter() - submitted
+            error = None if inner.cancelled() else inner.exception()
+            if inner.cancelled() or error is not None:
+                with self._lock:
+                    self.failed += 1
+                if inner.cancelled():
+                    result.cancel()
+                    result.set_running_or_notify_cancel()
+                else:
+                    result.set_exception(error)
+                return
+            value, run_time = inner.result()
+            with self._lock:
+                self.completed += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+                self.total_run_time += run_time
+                self.max_queue_wait = max(self.max_queue_wait, latency - run_time)
+            result.set_result(value)
+
+        inner.add_done_callback(done)
+        return result
+
+    async def run_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Await `func(*args, **kwargs)` run in a worker process."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    # Lifecycle
+    def pre_run(self) -> None:
+        """Start the pool now that everything is imported, so the first real task doesn't pay for
+        starting workers."""
+        executor = self._ensure_executor()
+        if self.params.prewarm:
+            # Every submit without an idle worker starts one, so this brings up the whole pool
+            for future in [executor.submit(_warm) for _ in range(self.workers)]:
+                future.result()
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # Metrics
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "pending": self.submitted - self.completed - self.failed,
+                "shared_bytes": self.shared_bytes,
+                "mean_latency": self.total_latency / self.completed if self.completed else 0.0,
+                "max_latency": self.max_latency,
+                "mean_run_time": (
+                    self.total_run_time / self.completed if self.completed else 0.0
+                ),
+                "mean_queue_wait": (
+                    (self.total_latency - self.total_run_time) / self.completed
+                    if self.completed
+                    else 0.0
+                ),
+                "max_queue_wait": self.max_queue_wait,
+            }
@@ -0,0 +1,349 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+
+logger = logging.getLogger(__name__)
+
+
+class OverrunPolicy(Enum):
+    """What to do when a periodic task is due while its previous run is still going."""
+
+    SKIP = "skip"  # drop this run, try again at the next interval
+    QUEUE = "queue"  # run as soon as the previous run finishes
+    CONCURRENT = "concurrent"  # start another run alongside the previous one
+
+
+class SchedulerConfig(Config):
+    PREFIX = "Scheduler"
+
+    workers: int = 4
+    default_jitter: float = 0.0
+
+
+class TaskStats:
+    """Counters and lag (actual - scheduled start, in seconds) for a single task."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def record_lag(self, lag: float) -> None:
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "mean_lag": self.total_lag / self.runs if self.runs else 0.0,
+        }
+
+
+class ScheduledTask:
+    """Handle for a task registered with the SchedulerManager."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict[str, Any],
+        delay: float,
+        interval: float | None,
+        jitter: float,
+        coalesce: bool,
+        overrun: OverrunPolicy,
+        on_cancel: Callable[["ScheduledTask"], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.delay = delay
+        self.interval = interval
+        self.jitter = jitter
+        self.coalesce = coalesce
+        self.overrun = overrun
+        self.stats = TaskStats()
+
+        self.cancelled = False
+        self._running = 0
+        self._queued = 0
+        self._next_run: float | None = None  # scheduled (pre-jitter) due time
+        self._on_cancel = on_cancel
+        self._lock = threading.Lock()  # guards stats and the running/queued counts
+
+    @property
+    def periodic(self) -> bool:
+        return self.interval is not None
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self._on_cancel is not None:
+            self._on_cancel(self)
+
+    def __repr__(self) -> str:
+        return f"ScheduledTask(name={self.name}, interval={self.interval}, overrun={self.overrun.value})"
+
+
+class SchedulerManager(ApplicationComponent):
+    """Shared scheduler for periodic and delayed work, replaces per-component `sleep` loop threads.
+
+    A single timer thread keeps due times in a heap and hands due tasks to a small worker pool.
+    Components get the manager injected by the resolver and register tasks with `call_later` or
+    `call_every`.  Tasks registered before `start()` are held until the application starts, and
+    everything is cancelled on `stop()`.
+
+    Config (under the `Scheduler` key):
+        workers: size of the worker pool
+        default_jitter: jitter (seconds) used when a task doesn't specify one
+    """
+
+    CONFIG = SchedulerConfig
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = SchedulerConfig.from_config(getattr(self, "_global_config", None))
+
+        self._tasks: dict[int, ScheduledTask] = {}
+        self._heap: list[tuple[float, int, ScheduledTask]] = []
+        self._counter = itertools.count()  # tie breaker, tasks aren't orderable
+        self._condition = threading.Condition()
+        self._timer_thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._running = False
+
+    # Registration
+    def call_later(
+        self,
+        delay: float,
+        func: Callable[..., Any],
+        *args: Any,
+        name: str | None = None,
+        jitter: float | None = None,
+        **kwargs: Any,
+    ) -> ScheduledTask:
+        """Run `func(*args, **kwargs)` once, `delay` seconds from now (or from start)."""
+        task = ScheduledTask(
+            name=name or getattr(func, "__qualname__", repr(func)),
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            delay=delay,
+            interval=None,
+            jitter=self.params.default_jitter if jitter is None else jitter,
+            coalesce=True,
+            overrun=OverrunPolicy.CONCURRENT,
+        )
+        return self._register(task, explicit_name=name is not None)
+
+    def call_every(
+        self,
+        interval: float,
+        func: Callable[..., Any],
+        *args: Any,
+        name: str | None = None,
+        initial_delay: float | None = None,
+        jitter: float | None = None,
+        coalesce: bool = True,
+        overrun: OverrunPolicy = OverrunPolicy.SKIP,
+        **kwargs: Any,
+    ) -> ScheduledTask:
+        """Run `func(*args, **kwargs)` every `interval` seconds.
+
+        Args:
+            interval: seconds between scheduled runs, runs stay aligned to the original schedule
+            initial_delay: delay before the first run, defaults to `interval`
+            jitter: random delay in [0, jitter) added to each run, spreads out tasks sharing an interval
+            coalesce: if the scheduler fell behind by several intervals, run once instead of catching up
+            overrun: what to do when a run is due while the previous one is still going
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        task = ScheduledTask(
+            name=name or getattr(func, "__qualname__", repr(func)),
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            delay=interval if initial_delay is None else initial_delay,
+            interval=interval,
+            jitter=self.params.default_jitter if jitter is None else jitter,
+            coalesce=coalesce,
+            overrun=overrun,
+        )
+        return self._register(task, explicit_name=name is not None)
+
+    def _register(self, task: ScheduledTask, explicit_name: bool) -> ScheduledTask:
+        task._on_cancel = self._forget
+        with self._condition:
+            # Metrics are keyed by name, so names are unique among the live tasks.  Default names
+            # (the function's __qualname__) repeat for lambdas and for the same method on several
+            # instances, those get the task's id appended
+            if any(other.name == task.name for other in self._tasks.values()):
+                if explicit_name:
+                    raise ValueError(f"A task named {task.name} is already scheduled")
+                task.name = f"{task.name}#{id(task):x}"
+            self._tasks[id(task)] = task
+            if self._running:
+                self._push(task, time.monotonic() + task.delay)
+        return task
+
+    def _forget(self, task: ScheduledTask) -> None:
+        # Drop cancelled tasks right away, their heap entry is skipped when it comes due
+        with self._condition:
+            self._tasks.pop(id(task), None)
+
+    def _push(self, task: ScheduledTask, due: float) -> None:
+        # Caller holds self._condition
+        task._next_run = due
+        fire_at = due + (random.uniform(0, task.jitter) if task.jitter > 0 else 0.0)
+        heapq.heappush(self._heap, (fire_at, next(self._counter), task))
+        self._condition.notify()
+
+    # Lifecycle
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.params.workers, thread_name_prefix="scheduler-worker"
+            )
+            now = time.monotonic()
+            for task in self._tasks.values():
+                if not task.cancelled:
+                    self._push(task, now + task.delay)
+        self._timer_thread = threading.Thread(
+            target=self._timer_loop, name="scheduler-timer", daemon=True
+        )
+        self._timer_thread.start()
+
+    def pre_stop(self) -> None:
+        # Stop handing out new work, anything in flight finishes in stop()
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._condition.notify()
+
+    def stop(self) -> None:
+        self.pre_stop()
+        if self._timer_thread is not None:
+            self._timer_thread.join()
+            self._timer_thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        with self._condition:
+            tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+
+    # Timer/worker internals
+    def _timer_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and (
+                    not self._heap or self._heap[0][0] > time.monotonic()
+                ):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                fire_at, _, task = heapq.heappop(self._heap)
+                if task.cancelled:
+                    continue
+                self._dispatch(task, fire_at)
+                if task.periodic:
+                    self._push(task, self._next_due(task, time.monotonic()))
+                else:
+                    # One shot tasks are done once handed off, don't hold on to them
+                    self._tasks.pop(id(task), None)
+
+    def _next_due(self, task: ScheduledTask, now: float) -> float:
+        due = (task._next_run or now) + task.interval
+        if due > now:
+            return due
+        missed = int((now - due) // task.interval) + 1
+        if due + missed * task.interval <= now:
+            missed += 1  # float rounding landed exactly on now
+        if task.coalesce:
+            # Fell behind, skip straight to the next slot in the future
+            with task._lock:
+                task.stats.coalesced += missed
+            return due + missed * task.interval
+        # Catch up, one run per missed interval
+        return due
+
+    def _dispatch(self, task: ScheduledTask, scheduled: float) -> None:
+        with task._lock:
+            if task._running and task.periodic:
+                task.stats.overruns += 1
+                if task.overrun is OverrunPolicy.SKIP:
+                    task.stats.skipped += 1
+                    return
+                if task.overrun is OverrunPolicy.QUEUE:
+                    # At most one run waits behind the current one, the rest are skipped
+                    if task._queued:
+                        task.stats.skipped += 1
+                    else:
+                        task._queued = 1
+                    return
+            task._running += 1
+        assert self._executor is not None
+        self._executor.submit(self._run_task, task, scheduled)
+
+    def _run_task(self, task: ScheduledTask, scheduled: float) -> None:
+        while True:
+            with task._lock:
+                task.stats.runs += 1
+                task.stats.record_lag(max(0.0, time.monotonic() - scheduled))
+            try:
+                task.func(*task.args, **task.kwargs)
+            except Exception:
+                with task._lock:
+                    task.stats.failures += 1
+                logger.exception(f"Scheduled task {task.name} failed")
+            with task._lock:
+                if task._queued and not task.cancelled and self._running:
+                    # OverrunPolicy.QUEUE, the queued runs go right after this one
+                    task._queued -= 1
+                    scheduled = time.monotonic()
+                    continue
+                task._running -= 1
+                return
+
+    # Metrics
+    def metrics(self) -> dict[str, dict[str, float | int]]:
+        """Per task run/overrun counters and lag stats, keyed by task name."""
+        with self._condition:
+            tasks = list(self._tasks.values())
+        metrics = {}
+        for task in tasks:
+            with task._lock:
+                metrics[task.name] = task.stats.as_dict()
+        return metrics
+
+    @property
+    def max_lag(self) -> float:
+        return max((stats["max_lag"] for stats in self.metrics().values()), default=0.0)
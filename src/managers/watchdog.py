@@ -0,0 +1,255 @@
+from collections import deque
+from types import FrameType
+from typing import Any
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from src.base_config import Config
+from src.components.application_component import ApplicationComponent
+from src.dependency_resolver import DependencyResolver
+from src.metrics import Histogram
+from src.profiler import owner_code_map, owner_of
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class WatchdogConfig(Config):
+    PREFIX = "Watchdog"
+
+    interval: float = 0.1  # seconds between probes
+    threshold: float = 0.1  # lag (seconds) that counts as a stall
+    stack_depth: int = 30  # frames kept in stall reports
+    max_reports: int = 100  # most recent stall reports kept
+
+
+class StallReport:
+    """A stall: where (loop or the interpreter), how long, and the offending thread's stack."""
+
+    def __init__(
+        self, source: str, lag: float, thread_name: str, owner: str | None, stack: list[str]
+    ) -> None:
+        self.source = source
+        self.lag = lag
+        self.thread_name = thread_name
+        self.owner = owner
+        self.stack = stack
+        self.detected_at = time.time()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "lag": self.lag,
+            "thread": self.thread_name,
+            "owner": self.owner,
+            "stack": self.stack,
+            "detected_at": self.detected_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"StallReport(source={self.source}, lag={self.lag:.3f}, owner={self.owner})"
+
+
+class _LoopProbe:
+    """Heartbeats posted to one event loop from the watchdog thread."""
+
+    def __init__(
+        self, name: str, loop: asyncio.AbstractEventLoop, thread_id: int | None
+    ) -> None:
+        self.name = name
+        self.loop = loop
+        self.lag = Histogram(LAG_BUCKETS)
+        self.thread_id = thread_id  # otherwise learnt from the first heartbeat
+        self.posted_at: float | None = None  # heartbeat waiting to run
+        self.report: StallReport | None = None  # stall reported for the waiting heartbeat
+
+
+class WatchdogManager(ApplicationComponent):
+    """Detects stalls, blocking work holding up an event loop or the whole interpreter.
+
+    A watchdog thread wakes up every `interval` and checks two things:
+
+    - Event loops: it posts a heartbeat with `call_soon_threadsafe` and measures how long the loop
+      takes to run it.  A heartbeat still waiting after `threshold` means the loop is blocked right
+      now, so the loop thread's current stack is captured while it's still in the blocking call.
+    - The interpreter: its own wakeup lag (scheduled vs. actual).  Lag there means some thread held
+      the GIL (e.g. a long C call), which stalls every thread, including supervised ones.  The
+      thread that used the most CPU since the last probe is reported.
+
+    Stacks are attributed to the component whose method is innermost on the stack.  Loops of
+    managers the Supervisor runs in loop mode are watched automatically, others can be added with
+    `watch_loop`.  Lag histograms are part of `stats()`, and so of the application's metrics.
+
+    Config (under the `Watchdog` key):
+        interval: seconds between probes
+        threshold: lag that counts as a stall
+        stack_depth: frames kept per stall report
+        max_reports: stall reports kept
+    """
+
+    CONFIG = WatchdogConfig
+
+    def __init__(self, resolver: DependencyResolver, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = WatchdogConfig.from_config(getattr(self, "_global_config", None))
+        self.resolver = resolver
+        self.interpreter_lag = Histogram(LAG_BUCKETS)
+        self.reports: deque[StallReport] = deque(maxlen=self.params.max_reports)
+        self.stalls = 0
+        self._probes: dict[str, _LoopProbe] = {}
+        self._owners: dict = {}
+        self._cpu_times: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # Registration
+    def watch_loop(
+        self, name: str, loop: asyncio.AbstractEventLoop, thread_id: int | None = None
+    ) -> None:
+        """Watch `loop`, running on the thread `thread_id` (found out from the first heartbeat
+        when not given, stalls before that aren't captured)."""
+        with self._lock:
+            probe = self._probes.get(name)
+            if probe is None or probe.loop is not loop:
+                self._probes[name] = _LoopProbe(name, loop, thread_id)
+
+    def watch_running_loop(self, name: str) -> None:
+        """Watch the event loop this is called from."""
+        self.watch_loop(name, asyncio.get_running_loop(), threading.get_ident())
+
+    def unwatch_loop(self, name: str) -> None:
+        with self._lock:
+            self._probes.pop(name, None)
+
+    def _discover_loops(self) -> None:
+        supervisor = self.resolver.get_object("_supervisor")
+        if supervisor is None:
+            return
+        for name, supervised in supervisor.managers.items():
+            loop = supervised._loop
+            if loop is not None and loop.is_running():
+                self.watch_loop(name, loop, supervised._thread.ident)
+
+    # Probing
+    def _capture(self, source: str, thread_id: int, lag: float) -> StallReport:
+        frame: FrameType | None = sys._current_frames().get(thread_id)
+        thread = next((t for t in threading.enumerate() if t.ident == thread_id), None)
+        report = StallReport(
+            source,
+            lag,
+            thread.name if thread is not None else str(thread_id),
+            owner_of(frame, self._owners),
+            traceback.format_stack(frame, self.params.stack_depth) if frame is not None else [],
+        )
+        with self._lock:
+            self.stalls += 1
+            self.reports.append(report)
+        logger.warning(
+            f"Stall in {source}: {lag:.3f}s, thread {report.thread_name}, owner {report.owner}\n"
+            + "".join(report.stack)
+        )
+        return report
+
+    def _heartbeat(self, probe: _LoopProbe, posted_at: float) -> None:
+        # Runs on the watched loop
+        lag = time.monotonic() - posted_at
+        with self._lock:
+            probe.thread_id = threading.get_ident()
+            probe.lag.observe(lag)
+            probe.posted_at = None
+            if probe.report is not None:
+                probe.report.lag = lag  # the full length of the stall
+                probe.report = None
+
+    def _probe_loops(self, now: float) -> None:
+        with self._lock:
+            probes = list(self._probes.values())
+        for probe in probes:
+            with self._lock:
+                posted_at, reported, thread_id = probe.posted_at, probe.report, probe.thread_id
+                if posted_at is None:
+                    probe.posted_at = now
+            if probe.loop.is_closed():
+                self.unwatch_loop(probe.name)
+                continue
+            if posted_at is None:
+                try:
+                    probe.loop.call_soon_threadsafe(self._heartbeat, probe, now)
+                except RuntimeError:
+                    self.unwatch_loop(probe.name)  # closed in the meantime
+                continue
+            waited = now - posted_at
+            if waited > self.params.threshold and reported is None and thread_id is not None:
+                report = self._capture(f"loop {probe.name}", thread_id, waited)
+                with self._lock:
+                    if probe.posted_at == posted_at:  # still the same stall
+                        probe.report = report
+
+    def _busiest_thread(self) -> int | None:
+        busiest, most = None, 0.0
+        me = threading.get_ident()
+        for thread_id in sys._current_frames():
+            if thread_id == me:
+                continue
+            try:
+                cpu_time = time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+            except (AttributeError, OSError):
+                continue
+            used = cpu_time - self._cpu_times.get(thread_id, cpu_time)
+            self._cpu_times[thread_id] = cpu_time
+            if used > most:
+                busiest, most = thread_id, used
+        return busiest
+
+    def _run(self) -> None:
+        interval = self.params.interval
+        due = time.monotonic() + interval
+        self._busiest_thread()  # CPU time baseline
+        while not self._stopped.wait(max(due - time.monotonic(), 0)):
+            now = time.monotonic()
+            lag = now - due
+            with self._lock:
+                self.interpreter_lag.observe(lag)
+            busiest = self._busiest_thread()
+            if lag > self.params.threshold and busiest is not None:
+                self._capture("interpreter", busiest, lag)
+            self._discover_loops()
+            self._probe_loops(now)
+            due = now + interval
+
+    # Lifecycle
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._owners = owner_code_map(
+            {
+                name: obj
+                for name, obj in self.resolver._live_objects().items()
+                if isinstance(obj, ApplicationComponent) and obj is not self
+            }
+        )
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Metrics
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stalls": self.stalls,
+                "interpreter_lag": self.interpreter_lag.as_dict(),
+                "loop_lag": {name: probe.lag.as_dict() for name, probe in self._probes.items()},
+                "recent_stalls": [report.as_dict() for report in list(self.reports)[-10:]],
+            }
@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from typing import Iterator
+import tracemalloc
+
+
+class MemoryRecord:
+    """Memory attributed to one manager/component, from tracemalloc snapshots around its construction.
+
+    size/count are inclusive (everything allocated while it was being built and still alive after),
+    exclusive_size leaves out what was attributed to objects it built itself (e.g. a manager's
+    components).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.size = 0
+        self.count = 0
+        self.children_size = 0
+        self.top_lines: list[str] = []
+
+    @property
+    def exclusive_size(self) -> int:
+        return self.size - self.children_size
+
+    def __repr__(self) -> str:
+        return f"MemoryRecord(name={self.name}, size={self.size}, exclusive_size={self.exclusive_size})"
+
+
+class MemoryAccountant:
+    """Attributes allocations to the managers/components the resolver constructs.
+
+    Starts tracemalloc if it isn't already tracing, which slows down allocations, so it's meant
+    for diagnosing memory use rather than for always-on production use.
+    """
+
+    def __init__(self, frames: int = 1, top_lines: int = 3) -> None:
+        self.frames = frames
+        self.top_lines = top_lines
+        self.records: dict[str, MemoryRecord] = {}
+        self._stack: list[MemoryRecord] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[MemoryRecord]:
+        """Attribute what's allocated (and still alive) inside the block to `name`."""
+        self.start()
+        record = self.records.setdefault(name, MemoryRecord(name))
+        self._stack.append(record)
+        before = self._snapshot()
+        try:
+            yield record
+        finally:
+            after = self._snapshot()
+            self._stack.pop()
+            stats = after.compare_to(before, "lineno")
+            size = sum(stat.size_diff for stat in stats)
+            record.size += size
+            record.count += sum(stat.count_diff for stat in stats)
+            record.top_lines = [
+                f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size_diff} B"
+                for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[
+                    : self.top_lines
+                ]
+                if stat.size_diff > 0
+            ]
+            if self._stack:
+                self._stack[-1].children_size += size
+
+    def top(self, n: int = 10) -> list[MemoryRecord]:
+        """The n biggest owners by exclusive size."""
+        return sorted(
+            self.records.values(), key=lambda record: record.exclusive_size, reverse=True
+        )[:n]
+
+    def format_report(self, n: int = 10) -> str:
+        current, peak = (
+            tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        )
+        lines = [f"Traced memory: current {current} B, peak {peak} B", ""]
+        lines.append(f"{'owner':<40} {'exclusive':>12} {'inclusive':>12} {'blocks':>8}")
+        for record in self.top(n):
+            lines.append(
+                f"{record.name:<40} {record.exclusive_size:>12} {record.size:>12} {record.count:>8}"
+            )
+            lines.extend(f"    {line}" for line in record.top_lines)
+        return "\n".join(lines)
@@ -0,0 +1,236 @@
+"""On-demand sampling profiler, attributes CPU samples to the manager/component that owns them.
+
+Nothing runs until a profile is requested (signal or `profile` CLI command), then a sampling thread
+walks every thread's stack at `interval` for `duration` seconds.  With `cpu_only` (the default,
+where the platform has per-thread CPU clocks) threads that used no CPU since the last sample, e.g.
+ones waiting on a lock or a socket, are left out.  A sample belongs to the innermost frame running
+a method of a component's class.  Output is in collapsed-stack format, one
+`owner;frame;...;frame count` line per distinct stack, which flamegraph.pl and speedscope read.
+"""
+
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+import inspect
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+from src.base_config import Config
+from src.components.application_component import (
+    ApplicationComponent,
+    ConfigurableApplicationComponent,
+)
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED = "[other]"
+
+
+class ProfilerConfig(Config):
+    PREFIX = "Profiler"
+
+    signal: str | None = "SIGUSR2"  # None only allows profiling from code
+    interval: float = 0.01  # seconds between samples
+    cpu_only: bool = True  # only sample threads that used CPU since the last sample
+    duration: float = 30.0  # seconds per profile
+    output_dir: str = "."
+    max_depth: int = 128  # frames kept per sample, from the leaf
+
+
+def frame_label(code: CodeType, module: str) -> str:
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def owner_code_map(components: dict[str, Any]) -> dict[CodeType, str]:
+    """Code objects of every method defined by the components' classes, mapped to the component.
+
+    Methods of the shared base classes aren't owned by anyone, a class used by several components
+    is attributed to the class name.
+    """
+    owners: dict[CodeType, str] = {}
+    for name, component in components.items():
+        for cls in type(component).__mro__:
+            if cls in (ApplicationComponent, ConfigurableApplicationComponent, object):
+                continue
+            for attribute in vars(cls).values():
+                if isinstance(attribute, (staticmethod, classmethod)):
+                    attribute = attribute.__func__
+                elif isinstance(attribute, property):
+                    attribute = attribute.fget
+                code = getattr(inspect.unwrap(attribute), "__code__", None) if attribute else None
+                if code is None:
+                    continue
+                if code in owners and owners[code] != name:
+                    owners[code] = cls.__qualname__
+                else:
+                    owners[code] = name
+    return owners
+
+
+def owner_of(frame: FrameType | None, owners: dict[CodeType, str]) -> str | None:
+    """The owner of the innermost frame in the stack that runs a component method."""
+    while frame is not None:
+        owner = owners.get(frame.f_code)
+        if owner is not None:
+            return owner
+        frame = frame.f_back
+    return None
+
+
+class SamplingProfiler:
+    """Samples every thread's stack from a background thread, see the module docstring."""
+
+    def __init__(
+        self,
+        components: dict[str, Any],
+        interval: float = 0.01,
+        max_depth: int = 128,
+        cpu_only: bool = True,
+    ) -> None:
+        self.owners = owner_code_map(components)
+        self.interval = interval
+        self.max_depth = max_depth
+        self.cpu_only = cpu_only and hasattr(time, "pthread_getcpuclockid")
+        self._cpu_times: dict[int, float] = {}
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _busy(self, thread_id: int) -> bool:
+        """Whether the thread's CPU clock moved since the last sample, unknown on the first."""
+        try:
+            cpu_time = time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+        except OSError:
+            return False  # the thread just ended
+        last = self._cpu_times.get(thread_id)
+        self._cpu_times[thread_id] = cpu_time
+        return last is not None and cpu_time > last
+
+    def _sample(self, ignore: int) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == ignore or (self.cpu_only and not self._busy(thread_id)):
+                continue
+            stack: list[str] = []
+            owner = None
+            current: FrameType | None = frame
+            while current is not None:
+                code = current.f_code
+                if owner is None:
+                    owner = self.owners.get(code)
+                if len(stack) < self.max_depth:
+                    stack.append(frame_label(code, current.f_globals.get("__name__", "?")))
+                current = current.f_back
+            stack.append(f"[{owner or UNATTRIBUTED}]")
+            stack.reverse()
+            self.samples[tuple(stack)] += 1
+        self.sample_count += 1
+
+    def run(self, duration: float) -> None:
+        """Sample in the calling thread for `duration` seconds (or until `stop()`)."""
+        me = threading.get_ident()
+        start = time.monotonic()
+        deadline = start + duration
+        next_sample = start
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            self._sample(me)
+            next_sample = max(next_sample + self.interval, now)
+            self._stop.wait(max(next_sample - time.monotonic(), 0))
+        self.elapsed = time.monotonic() - start
+
+    def start(self, duration: float, output: Path | str | None = None) -> threading.Thread:
+        """Sample in a background thread, writing the collapsed stacks to `output` when done."""
+
+        def target() -> None:
+            self.run(duration)
+            if output is not None:
+                self.write(output)
+                logger.info(
+                    f"Wrote {self.sample_count} samples over {self.elapsed:.1f}s to {output}"
+                )
+
+        self._thread = threading.Thread(target=target, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def by_owner(self) -> dict[str, int]:
+        """Samples per owner (component name, class name or "[other]"), most first."""
+        totals: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            totals[stack[0][1:-1]] += count
+        return dict(totals.most_common())
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+    def write(self, path: Path | str) -> None:
+        Path(path).write_text(self.collapsed())
+
+
+class ProfilerTrigger:
+    """Starts a SamplingProfiler when the configured signal arrives, one profile at a time.
+
+    Installing the handler is all that happens up front, so there's no cost until it fires.
+    """
+
+    def __init__(self, config: ProfilerConfig, components: Any) -> None:
+        self.config = config
+        self._components = components  # callable returning {name: component}
+        self.profiler: SamplingProfiler | None = None
+        self.last_output: Path | None = None
+        self._lock = threading.Lock()
+
+    def install(self) -> bool:
+        if self.config.signal is None:
+            return False
+        try:
+            signal.signal(getattr(signal, self.config.signal), self._handle)
+        except (AttributeError, ValueError) as e:
+            # Unknown signal on this platform, or not called from the main thread
+            logger.warning(f"Not installing the profiler signal handler: {e}")
+            return False
+        return True
+
+    def _handle(self, signum: int, frame: FrameType | None) -> None:
+        self.trigger()
+
+    def trigger(self, duration: float | None = None) -> SamplingProfiler | None:
+        """Start a profile unless one is running, returns the new profiler."""
+        # Non-blocking, the signal handler may interrupt the main thread inside trigger()
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self.profiler is not None and self.profiler._thread is not None:
+                if self.profiler._thread.is_alive():
+                    return None
+            self.profiler = SamplingProfiler(
+                self._components(),
+                self.config.interval,
+                self.config.max_depth,
+                self.config.cpu_only,
+            )
+            self.last_output = (
+                Path(self.config.output_dir) / f"profile-{os.getpid()}-{time.time_ns()}.folded"
+            )
+            self.profiler.start(
+                self.config.duration if duration is None else duration, self.last_output
+            )
+            return self.profiler
+        finally:
+            self._lock.release()
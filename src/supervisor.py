@@ -0,0 +1,298 @@
+"""Runs managers' `start()` inline, on their own thread or on their own event loop, and restarts
+them when they fail.
+
+    Supervisor:
+      default: {mode: inline}
+      managers:
+        server: {mode: thread, restart: on_failure, max_restarts: 5, backoff: 0.5}
+        feed: {mode: loop}
+
+inline (the default) calls `start()` on the application's thread, in order, like before.  thread
+runs `start()` on a dedicated thread, meant for managers whose `start()` blocks until they're
+stopped.  loop runs a dedicated asyncio event loop, `start()` may be a coroutine function and the
+manager's other lifecycle hooks are handed off to run on that loop.
+"""
+
+from enum import Enum
+from pydantic import BaseModel
+from typing import Any, Callable
+import asyncio
+import inspect
+import logging
+import threading
+import time
+
+from src.base_config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionMode(Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    LOOP = "loop"
+
+
+class RestartPolicy(Enum):
+    NEVER = "never"
+    ON_FAILURE = "on_failure"  # restart when start() raises
+    ALWAYS = "always"  # also restart when start() returns, for start() that runs until stopped
+
+
+class ManagerState(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    RESTARTING = "restarting"  # waiting out the backoff
+    COMPLETED = "completed"  # start() returned and isn't restarted
+    FAILED = "failed"  # start() raised and isn't restarted (anymore)
+    STOPPED = "stopped"
+
+
+class SupervisionConfig(BaseModel):
+    mode: ExecutionMode = ExecutionMode.INLINE
+    restart: RestartPolicy = RestartPolicy.ON_FAILURE
+    max_restarts: int | None = 5  # None restarts forever
+    backoff: float = 0.5  # seconds before the first restart, doubled for each one after
+    max_backoff: float = 30.0
+    stop_timeout: float = 10.0  # how long lifecycle handoffs and joins wait
+
+
+class SupervisorConfig(Config):
+    PREFIX = "Supervisor"
+
+    default: SupervisionConfig = SupervisionConfig()
+    managers: dict[str, SupervisionConfig] = {}
+
+
+class SupervisedManager:
+    """One manager's execution context, restart bookkeeping and liveness."""
+
+    def __init__(self, name: str, manager: Any, config: SupervisionConfig) -> None:
+        self.name = name
+        self.manager = manager
+        self.config = config
+        self.state = ManagerState.PENDING
+        self.restarts = 0
+        self.last_error: BaseException | None = None
+        self.started_at: float | None = None
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        if self.state is not ManagerState.RUNNING:
+            return False
+        return self._thread is None or self._thread.is_alive()
+
+    def _should_restart(self, error: BaseException | None) -> bool:
+        if self._stopping.is_set() or self.config.restart is RestartPolicy.NEVER:
+            return False
+        if error is None and self.config.restart is not RestartPolicy.ALWAYS:
+            return False
+        return self.config.max_restarts is None or self.restarts < self.config.max_restarts
+
+    def _backoff(self) -> float:
+        return min(self.config.backoff * 2**self.restarts, self.config.max_backoff)
+
+    def _finished(self, error: BaseException | None) -> float | None:
+        """Record how start() ended, returns the delay before restarting or None to give up."""
+        if error is not None:
+            self.last_error = error
+            logger.error(f"Manager {self.name} failed", exc_info=error)
+        if self._stopping.is_set():
+            self.state = ManagerState.STOPPED
+            return None
+        if not self._should_restart(error):
+            self.state = ManagerState.FAILED if error is not None else ManagerState.COMPLETED
+            return None
+        self.state = ManagerState.RESTARTING
+        return self._backoff()
+
+    def _started(self) -> None:
+        self.state = ManagerState.RUNNING
+        self.started_at = time.monotonic()
+
+    # Inline
+    def _run_inline(self) -> None:
+        self._started()
+        try:
+            self.manager.start()
+        except Exception as e:
+            self.last_error = e
+            self.state = ManagerState.FAILED
+            raise
+        self.state = ManagerState.COMPLETED
+
+    # Thread
+    def _run_thread(self) -> None:
+        while True:
+            self._started()
+            try:
+                self.manager.start()
+                error = None
+            except Exception as e:
+                error = e
+            delay = self._finished(error)
+            if delay is None:
+                return
+            if self._stopping.wait(delay):
+                self.state = ManagerState.STOPPED
+                return
+            self.restarts += 1
+            logger.warning(f"Restarting manager {self.name} ({self.restarts})")
+
+    # Event loop
+    def _run_loop(self) -> None:
+        loop = self._loop
+        assert loop is not None
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._launch)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    def _launch(self) -> None:
+        # Runs on the manager's loop
+        if self._stopping.is_set():
+            return
+        self._started()
+        try:
+            result = self.manager.start()
+        except Exception as e:
+            self._schedule_restart(e)
+            return
+        if inspect.isawaitable(result):
+            self._task = asyncio.ensure_future(result)
+            self._task.add_done_callback(self._task_done)
+        else:
+            self._schedule_restart(None)  # a plain start() already returned
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            error = None
+        else:
+            error = task.exception()
+        self._schedule_restart(error)
+
+    def _schedule_restart(self, error: BaseException | None) -> None:
+        delay = self._finished(error)
+        if delay is not None:
+            assert self._loop is not None
+
+            def relaunch() -> None:
+                self.restarts += 1
+                logger.warning(f"Restarting manager {self.name} ({self.restarts})")
+                self._launch()
+
+            self._loop.call_later(delay, relaunch)
+
+    # Control, called from the application's thread
+    def start(self) -> None:
+        self._stopping.clear()
+        if self.config.mode is ExecutionMode.INLINE:
+            self._run_inline()
+            return
+        if self.config.mode is ExecutionMode.LOOP:
+            self._loop = asyncio.new_event_loop()
+            target: Callable[[], None] = self._run_loop
+        else:
+            target = self._run_thread
+        self._thread = threading.Thread(target=target, name=f"manager-{self.name}", daemon=True)
+        self._thread.start()
+
+    def call(self, hook: str) -> None:
+        """Run a lifecycle hook (pre_stop, stop, ...) in the manager's execution context: handed
+        off to its loop in loop mode, on the calling thread otherwise.  Coroutine hooks are
+        awaited on the loop."""
+        func = getattr(self.manager, hook)
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            result = func()
+            if inspect.isawaitable(result):
+                asyncio.run(result)
+            return
+
+        async def invoke() -> None:
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+
+        future = asyncio.run_coroutine_threadsafe(invoke(), loop)
+        try:
+            future.result(self.config.stop_timeout)
+        except TimeoutError:
+            future.cancel()
+            logger.warning(f"Manager {self.name} didn't finish {hook} in {self.config.stop_timeout}s")
+
+    def request_stop(self) -> None:
+        """Stop restarting, called before the stop hooks so the start() they end isn't restarted."""
+        self._stopping.set()
+
+    def join(self) -> None:
+        """Wait for the manager's thread/loop to finish after its stop hooks ran."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass  # closed in the meantime
+        if self._thread is not None:
+            self._thread.join(self.config.stop_timeout)
+            if self._thread.is_alive():
+                logger.warning(f"Manager {self.name} is still running after stop")
+                return
+        if self.state in (ManagerState.RUNNING, ManagerState.RESTARTING, ManagerState.PENDING):
+            self.state = ManagerState.STOPPED
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "mode": self.config.mode.value,
+            "state": self.state.value,
+            "alive": self.alive,
+            "restarts": self.restarts,
+            "last_error": None if self.last_error is None else repr(self.last_error),
+            "uptime": (
+                time.monotonic() - self.started_at
+                if self.started_at is not None and self.state is ManagerState.RUNNING
+                else 0.0
+            ),
+        }
+
+
+class Supervisor:
+    """Starts the application's managers in their configured execution mode and relays lifecycle
+    hooks to them, see the module docstring."""
+
+    def __init__(self, config: SupervisorConfig, managers: dict[str, Any]) -> None:
+        self.config = config
+        self.managers = {
+            name: SupervisedManager(name, manager, config.managers.get(name, config.default))
+            for name, manager in managers.items()
+        }
+
+    def start(self) -> None:
+        for supervised in self.managers.values():
+            supervised.start()
+
+    def pre_stop(self) -> None:
+        for supervised in reversed(self.managers.values()):
+            supervised.request_stop()
+        for supervised in reversed(self.managers.values()):
+            supervised.call("pre_stop")
+
+    def stop(self) -> None:
+        for supervised in reversed(self.managers.values()):
+            supervised.request_stop()
+            supervised.call("stop")
+            supervised.join()
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Liveness and restart counts per manager."""
+        return {name: supervised.status() for name, supervised in self.managers.items()}
@@ -1,33 +1,43 @@
-# Import pytest
 from __future__ import annotations
 
+import signal
+import time
+from typing import Callable
 
-# Define a global variable to track the order of execution
-execution_order = []
+import pytest
 
+import src.base_config as base_config
+from src.dependency_resolver import DependencyResolver
 
-# Hook to modify the test collection
-def pytest_collection_modifyitems(config, items):
-    """This was an implied requirement (initially done by abusing the alphabetical order of the test files)
-    to run the integration tests first. This was needed due to *something* not being cleaned up properly
-    in the unit tests that caused the integration tests to fail.
-    Making this more explicit with pytest hooks.  We also may want to use this interface to speed up p2 tests.
-    """
-    formatted_items = "\n".join([f"{item.name} - {item.fspath}" for item in items])
-    print(formatted_items)
 
+def wait_for(predicate: Callable[[], bool], timeout: float = 3.0) -> bool:
+    """Poll `predicate` until it's true or `timeout` runs out, for tests of background threads."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
 
-# Hook to execute before running each test
-def pytest_runtest_setup(item):
-    pass
 
+@pytest.fixture
+def root_resolver() -> DependencyResolver:
+    return DependencyResolver()
 
-# Hook to execute each test
-def pytest_runtest_call(item):
-    execution_order.append(item.name)
 
+@pytest.fixture
+def scoped_resolver(root_resolver: DependencyResolver) -> DependencyResolver:
+    """A child container of the test's root, whatever a test registers in it stays out of the
+    other tests."""
+    return root_resolver.child()
 
-# Hook to execute after all tests have been run
-def pytest_sessionfinish(session, exitstatus):
-    formatted_execution_order = "\n".join(execution_order)
-    print(f"\nTest Execution Order: {formatted_execution_order}")
+
+@pytest.fixture(autouse=True)
+def isolated_process_state():
+    """Applications keep their objects in their own container, but configure also installs a
+    little process-wide state: the validated config cache and the profiler's signal handler.
+    Putting it back after every test keeps tests independent of the order they run in."""
+    profiler_handler = signal.getsignal(signal.SIGUSR2)
+    yield
+    base_config.validation_cache = None
+    signal.signal(signal.SIGUSR2, profiler_handler)
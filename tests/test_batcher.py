@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.components.batcher import Batcher, Histogram
+from src.dependency_resolver import DependencyResolver, ResolveByNameAndType
+from typing import Any
+import asyncio
+import threading
+import time
+import pytest
+
+calls: list[list[int]] = []
+
+
+def square_all(keys: list[int]) -> list[int]:
+    calls.append(keys)
+    return [key * key for key in keys]
+
+
+class DictBatcher(Batcher):
+    def load_batch(self, keys: list[Any]) -> dict[Any, Any]:
+        return {key: str(key) for key in keys if key != "missing"}
+
+
+class SlowBatcher(Batcher):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def load_batch(self, keys: list[Any]) -> list[Any]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return keys
+
+
+class UserService:
+    def __init__(self, user_batcher: Batcher, **kwargs: Any):
+        self.user_batcher = user_batcher
+
+
+@pytest.fixture
+def batcher():
+    calls.clear()
+    batcher = Batcher(loader="tests.test_batcher:square_all", max_batch_size=10, max_delay=0.02)
+    yield batcher
+    batcher.stop()
+
+
+def test_calls_are_batched(batcher: Batcher):
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(batcher.load, range(20)))
+    assert results == [key * key for key in range(20)]
+    assert sorted(key for batch in calls for key in batch) == list(range(20))
+    assert all(len(batch) <= 10 for batch in calls)
+    assert len(calls) < 20
+
+    stats = batcher.stats()
+    assert stats["calls"] == 20
+    assert stats["batch_size"]["count"] == stats["batches"] == len(calls)
+    assert stats["wait_time"]["count"] == 20
+
+
+def test_duplicate_keys_are_loaded_once(batcher: Batcher):
+    assert batcher.load_many([3, 3, 4, 3]) == [9, 9, 16, 9]
+    assert calls == [[3, 4]]
+    assert batcher.stats()["deduplicated"] == 2
+
+
+def test_load_async(batcher: Batcher):
+    async def main():
+        return await asyncio.gather(*(batcher.load_async(key) for key in range(5)))
+
+    assert asyncio.run(main()) == [0, 1, 4, 9, 16]
+    assert len(calls) == 1
+
+
+def test_cancelling_one_caller_keeps_the_others(batcher: Batcher):
+    first, second = batcher.submit(2), batcher.submit(2)
+    assert first.cancel()
+    assert second.result(1) == 4
+
+
+def test_mapping_results_and_errors():
+    batcher = DictBatcher(max_delay=0.001)
+    assert batcher.load("a") == "a"
+    with pytest.raises(KeyError):
+        batcher.load("missing")
+    batcher.stop()
+
+    failing = Batcher(max_delay=0.001)
+    with pytest.raises(ValueError, match="needs a loader"):
+        failing.load(1)
+    assert failing.stats()["failed_batches"] == 1
+    failing.stop()
+
+
+def test_in_flight_limit():
+    batcher = SlowBatcher(max_batch_size=1, max_delay=0, max_in_flight=2)
+    assert batcher.load_many(range(6)) == list(range(6))
+    assert batcher.max_running == 2
+    batcher.stop()
+
+
+def test_stop_drains_waiting_calls():
+    batcher = Batcher(loader="tests.test_batcher:square_all", max_delay=10)
+    future = batcher.submit(5)
+    batcher.stop()
+    assert future.result(0) == 25
+    with pytest.raises(RuntimeError):
+        batcher.submit(6)
+
+
+def test_histogram():
+    histogram = Histogram([1, 10])
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 1
+    assert histogram.quantile(1.0) == 50
+    assert histogram.as_dict()["buckets"] == {"<=1": 2, "<=10": 1, ">10": 1}
+
+
+def test_batcher_is_injectable():
+    resolver = DependencyResolver()
+    kwargs = resolver.resolve_object_kwargs(
+        Batcher,
+        policy=ResolveByNameAndType,
+        additional_objects={"loader": "tests.test_batcher:square_all"},
+    )
+    batcher = Batcher(**kwargs)
+    resolver.add_object(batcher, "user_batcher")
+
+    service = UserService(
+        **resolver.resolve_object_kwargs(UserService, policy=ResolveByNameAndType)
+    )
+    assert service.user_batcher.load(7) == 49
+    batcher.stop()
@@ -0,0 +1,183 @@
+from src.application_container import CustomApplication
+from src.base_config import Config
+from src.checkpoint import CheckpointReader, DeferredSnapshot, write_checkpoint
+from src.components.application_component import ApplicationComponent
+from typing import Any
+import pytest
+import yaml
+
+
+class CounterConfig(Config):
+    PREFIX = "Counter"
+
+    step: int = 1
+
+
+class CounterManager(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.params = CounterConfig.from_config(getattr(self, "_global_config", None))
+        self.counts: dict[str, int] = {}
+        self.restored = False
+
+    def run(self) -> None:
+        self.counts["runs"] = self.counts.get("runs", 0) + self.params.step
+
+    def snapshot(self) -> Any:
+        return self.counts
+
+    def restore(self, state: Any) -> None:
+        self.counts = state
+        self.restored = True
+
+
+class BufferComponent(ApplicationComponent):
+    def __init__(self, data: bytes = b"") -> None:
+        self.data = data
+
+    def snapshot(self) -> Any:
+        return self.data
+
+    def restore(self, state: Any) -> None:
+        self.data = state
+
+
+class LazyTable(ApplicationComponent):
+    LAZY_RESTORE = True
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.table: dict[str, int] = {}
+        self.snapshot_handle: DeferredSnapshot | None = None
+
+    def lookup(self, key: str) -> int | None:
+        if self.snapshot_handle is not None:
+            self.table = self.snapshot_handle.get()
+            self.snapshot_handle = None
+        return self.table.get(key)
+
+    def snapshot(self) -> Any:
+        return self.table
+
+    def restore(self, state: Any) -> None:
+        self.snapshot_handle = state
+
+
+def make_app(tmp_path, step: int = 1) -> CustomApplication:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {"counter": "tests.test_checkpoint:CounterManager"},
+                "Counter": {"step": step},
+                "Checkpoint": {"path": str(tmp_path / "state.ckpt")},
+            },
+            sort_keys=False,
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path)
+    return app
+
+
+def run_once(app: CustomApplication) -> CounterManager:
+    counter = app._resolver._object_bag["counter"]
+    counter.run()
+    app.pre_stop()
+    app.stop()
+    return counter
+
+
+def test_restart_restores_state(tmp_path):
+    first = run_once(make_app(tmp_path))
+    assert not first.restored
+
+    app = make_app(tmp_path)
+    counter = app._resolver._object_bag["counter"]
+    assert counter.restored
+    assert counter.counts == {"runs": 1}
+    assert app._checkpoint.restored == ["counter"]
+
+    run_once(app)
+    assert make_app(tmp_path)._resolver._object_bag["counter"].counts == {"runs": 2}
+
+
+def test_config_change_makes_snapshot_stale(tmp_path):
+    run_once(make_app(tmp_path))
+
+    app = make_app(tmp_path, step=2)
+    counter = app._resolver._object_bag["counter"]
+    assert not counter.restored
+    assert counter.counts == {}
+    assert app._checkpoint.stale == ["counter"]
+
+
+def test_version_bump_ignores_snapshot(tmp_path, monkeypatch):
+    run_once(make_app(tmp_path))
+
+    monkeypatch.setattr(CounterManager, "CHECKPOINT_VERSION", 2)
+    assert not make_app(tmp_path)._resolver._object_bag["counter"].restored
+
+
+def test_no_checkpoint_path_is_a_no_op(tmp_path):
+    app = CustomApplication()
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump({"Managers": {"counter": "tests.test_checkpoint:CounterManager"}})
+    )
+    app.configure(config_path)
+    assert app.write_checkpoint() == 0
+    assert app.restore_checkpoint() == []
+
+
+def test_raw_payloads_are_memory_mapped(tmp_path):
+    path = tmp_path / "state.ckpt"
+    data = bytes(range(256)) * 16
+    components = {"skipped": ApplicationComponent(), "buffer": BufferComponent(data)}
+    assert write_checkpoint(path, components) == 1
+
+    restored = BufferComponent()
+    reader = CheckpointReader(path)
+    assert reader.restore({"buffer": restored, "skipped": ApplicationComponent()}) == ["buffer"]
+    assert isinstance(restored.data, memoryview)
+    assert restored.data == data
+    restored.data.release()
+    reader.close()
+
+
+def test_rejects_non_checkpoint_files(tmp_path):
+    path = tmp_path / "state.ckpt"
+    path.write_bytes(b"not a checkpoint at all, just some bytes")
+    with pytest.raises(ValueError):
+        CheckpointReader(path)
+
+
+def test_lazy_restore_reads_on_first_use(tmp_path):
+    path = tmp_path / "state.ckpt"
+    table = LazyTable()
+    table.table = {"a": 1}
+    write_checkpoint(path, {"table": table})
+
+    restored = LazyTable()
+    reader = CheckpointReader(path)
+    assert reader.restore({"table": restored}) == ["table"]
+    handle = restored.snapshot_handle
+    assert handle is not None and not handle.loaded
+    assert restored.lookup("a") == 1
+    assert handle.loaded
+    reader.close()
+
+
+def test_config_hash_without_params():
+    # Components without params are hashed by the config values they were built with
+    assert LazyTable(size=1).config_hash() == LazyTable(size=1).config_hash()
+    assert LazyTable(size=1).config_hash() != LazyTable(size=2).config_hash()
+
+    class Sectioned(ApplicationComponent):
+        PREFIX = "Table"
+
+    # ... or by their section of the global config
+    def hashed(size: int) -> str:
+        return Sectioned(_global_config={"Table": {"size": size}, "Other": {}}).config_hash()
+
+    assert hashed(1) == hashed(1) != hashed(2)
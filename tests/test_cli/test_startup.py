@@ -0,0 +1,68 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[2]
+
+# Budgets are generous on purpose, CI machines are noisy.  Eager imports of typer/pydantic/yaml
+# were several hundred milliseconds on their own.
+IMPORT_BUDGET_US = 150_000
+HELP_BUDGET_S = 2.0
+HEAVY_MODULES = ("typer", "click", "rich", "pydantic", "yaml")
+# Commands every application has, subclasses and features add their own next to them
+CORE_COMMANDS = ("configure", "pre-run", "run")
+
+
+def run_with_importtime(*args: str) -> tuple[subprocess.CompletedProcess, dict[str, int]]:
+    """Run python with -X importtime and return the process and {module: cumulative us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+    return result, cumulative
+
+
+def test_container_import_is_lightweight():
+    result, cumulative = run_with_importtime("-c", "import src.application_container")
+    assert result.returncode == 0, result.stderr
+
+    heavy = [m for m in cumulative if m.split(".")[0] in HEAVY_MODULES]
+    assert heavy == [], f"Heavy modules imported eagerly: {heavy}"
+    assert cumulative["src.application_container"] < IMPORT_BUDGET_US
+
+
+def test_commands_registered_without_building_app():
+    code = (
+        "import sys\n"
+        "from src.application_container import CustomApplication\n"
+        f"assert set({CORE_COMMANDS!r}) <= set(CustomApplication.app.command_names)\n"
+        "assert not CustomApplication.app.built\n"
+        "assert 'typer' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_help_latency():
+    start = time.perf_counter()
+    result, cumulative = run_with_importtime("-m", "src.application_container", "--help")
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stderr
+    for command in CORE_COMMANDS:
+        assert command in result.stdout
+    assert elapsed < HELP_BUDGET_S
+    # --help only needs the CLI, config parsing/validation must stay unimported
+    assert "yaml" not in cumulative
+    assert "pydantic" not in cumulative
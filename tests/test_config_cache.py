@@ -0,0 +1,161 @@
+from pydantic import Field, field_validator
+from src.application_container import CustomApplication
+from src.base_config import Config
+from src.config_cache import ValidatedConfigCache, install_config_cache
+import src.base_config as base_config
+from typing import ClassVar
+import pytest
+import yaml
+
+
+class CountingConfig(Config):
+    PREFIX = "Counting"
+    CACHE_VALIDATION = True
+    validations: ClassVar[int] = 0
+
+    name: str = "default"
+    sizes: list[int] = []
+
+    @field_validator("name")
+    @classmethod
+    def count(cls, name: str) -> str:
+        CountingConfig.validations += 1
+        return name.upper()
+
+
+class PlainConfig(CountingConfig):
+    CACHE_VALIDATION = False
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    CountingConfig.validations = 0
+    yield
+    install_config_cache(None)
+
+
+def warm_cache(path, data: dict) -> ValidatedConfigCache:
+    cache = ValidatedConfigCache(path)
+    install_config_cache(cache)
+    CountingConfig.validated(data)
+    cache.save()
+    cache = ValidatedConfigCache(path)
+    cache.load()
+    install_config_cache(cache)
+    return cache
+
+
+def test_hits_skip_validation(tmp_path):
+    data = {"name": "a", "sizes": [1, 2], "not_a_field": object()}
+    cache = warm_cache(tmp_path / "cache", data)
+    assert CountingConfig.validations == 1
+
+    model = CountingConfig.validated(data)
+    assert CountingConfig.validations == 1
+    assert model == CountingConfig(name="a", sizes=[1, 2])
+    assert model.model_fields_set == {"name", "sizes"}
+    assert cache.stats()["hits"] == 1
+
+    # Hits don't share mutable values
+    model.sizes.append(3)
+    assert CountingConfig.validated(data).sizes == [1, 2]
+
+
+def test_misses(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    cache = warm_cache(path, {"name": "a"})
+    CountingConfig.validated({"name": "b"})
+    assert CountingConfig.validations == 2
+    assert cache.stats()["hits"] == 0
+
+    monkeypatch.setattr(CountingConfig, "CONFIG_VERSION", 2)
+    cache = ValidatedConfigCache(path)
+    cache.load()
+    install_config_cache(cache)
+    CountingConfig.validated({"name": "a"})
+    assert CountingConfig.validations == 3
+    assert cache.stats()["hits"] == 0
+
+
+def retries_config(default_retries: int, default_backoff: list[float]) -> type[Config]:
+    # The same model in two runs, its defaults changed in between
+    class RetriesConfig(Config):
+        CACHE_VALIDATION = True
+
+        retries: int = default_retries
+        backoff: list[float] = Field(default_factory=lambda: list(default_backoff))
+
+    return RetriesConfig
+
+
+@pytest.mark.parametrize("changed", [{"retries": 10}, {"backoff": [0.5, 1.0]}])
+def test_changed_defaults_miss(tmp_path, changed):
+    path = tmp_path / "cache"
+    cache = ValidatedConfigCache(path)
+    install_config_cache(cache)
+    retries_config(3, [0.5]).validated({})
+    cache.save()
+
+    cache = ValidatedConfigCache(path)
+    cache.load()
+    install_config_cache(cache)
+    assert retries_config(3, [0.5]).validated({}).retries == 3
+    assert cache.stats()["hits"] == 1
+
+    defaults = {"retries": 3, "backoff": [0.5], **changed}
+    model = retries_config(defaults["retries"], defaults["backoff"]).validated({})
+    assert model.model_dump() == defaults
+    assert cache.stats()["hits"] == 1
+
+
+def test_strict_mode_always_validates(tmp_path):
+    cache = warm_cache(tmp_path / "cache", {"name": "a"})
+    cache.strict = True
+    CountingConfig.validated({"name": "a"})
+    assert CountingConfig.validations == 2
+
+
+def test_models_opt_in(tmp_path):
+    cache = warm_cache(tmp_path / "cache", {"name": "a"})
+    PlainConfig.validated({"name": "a"})
+    PlainConfig.validated({"name": "a"})
+    assert CountingConfig.validations == 3
+    assert cache.stats()["misses"] == 0
+
+
+def test_uncacheable_configs(tmp_path):
+    cache = ValidatedConfigCache(tmp_path / "cache")
+    install_config_cache(cache)
+    CountingConfig.validated({"name": "a", "sizes": {1, 2}})
+    assert cache.stats()["uncacheable"] == 1
+
+
+def test_unused_entries_are_dropped(tmp_path):
+    path = tmp_path / "cache"
+    warm_cache(path, {"name": "a"})
+    cache = warm_cache(path, {"name": "b"})
+    assert cache.stats()["entries"] == 1
+
+
+def test_application_config_cache(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "ConfigCache": {"path": str(tmp_path / "config.cache")},
+                "Counting": {"name": "a"},
+            }
+        )
+    )
+    for _ in range(2):
+        app = CustomApplication()
+        app.configure(config_path)
+        assert base_config.validation_cache is app.config_cache
+        assert CountingConfig.from_config(app._global_config).name == "A"
+        app.save_config_cache()
+    assert CountingConfig.validations == 1
+
+    app = CustomApplication()
+    app.configure(config_path, strict_config=True)
+    CountingConfig.from_config(app._global_config)
+    assert CountingConfig.validations == 2
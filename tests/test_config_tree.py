@@ -0,0 +1,146 @@
+from src.application_container import CustomApplication
+from src.base_config import Config
+from src.components.application_component import (
+    ApplicationComponent,
+    ConfigurableApplicationComponent,
+)
+from src.dependency_resolver import DependencyResolver, ResolveByNameAndType
+from typing import Any
+import src.factory as factory
+from src.config_tree import FrozenMapping, freeze, thaw
+import pickle
+import pytest
+import yaml
+
+
+class RetryConfig(Config):
+    attempts: int = 3
+
+
+class WorkerConfig(Config):
+    PREFIX = "Workers.first"
+
+    queue: str
+    tags: list[str] = []
+    retry: RetryConfig = RetryConfig()
+
+
+class Worker(ConfigurableApplicationComponent):
+    CONFIG = WorkerConfig
+
+
+class WorkerManager(ApplicationComponent):
+    """Builds components from its config section the way the repo's managers do."""
+
+    PREFIX = "Workers"
+
+    def __init__(self, resolver: DependencyResolver, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.workers = {}
+        for name, component_config in self._global_config.get(self.PREFIX, {}).items():
+            component_class = factory.load_classes([component_config])[0]
+            additional_config = component_config.copy()
+            additional_config.pop("module", None)
+            additional_config.pop("enabled", None)
+            kwargs = resolver.resolve_object_kwargs(
+                component_class, policy=ResolveByNameAndType, additional_objects=additional_config
+            )
+            self.workers[name] = component_class(**kwargs)
+
+
+def sample() -> dict:
+    return {
+        "Workers": {
+            "first": {"queue": "jobs", "tags": ["a", "b"], "retry": {"attempts": 5}},
+            "second": {"queue": "jobs", "tags": ["a", "b"], "retry": {"attempts": 5}},
+        },
+        "Flags": {f"flag_{i}": i % 2 == 0 for i in range(20)},
+    }
+
+
+def test_freeze_round_trips():
+    config = sample()
+    frozen = freeze(config)
+    assert isinstance(frozen, FrozenMapping)
+    assert thaw(frozen) == config
+    assert frozen["Workers"]["first"]["tags"] == ("a", "b")
+    assert frozen["Flags"]["flag_12"] is True
+    assert "flag_19" in frozen["Flags"] and "flag_20" not in frozen["Flags"]
+    with pytest.raises(KeyError):
+        frozen["Missing"]
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_identical_subtrees_and_strings_are_shared():
+    config = sample()
+    config["Workers"]["second"]["queue"] = "".join(["jo", "bs"])  # equal, not the same object
+    frozen = freeze(config)
+    assert frozen["Workers"]["first"] is frozen["Workers"]["second"]
+    assert freeze({"a": 1}) == freeze({"a": 1})
+    assert hash(freeze({"a": 1, "b": (1, 2)})) == hash(freeze({"b": [1, 2], "a": 1}))
+    # 1, 1.0 and True are equal but aren't merged
+    flags = freeze({"x": {"v": 1}, "y": {"v": True}, "z": {"v": 1.0}})
+    assert [type(flags[key]["v"]) for key in "xyz"] == [int, bool, float]
+
+
+def test_frozen_tree_is_immutable():
+    frozen = freeze(sample())
+    with pytest.raises(TypeError):
+        frozen["Workers"] = {}
+    with pytest.raises(AttributeError):
+        frozen.extra = 1
+
+
+def test_config_models_read_the_tree():
+    frozen = freeze(sample())
+    assert WorkerConfig.scan_config_for_prefix(frozen)["queue"] == "jobs"
+    params = WorkerConfig.from_config(frozen)
+    assert params.tags == ["a", "b"]
+    assert params.retry.attempts == 5
+    assert params == WorkerConfig.from_config(sample())
+
+
+def test_configure_compact_config(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {"watchdog": "src.managers.watchdog:WatchdogManager"},
+                "Watchdog": {"interval": 0.5, "threshold": 2.0},
+            },
+            sort_keys=False,
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path, compact_config=True)
+    assert isinstance(app._global_config, FrozenMapping)
+    watchdog = app._resolver.get_object("watchdog")
+    assert watchdog.params.interval == 0.5
+    assert watchdog.params.threshold == 2.0
+
+
+def test_managers_copy_component_entries(tmp_path):
+    config = sample()
+    for entry in config["Workers"].values():
+        entry["module"] = "tests.test_config_tree:Worker"
+        # Nested models can't be passed through resolve_object_kwargs, dicts or not
+        del entry["retry"]
+    config["Managers"] = {"workers": "tests.test_config_tree:WorkerManager"}
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False))
+
+    app = CustomApplication()
+    app.configure(config_path, compact_config=True)
+    workers = app._resolver.get_object("workers").workers
+    assert workers["second"].params.queue == "jobs"
+    assert workers["second"].params.tags == ["a", "b"]
+    # The tree itself is left as it was
+    assert "module" in app._global_config["Workers"]["first"]
+
+
+def test_config_cache_keys_match_dicts(tmp_path):
+    from src.config_cache import ValidatedConfigCache
+
+    cache = ValidatedConfigCache(tmp_path / "cache")
+    section = sample()["Workers"]["first"]
+    assert cache._key(WorkerConfig, freeze(section)) == cache._key(WorkerConfig, section)
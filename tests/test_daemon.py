@@ -0,0 +1,226 @@
+from pathlib import Path
+from src.application_container import CustomApplication
+from src.daemon import (
+    SOCKET_ENV,
+    ContainerDaemon,
+    _connect,
+    _peer_uid,
+    default_socket_path,
+    forward,
+    main,
+    stop_daemon,
+)
+import src.daemon as daemon_module
+import io
+import os
+import pytest
+import socket
+import stat
+import subprocess
+import sys
+import time
+import yaml
+
+ROOT = Path(__file__).parents[1]
+
+
+def write_config(path: Path, interval: float = 0.5, manager: str = "WatchdogManager") -> None:
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {"watchdog": f"src.managers.watchdog:{manager}"},
+                "Watchdog": {"interval": interval},
+            },
+            sort_keys=False,
+        )
+    )
+
+
+def wait_for_daemon(socket_path: Path, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        assert process.poll() is None, process.communicate()
+        client = _connect(socket_path)
+        if client is not None:
+            client.close()
+            return
+        time.sleep(0.05)
+    raise TimeoutError("daemon didn't start")
+
+
+@pytest.fixture
+def daemon_process(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    socket_path = tmp_path / "daemon.sock"
+    write_config(config_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.application_container", "daemon", str(config_path)],
+        cwd=ROOT,
+        env={**os.environ, SOCKET_ENV: str(socket_path)},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        wait_for_daemon(socket_path, process)
+        yield config_path, socket_path, process
+    finally:
+        if process.poll() is None:
+            stop_daemon(socket_path)
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def test_commands_are_served_by_the_daemon(daemon_process, tmp_path, capsys):
+    config_path, socket_path, process = daemon_process
+
+    assert forward(["dry-run", str(config_path)], socket_path) == 0
+    assert f"{config_path}: OK" in capsys.readouterr().out
+
+    # The resident container is already configured with this config
+    assert forward(["configure", "--config-path", str(config_path)], socket_path) == 0
+
+    assert forward(["no-such-command"], socket_path) == 2
+    assert "No such command" in capsys.readouterr().err
+
+    # Config changes rebuild the container, while the config doesn't build the commands run
+    # in-process
+    write_config(config_path, manager="Missing")
+    assert forward(["configure", "--config-path", str(config_path)], socket_path) is None
+    write_config(config_path, interval=0.25)
+    assert forward(["configure", "--config-path", str(config_path)], socket_path) == 0
+
+    assert stop_daemon(socket_path)
+    assert process.wait(10) == 0
+    assert not socket_path.exists()
+    assert forward(["configure", "--config-path", str(config_path)], socket_path) is None
+    assert not stop_daemon(socket_path)
+
+
+def test_other_configs_and_lifecycle_commands_run_in_process(daemon_process, tmp_path, monkeypatch):
+    config_path, socket_path, process = daemon_process
+    other = tmp_path / "other.yaml"
+    write_config(other)
+
+    assert forward(["configure", "--config-path", str(other)], socket_path) is None
+    assert forward(["configure"], socket_path) is None
+    assert forward(["pre-run"], socket_path) is None
+    assert forward(["memory-report", str(config_path)], socket_path) is None
+
+    # main runs them in-process, in a container of their own
+    monkeypatch.setenv(SOCKET_ENV, str(socket_path))
+    with pytest.raises(SystemExit) as exit_info:
+        main(CustomApplication, ["configure", "--config-path", str(other)])
+    assert exit_info.value.code == 0
+    assert forward(["configure", "--config-path", str(config_path)], socket_path) == 0
+
+
+def test_runs_in_process_without_a_daemon(tmp_path, capsys, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path)
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "missing.sock"))
+    with pytest.raises(SystemExit) as exit_info:
+        main(CustomApplication, ["dry-run", str(config_path)])
+    assert exit_info.value.code == 0
+    assert f"{config_path}: OK" in capsys.readouterr().out
+
+    # A socket left behind by a daemon that died counts as no daemon
+    stale = tmp_path / "stale.sock"
+    daemon = ContainerDaemon(CustomApplication, config_path, stale)
+    daemon.bind()
+    daemon._server.close()
+    assert stale.exists()
+    assert forward(["configure", "--config-path", str(config_path)], stale) is None
+    daemon.bind()  # replaces the stale socket
+    daemon._server.close()
+
+
+def test_container_is_reused_until_the_config_changes(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path)
+    daemon = ContainerDaemon(CustomApplication, config_path, tmp_path / "daemon.sock")
+    out, err = io.StringIO(), io.StringIO()
+
+    assert daemon.run_command(["configure", "--config-path", str(config_path)], out, err) == 0
+    container = daemon.container
+    assert daemon.run_command(["configure", "--config-path", str(config_path)], out, err) == 0
+    assert daemon.container is container
+    assert daemon.builds == 1
+
+    write_config(config_path, interval=0.25)
+    assert daemon.run_command(["configure", "--config-path", str(config_path)], out, err) == 0
+    assert daemon.container is not container
+    assert daemon.container._resolver.get_object("watchdog").params.interval == 0.25
+    assert daemon.builds == 2
+
+    assert daemon.run_command(["run"], out, err) is None
+    assert daemon.run_command(["daemon", str(config_path)], out, err) is None
+    assert daemon.builds == 2
+    daemon._shutdown_container()
+
+
+def test_relative_paths_resolve_against_the_client_cwd(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path)
+    daemon = ContainerDaemon(CustomApplication, config_path, tmp_path / "daemon.sock")
+    out, err = io.StringIO(), io.StringIO()
+    cwd = os.getcwd()
+
+    configure = ["configure", "--config-path", "config.yaml"]
+    assert daemon.run_command(configure, out, err, tmp_path) == 0
+    assert daemon.run_command(["dry-run", "config.yaml"], out, err, tmp_path) == 0
+    assert f"{config_path}: OK" in out.getvalue()
+    # Relative to the daemon's own directory it's another config
+    assert daemon.run_command(configure, out, err) is None
+    assert os.getcwd() == cwd
+    assert daemon.builds == 1
+    daemon._shutdown_container()
+
+
+@pytest.mark.parametrize("runtime_env", ["XDG_RUNTIME_DIR", "TMPDIR"])
+def test_default_socket_is_in_a_private_directory(tmp_path, monkeypatch, capsys, runtime_env):
+    monkeypatch.delenv(SOCKET_ENV, raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setenv(runtime_env, str(tmp_path))
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path)
+    socket_path = default_socket_path()
+    assert socket_path.parent.parent == tmp_path
+
+    daemon = ContainerDaemon(CustomApplication, config_path)
+    daemon.bind()
+    daemon._server.close()
+    assert stat.S_IMODE(socket_path.parent.stat().st_mode) == 0o700
+    assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+    # A directory others can get into is neither served on nor used
+    socket_path.parent.chmod(0o755)
+    with pytest.raises(PermissionError):
+        daemon.bind()
+    assert forward(["configure"]) is None
+    assert "Not using the daemon" in capsys.readouterr().err
+
+
+def test_peers_of_another_user_are_refused(tmp_path, monkeypatch, capsys):
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path)
+    daemon = ContainerDaemon(CustomApplication, config_path, tmp_path / "daemon.sock")
+    client, server = socket.socketpair(socket.AF_UNIX)
+    assert _peer_uid(client, daemon.socket_path) == os.getuid()
+
+    monkeypatch.setattr(daemon_module, "_peer_uid", lambda connection, path: os.getuid() + 1)
+    # The daemon hangs up without serving anything
+    with client:
+        daemon._handle(server)
+        assert client.recv(1) == b""
+    assert daemon.served == 0 and daemon.container is None
+
+    # and the client doesn't send it
+    daemon.bind()
+    try:
+        assert forward(["configure"], daemon.socket_path) is None
+    finally:
+        daemon._server.close()
+    assert "it runs as uid" in capsys.readouterr().err
@@ -5,6 +5,8 @@ from src.dependency_resolver import (
     ResolveByType,
 )
 from typing import Any
+import asyncio
+import threading
 import pytest
 from src.custom_exceptions import DependencyInjectionError
 
@@ -229,3 +231,96 @@ def test_optional_types(resolver: DependencyResolver):
         with_optional_typehint_init.arg_with_optional_typehint
         == arg_with_optional_typehint
     )
+
+
+def test_weak_objects(resolver: DependencyResolver):
+    object_b = ObjectB("test")
+    resolver.add_object(object_b, "b", weak=True)
+    assert resolver.get_object("b") is object_b
+    resolver.add_object(1, "int_arg")
+    args = resolver.resolve_object_kwargs(ObjectA, policy=ResolveByName, skip_args=("c",))
+    assert args["b"] is object_b
+
+    del object_b, args
+    assert resolver.get_object("b") is None
+    assert "b" not in resolver._object_bag
+
+    with pytest.raises(TypeError):
+        resolver.add_object({"not": "weakrefable"}, "config", weak=True)
+
+
+def test_construct(resolver: DependencyResolver):
+    resolver.add_object("test", "str_arg")
+    b = resolver.construct(ObjectB, "b")
+    assert b.str_arg == "test"
+    assert resolver.get_object("b") is b
+
+
+def test_child_containers(resolver: DependencyResolver):
+    resolver.add_object("parent", "str_arg")
+    resolver.add_object(1, "int_arg")
+    child = resolver.child()
+    child.add_object("child", "str_arg")
+
+    assert child.get_object("int_arg") == 1
+    assert child.get_object("str_arg") == "child"
+    assert resolver.get_object("str_arg") == "parent"
+    assert "str_arg" not in child.child()._object_bag
+
+    class NeedsResolver:
+        def __init__(self, resolver: DependencyResolver, str_arg: str):
+            self.resolver = resolver
+            self.str_arg = str_arg
+
+    built = child.construct(NeedsResolver, "needs_resolver")
+    assert built.resolver is child
+    assert built.str_arg == "child"
+    assert resolver.get_object("needs_resolver") is None
+
+
+def test_additional_objects_are_not_copied_into_the_bag(resolver: DependencyResolver):
+    resolver.add_object(1, "int_arg")
+    args = resolver.resolve_object_kwargs(
+        ObjectB, additional_objects={"str_arg": "extra"}
+    )
+    assert args["str_arg"] == "extra"
+    assert resolver.get_object("str_arg") is None
+
+
+def test_scopes_are_per_context(scoped_resolver: DependencyResolver):
+    assert DependencyResolver.current() is None
+    assert scoped_resolver.active() is scoped_resolver
+
+    seen = {}
+
+    def handle(tenant: str) -> None:
+        with scoped_resolver.scope(tenant=tenant) as scope:
+            barrier.wait()
+            assert DependencyResolver.current() is scope
+            seen[tenant] = scoped_resolver.active().get_object("tenant")
+
+    barrier = threading.Barrier(2)
+    threads = [threading.Thread(target=handle, args=(t,)) for t in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"a": "a", "b": "b"}
+    assert DependencyResolver.current() is None
+    assert scoped_resolver.get_object("tenant") is None
+    # Scopes of unrelated containers aren't picked up
+    with DependencyResolver().scope():
+        assert scoped_resolver.active() is scoped_resolver
+
+
+def test_scopes_in_asyncio_tasks(scoped_resolver: DependencyResolver):
+    async def handle(request_id: int) -> int:
+        with scoped_resolver.scope(request_id=request_id):
+            await asyncio.sleep(0)
+            return scoped_resolver.active().get_object("request_id")
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(handle(i) for i in range(10)))
+
+    assert asyncio.run(main()) == list(range(10))
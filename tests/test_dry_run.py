@@ -0,0 +1,85 @@
+from src.application_container import CustomApplication
+from src.dry_run import DryRunValidator, dry_run
+from pathlib import Path
+import sys
+from typer.testing import CliRunner
+
+RESOURCES = Path("tests/test_resources/dry_run")
+COMPONENTS = "tests.test_resources.dry_run.components"
+
+
+def issues_by_location(config_path: Path) -> dict[str, str]:
+    return {issue.location: issue.kind for issue in dry_run(config_path)}
+
+
+def test_valid_config():
+    assert dry_run(RESOURCES / "valid_config.yaml") == []
+    assert dry_run("tests/test_application/application_config.yaml") == []
+    # Nothing was imported, the components module raises on import
+    assert COMPONENTS not in sys.modules
+
+
+def test_all_issues_reported_in_one_pass():
+    issues = issues_by_location(RESOURCES / "invalid_config.yaml")
+    assert issues == {
+        "Managers.store_user.store": "missing",
+        "Managers.missing": "unresolvable",
+        # A manager named like one of SchedulerConfig's fields gets injected in its place
+        "Managers.scheduler.workers": "type",
+        "Scheduler.workers": "type",
+        "Scheduler.unknown_option": "unknown",
+        "Workers.worker_a.threads": "type",
+        "Workers.worker_a.name": "missing",
+        "Workers.worker_a.colour": "unknown",
+        "Leftovers": "unknown",
+    }
+    assert COMPONENTS not in sys.modules
+
+
+def test_manager_order_matters():
+    config = {
+        "Managers": {
+            "store_user": f"{COMPONENTS}:NeedsStore",
+            "store": "src.managers.scheduler:SchedulerManager",
+        }
+    }
+    issues = DryRunValidator(config).validate()
+    assert [(i.location, i.kind) for i in issues] == [("Managers.store_user.store", "missing")]
+
+    config["Managers"] = dict(reversed(config["Managers"].items()))
+    assert DryRunValidator(config).validate() == []
+
+
+def test_application_sections():
+    config = {
+        "Managers": {"scheduler": "src.managers.scheduler:SchedulerManager"},
+        "Checkpoint": {"path": "state.ckpt"},
+        "ConfigCache": {"path": "config.cache", "strict": True},
+        "Profiler": {"signal": "SIGUSR1", "duration": 5},
+        "Supervisor": {"managers": {"scheduler": {"mode": "thread"}}},
+    }
+    assert DryRunValidator(config).validate() == []
+
+    config["Checkpoint"] = {"path": 3}
+    config["Profiler"] = {"interval": "fast", "colour": "red"}
+    issues = DryRunValidator(config).validate()
+    assert {issue.location: issue.kind for issue in issues} == {
+        "Checkpoint.path": "type",
+        "Profiler.interval": "type",
+        "Profiler.colour": "unknown",
+    }
+
+
+def test_dry_run_command():
+    runner = CliRunner()
+    result = runner.invoke(
+        CustomApplication.app.build(), ["dry-run", str(RESOURCES / "valid_config.yaml")]
+    )
+    assert result.exit_code == 0
+    assert "OK" in result.output
+
+    result = runner.invoke(
+        CustomApplication.app.build(), ["dry-run", str(RESOURCES / "invalid_config.yaml")]
+    )
+    assert result.exit_code == 1
+    assert "[missing] Workers.worker_a.name" in result.output
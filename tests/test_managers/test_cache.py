@@ -0,0 +1,158 @@
+from src.managers.cache import Cache, CacheConfig, CacheManager, SharedMemoryCache
+import multiprocessing
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def manager():
+    manager = CacheManager(
+        _global_config={
+            "Cache": {
+                "default": {"max_entries": 3},
+                "caches": {
+                    "bytes": {"max_entries": None, "max_bytes": 100},
+                    "short": {"ttl": 0.01},
+                    "shared": {"shared": True, "slots": 64, "slot_size": 256},
+                },
+            }
+        }
+    )
+    yield manager
+    manager.stop()
+
+
+def test_named_caches(manager: CacheManager):
+    assert manager.cache("a") is manager.cache("a")
+    assert manager.cache("a").config.max_entries == 3
+    assert manager.cache("bytes").config.max_bytes == 100
+    assert isinstance(manager.cache("shared"), SharedMemoryCache)
+    assert manager.cache("b", max_entries=7).config.max_entries == 7
+
+
+def test_lru_eviction(manager: CacheManager):
+    cache = manager.cache("a")
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a")  # a is now most recently used
+    cache.set("d", "d")
+
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    stats = manager.stats()["a"]
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 3
+
+
+def test_byte_bound(manager: CacheManager):
+    cache = manager.cache("bytes")
+    for i in range(5):
+        cache.set(i, bytes(30))
+    assert len(cache) == 3
+    assert cache.stats()["bytes"] == 90
+
+    cache.set("too big", bytes(101))
+    assert "too big" not in cache
+
+
+def test_ttl(manager: CacheManager):
+    cache = manager.cache("short")
+    cache.set("key", 1)
+    cache.set("long lived", 2, ttl=60)
+    assert cache.get("key") == 1
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert cache.get("long lived") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_hit_miss_stats():
+    cache = Cache("test", CacheConfig())
+    cache.set("key", 1)
+    cache.get("key")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_single_flight_loading():
+    cache = Cache("test", CacheConfig())
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader)))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+    assert cache.stats()["loads"] == 1
+    assert cache.stats()["coalesced_loads"] == 9
+
+
+def test_single_flight_errors_reach_waiters():
+    cache = Cache("test", CacheConfig())
+    errors = {}
+
+    def failing_load():
+        # Fail only once the waiter has joined this load
+        deadline = time.monotonic() + 2
+        while cache.coalesced_loads == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        raise ValueError("boom")
+
+    def load(name, loader):
+        try:
+            cache.get_or_load("key", loader)
+        except ValueError as e:
+            errors[name] = e
+
+    leader = threading.Thread(target=load, args=("leader", failing_load))
+    leader.start()
+    while not cache._inflight:
+        time.sleep(0.001)
+    waiter = threading.Thread(target=load, args=("waiter", lambda: "not called"))
+    waiter.start()
+    leader.join(5)
+    waiter.join(5)
+
+    assert cache.coalesced_loads == 1
+    assert errors["waiter"] is errors["leader"]
+    # Failed loads aren't cached
+    assert cache.get_or_load("key", lambda: 1) == 1
+
+
+def test_shared_memory_cache(manager: CacheManager):
+    cache = manager.cache("shared")
+    cache.set("parent", {"a": 1})
+    cache.set("too big", bytes(1000))
+    assert "too big" not in cache
+    assert cache.stats()["rejected"] == 1
+
+    def child(cache):
+        assert cache.get("parent") == {"a": 1}
+        cache.set("child", [1, 2, 3])
+
+    # Workers forked after configure see the same segment
+    process = multiprocessing.get_context("fork").Process(target=child, args=(cache,))
+    process.start()
+    process.join(5)
+    assert process.exitcode == 0
+    assert cache.get("child") == [1, 2, 3]
+
+    cache.delete("child")
+    assert "child" not in cache
@@ -0,0 +1,207 @@
+from src.managers.message_bus import BackpressurePolicy, MessageBusManager
+import asyncio
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def bus():
+    bus = MessageBusManager(_global_config={"MessageBus": {"max_queue": 4}})
+    yield bus
+    bus.stop()
+
+
+def test_pull_subscription_batches(bus: MessageBusManager):
+    topic = bus.topic("numbers", int)
+    subscription = bus.subscribe(topic, batch_size=3, max_queue=10)
+    for i in range(5):
+        assert bus.publish(topic, i) == 1
+
+    assert subscription.get_batch() == [0, 1, 2]
+    assert subscription.get_batch() == [3, 4]
+    assert subscription.get_batch(timeout=0.01) == []
+    assert bus.stats()["numbers"][0]["delivered"] == 5
+
+
+def test_topics_are_typed(bus: MessageBusManager):
+    topic = bus.topic("numbers", int)
+    with pytest.raises(TypeError):
+        bus.publish(topic, "not a number")
+    with pytest.raises(TypeError):
+        bus.topic("numbers", str)
+    assert bus.topic("numbers") is topic
+
+
+def test_drop_policies(bus: MessageBusManager):
+    oldest = bus.subscribe("t", policy=BackpressurePolicy.DROP_OLDEST, batch_size=10)
+    newest = bus.subscribe("t", policy=BackpressurePolicy.DROP_NEWEST, batch_size=10)
+    for i in range(6):
+        bus.publish("t", i)
+
+    assert oldest.get_batch() == [2, 3, 4, 5]
+    assert newest.get_batch() == [0, 1, 2, 3]
+    stats = bus.stats()["t"]
+    assert [s["dropped"] for s in stats] == [2, 2]
+    assert [s["max_depth"] for s in stats] == [4, 4]
+
+
+def test_block_policy(bus: MessageBusManager):
+    subscription = bus.subscribe("t", policy=BackpressurePolicy.BLOCK, max_queue=1)
+    bus.publish("t", 1)
+
+    published = threading.Event()
+    publisher = threading.Thread(target=lambda: (bus.publish("t", 2), published.set()))
+    publisher.start()
+    assert not published.wait(0.05)
+    assert subscription.get_batch() == [1]
+    assert published.wait(1)
+    assert subscription.get_batch() == [2]
+
+    # With a timeout the publisher gives up and counts a drop
+    blocking = bus.subscribe(
+        "t2", policy=BackpressurePolicy.BLOCK, max_queue=1, block_timeout=0.01
+    )
+    assert bus.publish("t2", 1) == 1
+    assert bus.publish("t2", 2) == 0
+    assert blocking.stats()["dropped"] == 1
+
+
+def test_subscribe_options(bus: MessageBusManager):
+    # Defaults never block forever
+    subscription = bus.subscribe("t")
+    assert subscription.policy is BackpressurePolicy.DROP_NEWEST
+    assert subscription.block_timeout == 1.0
+    assert subscription.max_queue == 4
+
+    # None explicitly means wait forever, not "use the config"
+    assert bus.subscribe("t", block_timeout=None).block_timeout is None
+    with pytest.raises(ValueError):
+        bus.subscribe("t", max_queue=0)
+    with pytest.raises(ValueError):
+        bus.subscribe("t", batch_size=0)
+
+
+def test_zero_copy_payloads(bus: MessageBusManager):
+    subscription = bus.subscribe("buffers")
+    buffer = bytearray(b"abc")
+    bus.publish("buffers", buffer)
+    (received,) = subscription.get_batch()
+
+    assert isinstance(received, memoryview)
+    assert received.readonly
+    buffer[0] = ord("x")
+    assert received.tobytes() == b"xbc"  # same memory, not a copy
+
+    payload = b"immutable"
+    bus.publish("buffers", payload)
+    assert subscription.get_batch()[0] is payload
+
+
+def test_sync_handler(bus: MessageBusManager):
+    received = []
+    done = threading.Event()
+
+    def handler(batch: list[int]) -> None:
+        received.extend(batch)
+        if len(received) == 10:
+            done.set()
+
+    bus.subscribe("t", handler, batch_size=5, max_queue=10)
+    bus.start()
+    for i in range(10):
+        bus.publish("t", i)
+    assert done.wait(1)
+    assert received == list(range(10))
+
+
+def test_sync_handlers_share_the_worker_pool():
+    bus = MessageBusManager(_global_config={"MessageBus": {"workers": 2}})
+    threads = set()
+    lock = threading.Lock()
+
+    def handler(batch: list[int]) -> None:
+        with lock:
+            threads.add(threading.current_thread().name)
+
+    for i in range(50):
+        bus.subscribe(f"t{i}", handler)
+    threads_before = threading.active_count()
+    bus.start()
+    for i in range(50):
+        bus.publish(f"t{i}", i)
+    bus.stop()
+
+    assert all(name.startswith("bus-worker") for name in threads)
+    assert len(threads) <= 2
+    assert threading.active_count() <= threads_before
+    assert sum(s[0]["delivered"] for s in bus.stats().values()) == 50
+
+
+def test_async_handler():
+    bus = MessageBusManager()
+    received = []
+
+    async def main() -> None:
+        done = asyncio.Event()
+
+        async def handler(batch: list[int]) -> None:
+            received.extend(batch)
+            if len(received) == 6:
+                done.set()
+
+        bus.subscribe("t", handler, batch_size=4)
+        bus.start()
+        # Publish from another thread, delivery happens on this loop
+        threading.Thread(target=lambda: [bus.publish("t", i) for i in range(6)]).start()
+        await asyncio.wait_for(done.wait(), 1)
+        bus.stop()
+
+    asyncio.run(main())
+    assert received == list(range(6))
+
+
+def test_blocking_publish_on_subscriber_loop():
+    bus = MessageBusManager()
+    received = []
+
+    async def main() -> None:
+        async def handler(batch: list[int]) -> None:
+            received.extend(batch)
+
+        bus.subscribe("t", handler, policy=BackpressurePolicy.BLOCK, max_queue=2)
+        bus.start()
+        # Blocking the loop would deadlock, fail fast instead
+        with pytest.raises(RuntimeError):
+            for i in range(5):
+                bus.publish("t", i)
+        received.clear()
+        while bus.stats()["t"][0]["depth"]:
+            await asyncio.sleep(0)
+        received.clear()
+
+        # publish_async waits for room while the loop keeps delivering
+        for i in range(5):
+            assert await bus.publish_async("t", i) == 1
+        while len(received) < 5:
+            await asyncio.sleep(0.001)
+        bus.stop()
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+    assert received == list(range(5))
+
+
+def test_stop_drains_queue(bus: MessageBusManager):
+    received = []
+
+    def slow_handler(batch: list[int]) -> None:
+        time.sleep(0.01)
+        received.extend(batch)
+
+    bus.subscribe("t", slow_handler, max_queue=100)
+    bus.start()
+    for i in range(5):
+        bus.publish("t", i)
+    bus.stop()
+    assert received == list(range(5))
+    assert bus.publish("t", 5) == 0
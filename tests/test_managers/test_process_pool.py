@@ -0,0 +1,102 @@
+from src.application_container import CustomApplication
+from src.managers.process_pool import ProcessPoolManager
+import array
+import asyncio
+import os
+import pytest
+import yaml
+
+
+def describe(data) -> tuple[str, int, int]:
+    """Runs in the worker."""
+    return type(data).__name__, len(data), sum(data)
+
+
+def describe_array(values) -> tuple[str, str, float]:
+    return type(values).__name__, values.format, sum(values.tolist())
+
+
+def keep_reference(data) -> int:
+    global _kept
+    _kept = data
+    return len(data)
+
+
+def fail() -> None:
+    raise ValueError("worker failed")
+
+
+@pytest.fixture
+def pool():
+    pool = ProcessPoolManager(
+        _global_config={"ProcessPool": {"workers": 2, "shared_memory_threshold": 1024}}
+    )
+    pool.pre_run()
+    yield pool
+    pool.stop()
+
+
+def test_prewarm_starts_every_worker(pool: ProcessPoolManager):
+    processes = pool._executor._processes
+    assert len(processes) == 2
+    assert os.getpid() not in processes
+
+
+def test_small_args_are_pickled(pool: ProcessPoolManager):
+    assert pool.submit(describe, b"\x01\x02").result() == ("bytes", 2, 3)
+    assert pool.stats()["shared_bytes"] == 0
+
+
+def test_large_args_go_through_shared_memory(pool: ProcessPoolManager):
+    data = bytes(range(256)) * 64
+    assert pool.submit(describe, data=data).result() == ("memoryview", len(data), sum(data))
+
+    values = array.array("d", range(1000))
+    result = pool.submit(describe_array, memoryview(values)).result()
+    assert result == ("memoryview", "d", sum(range(1000)))
+
+    # Workers holding on to the view don't break the call
+    assert pool.submit(keep_reference, data).result() == len(data)
+    assert pool.stats()["shared_bytes"] == 2 * len(data) + 8000
+
+
+def test_errors_and_stats(pool: ProcessPoolManager):
+    with pytest.raises(ValueError, match="worker failed"):
+        pool.submit(fail).result()
+    pool.submit(describe, b"1").result()
+
+    stats = pool.stats()
+    assert stats["submitted"] == 2
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["pending"] == 0
+    assert stats["max_latency"] >= stats["mean_run_time"] > 0
+
+
+def test_run_async(pool: ProcessPoolManager):
+    async def main():
+        return await asyncio.gather(
+            *(pool.run_async(describe, bytes([i]) * 2048) for i in range(4))
+        )
+
+    assert [result[2] for result in asyncio.run(main())] == [i * 2048 for i in range(4)]
+
+
+def test_process_pool_lifecycle_in_application(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {"process_pool": "src.managers.process_pool:ProcessPoolManager"},
+                "ProcessPool": {"workers": 1, "preload": ["json"]},
+            }
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path)
+    pool = app._resolver.get_object("process_pool")
+    app.pre_run()
+    assert pool.submit(describe, b"abc").result()[1] == 3
+    app.pre_stop()
+    app.stop()
+    assert pool._executor is None
@@ -0,0 +1,163 @@
+from src.application_container import CustomApplication
+from src.components.application_component import ApplicationComponent
+from src.managers.scheduler import OverrunPolicy, SchedulerManager
+from tests.conftest import wait_for
+from typing import Any
+import threading
+import time
+import pytest
+import yaml
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = SchedulerManager(_global_config={"Scheduler": {"workers": 2}})
+    yield scheduler
+    scheduler.stop()
+
+
+class PollingManager(ApplicationComponent):
+    def __init__(self, scheduler: SchedulerManager, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.polls = 0
+        scheduler.call_every(0.01, self.poll, name="poll")
+
+    def poll(self) -> None:
+        self.polls += 1
+
+
+def test_config_is_read_from_global_config(scheduler: SchedulerManager):
+    assert scheduler.params.workers == 2
+    assert SchedulerManager().params.workers == 4
+
+
+def test_tasks_wait_for_start(scheduler: SchedulerManager):
+    ran = threading.Event()
+    scheduler.call_later(0, ran.set)
+    assert not ran.wait(0.05)
+
+    scheduler.start()
+    assert ran.wait(1)
+
+
+def test_periodic_task_and_metrics(scheduler: SchedulerManager):
+    calls = []
+    scheduler.call_every(0.01, calls.append, 1, name="tick", initial_delay=0)
+    scheduler.start()
+    assert wait_for(lambda: len(calls) >= 5)
+
+    stats = scheduler.metrics()["tick"]
+    assert stats["runs"] >= 5
+    assert stats["failures"] == 0
+    assert stats["max_lag"] >= stats["mean_lag"] >= 0
+
+
+def test_cancel(scheduler: SchedulerManager):
+    calls = []
+    task = scheduler.call_every(0.01, calls.append, 1, initial_delay=0)
+    scheduler.start()
+    assert wait_for(lambda: len(calls) >= 1)
+    task.cancel()
+    time.sleep(0.05)
+    count = len(calls)
+    time.sleep(0.05)
+    assert len(calls) == count
+    assert scheduler.metrics() == {}
+
+
+def test_cancelled_tasks_are_released(scheduler: SchedulerManager):
+    for _ in range(1000):
+        scheduler.call_every(60, lambda: None).cancel()
+    assert scheduler._tasks == {}
+
+
+def test_task_names_are_unique(scheduler: SchedulerManager):
+    first = scheduler.call_every(60, lambda: None)
+    second = scheduler.call_every(60, lambda: None)
+    assert first.name != second.name
+    assert len(scheduler.metrics()) == 2
+
+    scheduler.call_every(60, lambda: None, name="tick")
+    with pytest.raises(ValueError):
+        scheduler.call_every(60, lambda: None, name="tick")
+
+
+def test_failures_are_counted(scheduler: SchedulerManager):
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler.call_every(0.01, boom, name="boom", initial_delay=0)
+    scheduler.start()
+    assert wait_for(lambda: scheduler.metrics()["boom"]["failures"] >= 2)
+
+
+@pytest.mark.parametrize(
+    "policy, max_concurrent",
+    [(OverrunPolicy.SKIP, 1), (OverrunPolicy.QUEUE, 1), (OverrunPolicy.CONCURRENT, 2)],
+)
+def test_overrun_policies(scheduler: SchedulerManager, policy, max_concurrent):
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def slow():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    scheduler.call_every(0.01, slow, name="slow", initial_delay=0, overrun=policy)
+    scheduler.start()
+    assert wait_for(lambda: scheduler.metrics()["slow"]["overruns"] >= 3)
+    time.sleep(0.1)
+
+    assert peak[0] == max_concurrent
+    if policy is not OverrunPolicy.CONCURRENT:
+        assert scheduler.metrics()["slow"]["skipped"] >= 3
+    # QUEUE keeps at most one run waiting behind the current one
+    task = next(t for t in scheduler._tasks.values() if t.name == "slow")
+    assert task._queued <= 1
+
+
+def test_coalesce_skips_missed_runs(scheduler: SchedulerManager):
+    task = scheduler.call_every(0.01, lambda: None, initial_delay=0)
+    # Pretend the scheduler fell 10 intervals behind
+    now = time.monotonic()
+    task._next_run = now - 0.1
+    next_due = scheduler._next_due(task, now)
+    assert now < next_due <= now + 0.01
+    assert task.stats.coalesced >= 9
+
+    task.coalesce = False
+    task._next_run = now - 0.1
+    assert scheduler._next_due(task, now) < now
+
+
+def test_scheduler_lifecycle_in_application(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {
+                    "scheduler": "src.managers.scheduler:SchedulerManager",
+                    "poller": "tests.test_managers.test_scheduler:PollingManager",
+                },
+                "Scheduler": {"workers": 1},
+            },
+            sort_keys=False,
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path)
+    poller = app._resolver._object_bag["poller"]
+    app.pre_run()
+    app.run()
+    assert wait_for(lambda: poller.polls >= 3)
+
+    app.pre_stop()
+    app.stop()
+    polls = poller.polls
+    time.sleep(0.05)
+    assert poller.polls == polls
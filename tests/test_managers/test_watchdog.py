@@ -0,0 +1,107 @@
+from src.application_container import CustomApplication
+from src.components.application_component import ApplicationComponent
+from src.dependency_resolver import DependencyResolver
+from src.managers.watchdog import WatchdogManager
+from tests.conftest import wait_for
+import asyncio
+import threading
+import time
+import yaml
+
+
+class BlockingLoopManager(ApplicationComponent):
+    """Runs on its own event loop and blocks it now and then."""
+
+    async def start(self) -> None:
+        while True:
+            await asyncio.sleep(0.05)
+            self.crunch()
+
+    def crunch(self) -> None:
+        time.sleep(0.3)  # blocking call on the event loop
+
+
+class GilHog(ApplicationComponent):
+    def hog(self) -> None:
+        sum(range(20_000_000))  # one C call, never lets go of the GIL
+
+
+def test_event_loop_stalls_are_captured(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {
+                    "watchdog": "src.managers.watchdog:WatchdogManager",
+                    "blocker": "tests.test_managers.test_watchdog:BlockingLoopManager",
+                },
+                "Supervisor": {"managers": {"blocker": {"mode": "loop"}}},
+                "Watchdog": {"interval": 0.02, "threshold": 0.1},
+            },
+            sort_keys=False,
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path)
+    watchdog = app._resolver.get_object("watchdog")
+    app.pre_run()
+    app.run()
+    try:
+        assert wait_for(lambda: any(r.source == "loop blocker" for r in watchdog.reports))
+        report = next(r for r in watchdog.reports if r.source == "loop blocker")
+        assert report.owner == "blocker"
+        assert report.thread_name == "manager-blocker"
+        assert "crunch" in "".join(report.stack)
+        assert wait_for(lambda: report.lag >= 0.2)
+
+        metrics = app.metrics()
+        assert metrics["watchdog"]["stalls"] >= 1
+        assert metrics["watchdog"]["loop_lag"]["blocker"]["max"] >= 0.2
+        assert metrics["managers"]["blocker"]["alive"]
+    finally:
+        app.pre_stop()
+        app.stop()
+
+
+def test_interpreter_stalls_are_attributed():
+    resolver = DependencyResolver()
+    hog = GilHog()
+    resolver.add_object(hog, "hog")
+    watchdog = WatchdogManager(
+        resolver=resolver,
+        _global_config={"Watchdog": {"interval": 0.01, "threshold": 0.1}},
+    )
+    watchdog.start()
+    try:
+        time.sleep(0.05)
+        thread = threading.Thread(target=hog.hog, name="hog-thread")
+        thread.start()
+        thread.join()
+        assert wait_for(lambda: watchdog.stalls >= 1)
+    finally:
+        watchdog.stop()
+
+    report = watchdog.reports[0]
+    assert report.source == "interpreter"
+    assert report.lag >= 0.1
+    assert watchdog.stats()["interpreter_lag"]["max"] >= 0.1
+
+
+def test_healthy_loops_have_no_stalls():
+    watchdog = WatchdogManager(
+        resolver=DependencyResolver(),
+        _global_config={"Watchdog": {"interval": 0.01, "threshold": 0.1}},
+    )
+
+    async def main() -> None:
+        watchdog.watch_running_loop("main")
+        watchdog.start()
+        for _ in range(20):
+            await asyncio.sleep(0.005)
+
+    try:
+        asyncio.run(main())
+    finally:
+        watchdog.stop()
+    assert watchdog.stats()["loop_lag"]["main"]["count"] > 0
+    assert not [r for r in watchdog.reports if r.source == "loop main"]
@@ -0,0 +1,61 @@
+from src.application_container import CustomApplication
+from src.components.application_component import ApplicationComponent
+from src.memory_accounting import MemoryAccountant
+from typing import Any
+import yaml
+
+
+class BigManager(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.table = [bytes(1000) for _ in range(1000)]
+
+
+class SmallManager(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.table = [bytes(1000) for _ in range(10)]
+
+
+def test_nested_measurements():
+    accountant = MemoryAccountant()
+    try:
+        with accountant.measure("parent"):
+            parent = [bytes(1000) for _ in range(100)]
+            with accountant.measure("child"):
+                child = [bytes(1000) for _ in range(500)]
+    finally:
+        accountant.stop()
+
+    records = accountant.records
+    assert records["child"].size >= 500_000
+    assert records["parent"].size >= 600_000
+    assert records["parent"].children_size == records["child"].size
+    assert 100_000 <= records["parent"].exclusive_size < 200_000
+    assert [record.name for record in accountant.top(2)] == ["child", "parent"]
+    del parent, child
+
+
+def test_application_memory_report(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {
+                    "small": "tests.test_memory_accounting:SmallManager",
+                    "big": "tests.test_memory_accounting:BigManager",
+                }
+            }
+        )
+    )
+    app = CustomApplication(memory_accounting=True)
+    try:
+        app.configure(config_path)
+    finally:
+        app.memory.stop()
+
+    top = app.memory.top(2)
+    assert [record.name for record in top] == ["big", "small"]
+    assert top[0].size >= 1_000_000
+    report = app.memory.format_report()
+    assert "big" in report and "small" in report
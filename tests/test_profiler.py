@@ -0,0 +1,100 @@
+from src.application_container import CustomApplication
+from src.components.application_component import ApplicationComponent
+from src.profiler import SamplingProfiler, owner_code_map
+from typing import Any
+import os
+import signal
+import threading
+import yaml
+
+
+class Burner(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.stopped = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self.burn, daemon=True).start()
+
+    def burn(self) -> None:
+        while not self.stopped.is_set():
+            sum(range(1000))
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+class Sleeper(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.stopped = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self.idle, daemon=True).start()
+
+    def idle(self) -> None:
+        self.stopped.wait()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+def test_owner_code_map():
+    burner, other = Burner(), Burner()
+    owners = owner_code_map({"burner": burner, "sleeper": Sleeper()})
+    assert owners[Burner.burn.__code__] == "burner"
+    assert owners[Sleeper.idle.__code__] == "sleeper"
+    # Shared base class methods belong to nobody
+    assert ApplicationComponent.snapshot.__code__ not in owners
+    # Classes used by several components are attributed to the class
+    owners = owner_code_map({"burner": burner, "other": other})
+    assert owners[Burner.burn.__code__] == "Burner"
+
+
+def test_samples_are_attributed_to_busy_components():
+    components = {"burner": Burner(), "sleeper": Sleeper()}
+    for component in components.values():
+        component.start()
+    profiler = SamplingProfiler(components, interval=0.002)
+    profiler.run(0.3)
+    for component in components.values():
+        component.stop()
+
+    by_owner = profiler.by_owner()
+    assert by_owner["burner"] > 10
+    assert "sleeper" not in by_owner  # waiting threads use no CPU
+    burner_stacks = [line for line in profiler.collapsed().splitlines() if "[burner]" in line]
+    assert burner_stacks[0].startswith("[burner];")
+    assert "tests.test_profiler:Burner.burn" in burner_stacks[0]
+    assert int(burner_stacks[0].rsplit(" ", 1)[1]) > 0
+
+
+def test_signal_triggered_profile(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {"burner": "tests.test_profiler:Burner"},
+                "Profiler": {"duration": 0.2, "interval": 0.002, "output_dir": str(tmp_path)},
+            }
+        )
+    )
+    previous = signal.getsignal(signal.SIGUSR2)
+    app = CustomApplication()
+    try:
+        app.configure(config_path)
+        # Nothing runs until the signal arrives
+        assert app.profiler.profiler is None
+        assert not any(t.name == "sampling-profiler" for t in threading.enumerate())
+
+        app.run()
+        os.kill(os.getpid(), signal.SIGUSR2)
+        app.profiler.profiler._thread.join(5)
+        app.pre_stop()
+        app.stop()
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+    output = app.profiler.last_output.read_text()
+    assert output.startswith("[burner];")
+    assert app.profiler.last_output.parent == tmp_path
@@ -0,0 +1,155 @@
+from src.components.resource_pool import ResourcePool
+from src.custom_exceptions import ResourcePoolExhaustedError
+from src.dependency_resolver import DependencyResolver, ResolveByNameAndType
+from typing import Any
+import socket
+import sqlite3
+import threading
+import time
+import pytest
+
+SQLITE_CONFIG = {
+    "factory": "sqlite3:connect",
+    "factory_kwargs": {"database": ":memory:", "check_same_thread": False},
+}
+
+
+class SqlitePool(ResourcePool):
+    def check_resource(self, resource: sqlite3.Connection) -> bool:
+        return resource.execute("select 1").fetchone() == (1,)
+
+
+class SocketPool(ResourcePool):
+    """Pool of client sockets against a local stand-in server."""
+
+    def create_resource(self) -> socket.socket:
+        return socket.create_connection(self.address)
+
+
+class PoolConsumer:
+    def __init__(self, db_pool: ResourcePool, **kwargs: Any):
+        self.db_pool = db_pool
+
+
+@pytest.fixture
+def echo_server():
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            connections.append(connection)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.getsockname()
+    server.close()
+    for connection in connections:
+        connection.close()
+
+
+def test_prewarm_and_drain():
+    pool = SqlitePool(**SQLITE_CONFIG, min_size=2, max_size=4)
+    pool.pre_run()
+    assert pool.stats()["idle"] == 2
+
+    with pool.lease() as connection:
+        assert connection.execute("select 2").fetchone() == (2,)
+        assert pool.stats()["in_use"] == 1
+        assert pool.stats()["utilisation"] == 0.25
+
+    pool.stop()
+    stats = pool.stats()
+    assert stats["size"] == 0
+    assert stats["created"] == stats["destroyed"] == 2
+    with pytest.raises(ResourcePoolExhaustedError):
+        pool.acquire()
+
+
+def test_failed_prewarm_gives_back_its_slots():
+    class FlakyPool(SqlitePool):
+        creates = 0
+
+        def create_resource(self) -> sqlite3.Connection:
+            self.creates += 1
+            if self.creates == 2:
+                raise sqlite3.OperationalError("unable to open database")
+            return super().create_resource()
+
+    pool = FlakyPool(**SQLITE_CONFIG, min_size=4, max_size=4)
+    with pytest.raises(sqlite3.OperationalError):
+        pool.pre_run()
+    assert pool.stats()["size"] == 1
+    # The whole of max_size can still be used
+    leases = [pool.acquire(timeout=0.1) for _ in range(4)]
+    for connection in leases:
+        pool.release(connection)
+    pool.stop()
+
+
+def test_acquire_timeout_and_wait_metrics():
+    pool = SqlitePool(**SQLITE_CONFIG, max_size=1)
+    connection = pool.acquire()
+    with pytest.raises(ResourcePoolExhaustedError):
+        pool.acquire(timeout=0.01)
+    assert pool.stats()["timeouts"] == 1
+
+    threading.Timer(0.05, pool.release, args=(connection,)).start()
+    assert pool.acquire(timeout=1) is connection
+    assert pool.stats()["max_wait"] >= 0.04
+
+
+def test_unhealthy_resources_are_replaced():
+    pool = SqlitePool(**SQLITE_CONFIG, max_size=1)
+    connection = pool.acquire()
+    connection.close()  # a closed connection fails the health check
+    pool.release(connection)
+
+    with pool.lease() as replacement:
+        assert replacement is not connection
+    assert pool.stats()["failed_checks"] == 1
+
+
+def test_errors_discard_the_resource():
+    pool = SqlitePool(**SQLITE_CONFIG)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            raise RuntimeError("broken")
+    assert pool.stats()["size"] == 0
+
+
+def test_idle_timeout():
+    pool = SqlitePool(**SQLITE_CONFIG, min_size=1, idle_timeout=0.01)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    time.sleep(0.02)
+    pool.release(second)  # release reaps idle resources above min_size
+    assert pool.stats()["size"] == 1
+
+
+def test_socket_pool(echo_server):
+    pool = SocketPool(max_size=2, address=echo_server)
+    pool.pre_run()
+    with pool.lease() as a, pool.lease() as b:
+        assert a is not b
+        assert pool.stats()["utilisation"] == 1.0
+    pool.stop()
+    assert pool.stats()["destroyed"] == 2
+
+
+def test_pool_is_injectable():
+    resolver = DependencyResolver()
+    kwargs = resolver.resolve_object_kwargs(
+        SqlitePool, policy=ResolveByNameAndType, additional_objects=SQLITE_CONFIG
+    )
+    pool = SqlitePool(**kwargs)
+    resolver.add_object(pool, "db_pool")
+
+    consumer = PoolConsumer(
+        **resolver.resolve_object_kwargs(PoolConsumer, policy=ResolveByNameAndType)
+    )
+    assert consumer.db_pool is pool
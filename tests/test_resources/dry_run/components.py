@@ -0,0 +1,39 @@
+"""Components for the dry-run validation tests.  Importing this module is an error, the validator
+must only read its source."""
+
+from src.base_config import Config
+from src.components.application_component import (
+    ApplicationComponent,
+    ConfigurableApplicationComponent,
+)
+from src.dependency_resolver import DependencyResolver
+from src.managers.scheduler import SchedulerManager
+from typing import Any
+
+raise RuntimeError("dry-run validation must not import component modules")
+
+
+class WorkerConfig(Config):
+    threads: int
+    name: str
+    verbose: bool = False
+    tags: list[str] | None = None
+
+
+class Worker(ConfigurableApplicationComponent):
+    CONFIG = WorkerConfig
+
+    def __init__(self, scheduler: SchedulerManager, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+
+class WorkerManager(ApplicationComponent):
+    PREFIX = "Workers"
+
+    def __init__(self, resolver: DependencyResolver, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+
+class NeedsStore(ApplicationComponent):
+    def __init__(self, store: SchedulerManager, retries: int = 3, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
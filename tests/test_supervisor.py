@@ -0,0 +1,186 @@
+from src.application_container import CustomApplication
+from src.components.application_component import ApplicationComponent
+from src.supervisor import (
+    ExecutionMode,
+    ManagerState,
+    SupervisedManager,
+    SupervisionConfig,
+)
+from tests.conftest import wait_for
+from typing import Any
+import asyncio
+import threading
+import yaml
+
+
+class BlockingManager(ApplicationComponent):
+    """start() serves until stop() is called."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.stopped = threading.Event()
+        self.started = threading.Event()
+
+    def start(self) -> None:
+        self.started.set()
+        self.stopped.wait()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+class InlineManager(ApplicationComponent):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.started = False
+        self.starts = 0
+
+    def start(self) -> None:
+        self.started = True
+        self.starts += 1
+
+
+class CrashingManager(ApplicationComponent):
+    def __init__(self, failures: int = 100, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.starts = 0
+
+    def start(self) -> None:
+        self.starts += 1
+        if self.starts <= self.failures:
+            raise RuntimeError(f"crash {self.starts}")
+        threading.Event().wait(0.5)
+
+
+class AsyncManager(ApplicationComponent):
+    def __init__(self, failures: int = 0, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.starts = 0
+        self.ticks = 0
+        self.hook_loops: dict[str, asyncio.AbstractEventLoop] = {}
+
+    async def start(self) -> None:
+        self.starts += 1
+        if self.starts <= self.failures:
+            raise RuntimeError("async crash")
+        while True:
+            self.ticks += 1
+            await asyncio.sleep(0.001)
+
+    def pre_stop(self) -> None:
+        self.hook_loops["pre_stop"] = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        await asyncio.sleep(0)
+        self.hook_loops["stop"] = asyncio.get_running_loop()
+
+
+def supervise(manager, **config) -> SupervisedManager:
+    return SupervisedManager("manager", manager, SupervisionConfig(**config))
+
+
+def test_blocking_manager_on_its_own_thread():
+    supervised = supervise(BlockingManager(), mode="thread")
+    supervised.start()
+    assert supervised.manager.started.wait(1)
+    assert supervised.alive
+    assert supervised.status()["state"] == "running"
+
+    supervised.request_stop()
+    supervised.call("stop")
+    supervised.join()
+    assert supervised.state is ManagerState.STOPPED
+    assert not supervised.alive
+
+
+def test_restarts_with_backoff_until_max_restarts():
+    supervised = supervise(CrashingManager(), mode="thread", backoff=0.01, max_restarts=2)
+    supervised.start()
+    assert wait_for(lambda: supervised.state is ManagerState.FAILED)
+    assert supervised.restarts == 2
+    assert supervised.manager.starts == 3
+    assert "crash 3" in supervised.status()["last_error"]
+
+
+def test_recovers_after_restart():
+    supervised = supervise(CrashingManager(failures=1), mode="thread", backoff=0.01)
+    supervised.start()
+    assert wait_for(lambda: supervised.manager.starts == 2 and supervised.alive)
+    assert supervised.restarts == 1
+    supervised.request_stop()
+    supervised.join()
+
+
+def test_never_restart():
+    supervised = supervise(CrashingManager(), mode="thread", restart="never")
+    supervised.start()
+    assert wait_for(lambda: supervised.state is ManagerState.FAILED)
+    assert supervised.restarts == 0
+
+
+def test_event_loop_mode_hands_off_lifecycle_hooks():
+    supervised = supervise(AsyncManager(failures=1), mode="loop", backoff=0.01)
+    supervised.start()
+    manager = supervised.manager
+    assert wait_for(lambda: manager.ticks > 5)
+    assert supervised.restarts == 1
+    assert supervised.alive
+
+    supervised.request_stop()
+    supervised.call("pre_stop")
+    supervised.call("stop")
+    assert manager.hook_loops["pre_stop"] is manager.hook_loops["stop"] is supervised._loop
+    supervised.join()
+    assert supervised.state is ManagerState.STOPPED
+    assert supervised._loop.is_closed()
+
+
+def test_returning_start_is_recorded_in_every_mode():
+    for mode in ("thread", "loop"):
+        supervised = supervise(
+            InlineManager(), mode=mode, restart="always", backoff=0.01, max_restarts=2
+        )
+        supervised.start()
+        assert wait_for(lambda: supervised.state is ManagerState.COMPLETED, timeout=5), mode
+        assert supervised.restarts == 2
+        assert supervised.manager.starts == 3
+        supervised.request_stop()
+        supervised.join()
+
+    supervised = supervise(InlineManager())
+    supervised.start()
+    assert supervised.manager.started
+    assert supervised.state is ManagerState.COMPLETED
+
+
+def test_supervised_application(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "Managers": {
+                    "server": "tests.test_supervisor:BlockingManager",
+                    "after": "tests.test_supervisor:InlineManager",
+                },
+                "Supervisor": {"managers": {"server": {"mode": "thread"}}},
+            },
+            sort_keys=False,
+        )
+    )
+    app = CustomApplication()
+    app.configure(config_path)
+    assert app.manager_status() == {}
+    app.run()
+
+    # The blocking manager doesn't hold up the ones after it
+    assert app._resolver.get_object("after").started
+    status = app.manager_status()
+    assert status["after"]["mode"] == ExecutionMode.INLINE.value
+    assert wait_for(lambda: app.manager_status()["server"]["alive"])
+    assert status["server"]["restarts"] == 0
+
+    app.pre_stop()
+    app.stop()
+    assert app.manager_status()["server"]["state"] == "stopped"